@@ -1,222 +1,581 @@
-import re
-from collections import Counter
-
-class AnalizadorLexico:
-    def __init__(self):
-        # Palabras reservadas de PSeInt
-        self.palabras_reservadas = {
-            'Algoritmo', 'FinAlgoritmo', 'Proceso', 'FinProceso', 
-            'SubProceso', 'FinSubProceso', 'Funcion', 'FinFuncion',
-            'Definir', 'Como', 'Entero', 'Real', 'Caracter', 'Logico',
-            'Escribir', 'Leer', 'Si', 'Entonces', 'Sino', 'FinSi',
-            'Para', 'Hasta', 'Con', 'Paso', 'Hacer', 'FinPara',
-            'Mientras', 'FinMientras', 'Repetir', 
-            'Segun', 'De', 'Otro', 'FinSegun',  
-            'Dimension', 'Verdadero', 'Falso'
-        }
-            
-        # Operadores de PSeInt
-        self.operadores = {
-            '+', '-', '*', '/', '%', '^', '=', '<>', '<', '>', '<=', '>=', '<-', '->',
-            'Y', 'O', 'NO', '&'  # & para concatenación
-        }
-
-        # Signos PERMITIDOS en PSeInt
-        self.signos_permitidos = {
-            '(', ')', ',', ';', '[', ']', '"', ':'
-        }
-      
-        # Expresiones regulares para PSeInt
-        self.patron_numeros = r'^\d+$'
-        self.patron_decimal = r'^\d+\.\d+$'
-        self.patron_identificadores = r'^[a-zA-Z_][a-zA-Z0-9_]*$'
-        self.patron_cadena = r'^"[^"]*"$'
-    
-    def analizar_linea(self, linea, num_linea):
-        tokens = []
-        errores = []
-        
-        elementos = self._dividir_linea_pseint(linea)
-        
-        for elemento in elementos:
-            if not elemento.strip():
-                continue
-                
-            tipo = self._determinar_tipo_pseint(elemento)
-            
-            if tipo == "DESCONOCIDO":
-                errores.append(f"Línea {num_linea}: Token no reconocido '{elemento}'")
-            else:
-                tokens.append((elemento, tipo, num_linea))
-        
-        return tokens, errores
-    
-    def _dividir_linea_pseint(self, linea):
-        """Divide la línea según las reglas de PSeInt - CORREGIDO"""
-        elementos = []
-        i = 0
-        n = len(linea)
-        
-        while i < n:
-            if linea[i].isspace():
-                i += 1
-                continue
-            
-            # Verificar si es una cadena entre comillas - MEJORADO
-            if linea[i] == '"':
-                j = i + 1
-                while j < n and linea[j] != '"':
-                    j += 1
-                if j < n:
-                    # Encontramos comilla de cierre
-                    elementos.append(linea[i:j+1])
-                    i = j + 1
-                else:
-                    # Comilla sin cerrar, tomamos hasta el final
-                    elementos.append(linea[i:])
-                    i = n
-                continue
-            
-            # Verificar comentarios
-            if i + 1 < n and linea[i:i+2] == "//":
-                # Todo lo que sigue es comentario
-                elementos.append(linea[i:])
-                i = n
-                continue
-            
-            # Verificar operadores de múltiples caracteres
-            elif i + 1 < n and linea[i:i+2] in {'<-', '->', '<>', '<=', '>='}:
-                elementos.append(linea[i:i+2])
-                i += 2
-                continue
-            
-            # Verificar operadores y signos de un solo carácter
-            elif linea[i] in self.operadores or linea[i] in self.signos_permitidos:
-                elementos.append(linea[i])
-                i += 1
-                continue
-            
-            # Palabras y números
-            else:
-                j = i
-                # Avanzar hasta encontrar un delimitador
-                while j < n and not linea[j].isspace() and \
-                      linea[j] not in self.operadores and \
-                      linea[j] not in self.signos_permitidos and \
-                      linea[j] != '"' and \
-                      not (j + 1 < n and linea[j:j+2] == "//"):
-                    j += 1
-                palabra = linea[i:j]
-                if palabra:
-                    elementos.append(palabra)
-                i = j
-        
-        return elementos
-    
-    def _determinar_tipo_pseint(self, elemento):
-        elemento = elemento.strip()
-        e_lower = elemento.lower()
-        
-        # Verificar si es comentario primero
-        if elemento.startswith("//"):
-            return "Comentario"
-        
-        # Palabras reservadas (case-insensitive)
-        if e_lower in [p.lower() for p in self.palabras_reservadas]:
-            return "Palabra Reservada"
-        
-        # Operadores
-        if elemento in self.operadores:
-            return "Operador"
-        
-        # Signos permitidos
-        if elemento in self.signos_permitidos:
-            return "Signo"
-        
-        # Números enteros
-        if re.match(self.patron_numeros, elemento):
-            return "Número"
-        
-        # Números decimales
-        if re.match(self.patron_decimal, elemento):
-            return "Decimal"
-        
-        # Cadenas entre comillas
-        if re.match(self.patron_cadena, elemento):
-            return "Cadena"
-        
-        # Identificadores (incluye snake_case)
-        if re.match(self.patron_identificadores, elemento):
-            # Verificar si es snake_case válido (opcional, para tu reporte)
-            if "_" in elemento:
-                return "Identificador (snake_case)"
-            else:
-                return "Identificador"
-        
-        # Si no coincide con ningún patrón válido
-        return "DESCONOCIDO"
-
-    
-    def analizar_archivo(self, contenido):
-        lineas = contenido.split('\n')
-        todos_tokens = []
-        todos_errores = []
-        
-        for num_linea, linea in enumerate(lineas, 1):
-            linea = linea.strip()
-            if linea:
-                tokens, errores = self.analizar_linea(linea, num_linea)
-                todos_tokens.extend(tokens)
-                todos_errores.extend(errores)
-        
-        return todos_tokens, todos_errores
-    
-    def generar_reporte(self, tokens):
-        contador_tokens = Counter((token, tipo) for token, tipo, _ in tokens)
-        
-        reporte = "REPORTE DE TOKENS - ANALIZADOR LÉXICO (PSEINT)\n"
-        reporte += "=" * 65 + "\n\n"
-        
-        reporte += "TOKENS ENCONTRADOS (CLASIFICADOS POR TIPO Y CANTIDAD):\n"
-        reporte += "=" * 70 + "\n\n"
-        
-        reporte += f"{'TOKEN':<20} {'TIPO':<25} {'CANTIDAD':<10}\n"
-        reporte += "-" * 55 + "\n"
-        
-        tokens_ordenados = sorted(contador_tokens.items(), key=lambda x: (x[0][1], x[0][0]))
-        
-        for (token, tipo), cantidad in tokens_ordenados:
-            reporte += f"{token:<20} {tipo:<25} {cantidad:<10}\n"
-        
-        contador_tipos = Counter(tipo for _, tipo, _ in tokens)
-        
-        reporte += "\n" + "=" * 55 + "\n"
-        reporte += "RESUMEN POR TIPO DE TOKEN:\n"
-        reporte += "-" * 40 + "\n"
-        
-        for tipo, cantidad in contador_tipos.items():
-            reporte += f"{tipo}: {cantidad} tokens\n"
-        
-        tokens_validos = [t for t in tokens if t[1] != "DESCONOCIDO"]
-        tokens_no_reconocidos = [t for t in tokens if t[1] == "DESCONOCIDO"]
-        
-        reporte += "\n" + "=" * 55 + "\n"
-        reporte += f"TOTAL DE TOKENS VÁLIDOS: {len(tokens_validos)}\n"
-        reporte += f"TOTAL DE TOKENS NO RECONOCIDOS: {len(tokens_no_reconocidos)}\n"
-        reporte += f"TOTAL GENERAL: {len(tokens)}\n"
-        
-        if tokens_no_reconocidos:
-            reporte += "\nTOKENS NO RECONOCIDOS (ERRORES LÉXICOS):\n"
-            reporte += "-" * 45 + "\n"
-            errores_por_linea = {}
-            for token, tipo, linea in tokens_no_reconocidos:
-                if linea not in errores_por_linea:
-                    errores_por_linea[linea] = []
-                errores_por_linea[linea].append(token)
-            
-            for linea in sorted(errores_por_linea.keys()):
-                tokens_error = errores_por_linea[linea]
-                tokens_str = ', '.join([f'"{t}"' for t in tokens_error])
-                reporte += f"Línea {linea}: {tokens_str}\n"
-        
-        return reporte
\ No newline at end of file
+import os
+import re
+import sys
+from array import array
+
+from tokens_pseint import (
+    CLASE_CADENA, CLASE_COMENTARIO, CLASE_DECIMAL, CLASE_DESCONOCIDO,
+    CLASE_IDENTIFICADOR, CLASE_IDENTIFICADOR_SNAKE, CLASE_NUMERO,
+    CLASE_OPERADOR, CLASE_PALABRA_RESERVADA, CLASE_POR_NOMBRE, CLASE_SIGNO,
+    CLASES_CON_SIMBOLO, ESCRITURAS, PAL_NINGUNA, PALABRAS, PALABRAS_BYTES,
+    PALABRAS_RESERVADAS, SIN_SIMBOLO, IndiceLineas, PoolSimbolos, Token, TokenMapeado,
+)
+from cache_lineas import CacheLineas
+from diagnosticos import diagnostico
+from reportes import a_texto, escribir_reporte_lexico
+from tabla_tokens import TablaTokens
+
+# Espacios ASCII que str.strip() elimina
+_ESPACIOS_ASCII = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
+# Motores disponibles para cortar y clasificar cada línea
+MOTOR_UNA_PASADA = "una_pasada"
+MOTOR_CLASICO = "clasico"
+
+# Especificación declarativa de tokens. El orden de las alternativas
+# reproduce las prioridades del recorrido clásico: cadena, comentario,
+# operador doble, operador simple, signo y finalmente palabras. Una
+# palabra termina en un espacio, un operador de un carácter (incluye
+# 'Y' y 'O'), un signo o una comilla, igual que en _dividir_linea_pseint.
+def _construir_especificacion(espacio):
+    """Arma la especificación usando 'espacio' como clase de caracteres en blanco"""
+    delimitadores = espacio + r'+\-*/%^=<>&YO(),;\[\]:"'
+    return (
+        ('CADENA', r'"[^"]*+"?'),
+        ('COMENTARIO', r'//.*'),
+        ('OPERADOR_DOBLE', r'<-|->|<>|<=|>='),
+        ('OPERADOR', r'[+\-*/%^=<>&YO]'),
+        ('SIGNO', r'[(),;\[\]:]'),
+        ('DECIMAL', r'\d++\.\d++(?![^' + delimitadores + r'])'),
+        ('NUMERO', r'\d++(?![^' + delimitadores + r'])'),
+        ('IDENTIFICADOR', r'[A-NP-XZa-z_][A-NP-XZa-z0-9_]*+(?![^' + delimitadores + r'])'),
+        ('DESCONOCIDO', r'[^' + delimitadores + r']++'),
+    )
+
+
+def _compilar(espacio):
+    """Expresión maestra: salta espacios y reconoce un token"""
+    alternativas = '|'.join(f'(?P<{nombre}>{patron})' for nombre, patron in _construir_especificacion(espacio))
+    return r'[' + espacio + r']*+(?:' + alternativas + ')'
+
+
+ESPECIFICACION_TOKENS = _construir_especificacion(r'\s')
+
+# Compilada una sola vez para texto; la versión en bytes solo admite los
+# espacios ASCII y se usa con líneas ASCII de archivos mapeados
+PATRON_MAESTRO = re.compile(_compilar(r'\s'), re.DOTALL)
+PATRON_MAESTRO_BYTES = re.compile(_compilar(r' \t\n\r\x0b\x0c\x1c-\x1f').encode('ascii'), re.DOTALL)
+
+# Operadores de dos caracteres compartidos por todos los tokens (los de un
+# carácter ya son cadenas únicas en Python)
+_OPERADORES_DOBLES = {operador: sys.intern(operador) for operador in ('<-', '->', '<>', '<=', '>=')}
+
+# Clases que salen directamente del nombre del grupo
+_CLASE_POR_GRUPO = {
+    'COMENTARIO': CLASE_COMENTARIO,
+    'OPERADOR_DOBLE': CLASE_OPERADOR,
+    'OPERADOR': CLASE_OPERADOR,
+    'SIGNO': CLASE_SIGNO,
+    'DECIMAL': CLASE_DECIMAL,
+    'NUMERO': CLASE_NUMERO,
+}
+
+
+def _clasificar(grupo, elemento):
+    """Devuelve (clase, palabra) de un elemento según el grupo que lo reconoció"""
+    if grupo == 'IDENTIFICADOR':
+        palabra = PALABRAS.get(elemento.lower(), PAL_NINGUNA)
+        if palabra in PALABRAS_RESERVADAS:
+            return CLASE_PALABRA_RESERVADA, palabra
+        if "_" in elemento:
+            return CLASE_IDENTIFICADOR_SNAKE, palabra
+        return CLASE_IDENTIFICADOR, palabra
+    if grupo == 'CADENA':
+        if len(elemento) > 1 and elemento[-1] == '"':
+            return CLASE_CADENA, PAL_NINGUNA
+        if elemento.strip() == '"':
+            # Comilla suelta al final de la línea
+            return CLASE_SIGNO, PAL_NINGUNA
+        return CLASE_DESCONOCIDO, PAL_NINGUNA
+    if grupo == 'DESCONOCIDO':
+        return CLASE_DESCONOCIDO, PAL_NINGUNA
+    return _CLASE_POR_GRUPO[grupo], PAL_NINGUNA
+
+
+class AnalizadorLexico:
+    def __init__(self, motor=MOTOR_UNA_PASADA, tamano_cache=0):
+        if motor not in (MOTOR_UNA_PASADA, MOTOR_CLASICO):
+            raise ValueError(f"Motor léxico desconocido: '{motor}'")
+        self.motor = motor
+
+        # Caché opcional por contenido de línea (0 = desactivada)
+        self.cache = CacheLineas(tamano_cache) if tamano_cache else None
+
+        # Palabras reservadas de PSeInt (tabla compartida en tokens_pseint)
+        self.palabras_reservadas = {ESCRITURAS[p] for p in PALABRAS_RESERVADAS}
+            
+        # Operadores de PSeInt
+        self.operadores = {
+            '+', '-', '*', '/', '%', '^', '=', '<>', '<', '>', '<=', '>=', '<-', '->',
+            'Y', 'O', 'NO', '&'  # & para concatenación
+        }
+
+        # Signos PERMITIDOS en PSeInt
+        self.signos_permitidos = {
+            '(', ')', ',', ';', '[', ']', '"', ':'
+        }
+      
+        # Expresiones regulares para PSeInt
+        self.patron_numeros = r'^\d+$'
+        self.patron_decimal = r'^\d+\.\d+$'
+        self.patron_identificadores = r'^[a-zA-Z_][a-zA-Z0-9_]*$'
+        self.patron_cadena = r'^"[^"]*"$'
+    
+    def analizar_linea(self, linea, num_linea, simbolos=None):
+        """
+        Tokens y errores de una línea. Las palabras se internan en
+        'simbolos', el PoolSimbolos del documento; sin pool se usa uno
+        nuevo y los ids solo valen dentro de la línea.
+        """
+        if simbolos is None:
+            simbolos = PoolSimbolos()
+        if self.cache is not None:
+            return self._analizar_linea_en_cache(linea, num_linea, simbolos)
+        if self.motor == MOTOR_CLASICO:
+            return self._analizar_linea_clasico(linea, num_linea, simbolos)
+        return self._escanear_linea(linea, num_linea, simbolos)
+
+    def _analizar_linea_en_cache(self, linea, num_linea, simbolos):
+        """
+        Busca la línea en la caché. Se guardan (texto, clase, palabra) de cada
+        token y los elementos no reconocidos; el número de línea y el id de
+        símbolo se ponen después, así que la misma entrada sirve en cualquier
+        posición y en cualquier documento.
+        """
+        entrada = self.cache.obtener(linea)
+        if entrada is None:
+            if self.motor == MOTOR_CLASICO:
+                tokens, errores = self._analizar_linea_clasico(linea, num_linea, simbolos)
+            else:
+                tokens, errores = self._escanear_linea(linea, num_linea, simbolos)
+            self.cache.guardar(linea, (
+                tuple((tok.texto, tok.clase, tok.palabra) for tok in tokens),
+                tuple(error.parametros["texto"] for error in errores),
+            ))
+            return tokens, errores
+
+        elementos, desconocidos = entrada
+        textos = simbolos.textos
+        tokens = []
+        for texto, clase, palabra in elementos:
+            if clase in CLASES_CON_SIMBOLO:
+                simbolo = simbolos.agregar(texto, clase, palabra)
+                tokens.append(Token(textos[simbolo], clase, num_linea, palabra, simbolo))
+            else:
+                tokens.append(Token(texto, clase, num_linea, palabra))
+        errores = [diagnostico("LEX001", num_linea, texto=elemento) for elemento in desconocidos]
+        return tokens, errores
+
+    def _escanear_linea(self, linea, num_linea, simbolos):
+        """Corta y clasifica la línea en una sola pasada con la expresión maestra"""
+        tokens = []
+        errores = []
+        ids = simbolos.ids
+        textos = simbolos.textos
+        clases = simbolos.clases
+        palabras = simbolos.palabras
+
+        # La clasificación va en línea (igual a _clasificar) porque este es
+        # el camino caliente y la llamada extra cuesta alrededor de un 10%
+        for coincidencia in PATRON_MAESTRO.finditer(linea):
+            grupo = coincidencia.lastgroup
+            elemento = coincidencia.group(grupo)
+            palabra = PAL_NINGUNA
+            simbolo = SIN_SIMBOLO
+
+            if grupo == 'IDENTIFICADOR':
+                # Una palabra ya vista toma del pool su texto, clase y palabra
+                simbolo = ids.get(elemento)
+                if simbolo is not None:
+                    elemento = textos[simbolo]
+                    clase = clases[simbolo]
+                    palabra = palabras[simbolo]
+                else:
+                    palabra = PALABRAS.get(elemento.lower(), PAL_NINGUNA)
+                    if palabra in PALABRAS_RESERVADAS:
+                        clase = CLASE_PALABRA_RESERVADA
+                    elif "_" in elemento:
+                        clase = CLASE_IDENTIFICADOR_SNAKE
+                    else:
+                        clase = CLASE_IDENTIFICADOR
+                    simbolo = simbolos.agregar(elemento, clase, palabra)
+            elif grupo == 'CADENA':
+                if len(elemento) > 1 and elemento[-1] == '"':
+                    clase = CLASE_CADENA
+                elif elemento.strip() == '"':
+                    # Comilla suelta al final de la línea
+                    clase = CLASE_SIGNO
+                else:
+                    clase = CLASE_DESCONOCIDO
+            elif grupo == 'DESCONOCIDO':
+                clase = CLASE_DESCONOCIDO
+            elif grupo == 'OPERADOR_DOBLE':
+                clase = CLASE_OPERADOR
+                elemento = _OPERADORES_DOBLES[elemento]
+            else:
+                clase = _CLASE_POR_GRUPO[grupo]
+
+            if clase == CLASE_DESCONOCIDO:
+                errores.append(diagnostico("LEX001", num_linea, texto=elemento))
+            else:
+                tokens.append(Token(elemento, clase, num_linea, palabra, simbolo))
+
+        return tokens, errores
+
+    def _analizar_linea_clasico(self, linea, num_linea, simbolos):
+        """Recorrido original: divide la línea y luego clasifica cada elemento"""
+        tokens = []
+        errores = []
+        
+        elementos = self._dividir_linea_pseint(linea)
+        
+        for elemento in elementos:
+            if not elemento.strip():
+                continue
+                
+            tipo = self._determinar_tipo_pseint(elemento)
+            
+            if tipo == "DESCONOCIDO":
+                errores.append(diagnostico("LEX001", num_linea, texto=elemento))
+            else:
+                clase = CLASE_POR_NOMBRE[tipo]
+                palabra = PAL_NINGUNA
+                simbolo = SIN_SIMBOLO
+                if clase in CLASES_CON_SIMBOLO:
+                    palabra = PALABRAS.get(elemento.strip().lower(), PAL_NINGUNA)
+                    simbolo = simbolos.agregar(elemento, clase, palabra)
+                    elemento = simbolos.textos[simbolo]
+                tokens.append(Token(elemento, clase, num_linea, palabra, simbolo))
+        
+        return tokens, errores
+    
+    def _dividir_linea_pseint(self, linea):
+        """Divide la línea según las reglas de PSeInt - CORREGIDO"""
+        elementos = []
+        i = 0
+        n = len(linea)
+        
+        while i < n:
+            if linea[i].isspace():
+                i += 1
+                continue
+            
+            # Verificar si es una cadena entre comillas - MEJORADO
+            if linea[i] == '"':
+                j = i + 1
+                while j < n and linea[j] != '"':
+                    j += 1
+                if j < n:
+                    # Encontramos comilla de cierre
+                    elementos.append(linea[i:j+1])
+                    i = j + 1
+                else:
+                    # Comilla sin cerrar, tomamos hasta el final
+                    elementos.append(linea[i:])
+                    i = n
+                continue
+            
+            # Verificar comentarios
+            if i + 1 < n and linea[i:i+2] == "//":
+                # Todo lo que sigue es comentario
+                elementos.append(linea[i:])
+                i = n
+                continue
+            
+            # Verificar operadores de múltiples caracteres
+            elif i + 1 < n and linea[i:i+2] in {'<-', '->', '<>', '<=', '>='}:
+                elementos.append(linea[i:i+2])
+                i += 2
+                continue
+            
+            # Verificar operadores y signos de un solo carácter
+            elif linea[i] in self.operadores or linea[i] in self.signos_permitidos:
+                elementos.append(linea[i])
+                i += 1
+                continue
+            
+            # Palabras y números
+            else:
+                j = i
+                # Avanzar hasta encontrar un delimitador
+                while j < n and not linea[j].isspace() and \
+                      linea[j] not in self.operadores and \
+                      linea[j] not in self.signos_permitidos and \
+                      linea[j] != '"' and \
+                      not (j + 1 < n and linea[j:j+2] == "//"):
+                    j += 1
+                palabra = linea[i:j]
+                if palabra:
+                    elementos.append(palabra)
+                i = j
+        
+        return elementos
+    
+    def _determinar_tipo_pseint(self, elemento):
+        elemento = elemento.strip()
+        e_lower = elemento.lower()
+        
+        # Verificar si es comentario primero
+        if elemento.startswith("//"):
+            return "Comentario"
+        
+        # Palabras reservadas (case-insensitive)
+        if PALABRAS.get(e_lower, PAL_NINGUNA) in PALABRAS_RESERVADAS:
+            return "Palabra Reservada"
+        
+        # Operadores
+        if elemento in self.operadores:
+            return "Operador"
+        
+        # Signos permitidos
+        if elemento in self.signos_permitidos:
+            return "Signo"
+        
+        # Números enteros
+        if re.match(self.patron_numeros, elemento):
+            return "Número"
+        
+        # Números decimales
+        if re.match(self.patron_decimal, elemento):
+            return "Decimal"
+        
+        # Cadenas entre comillas
+        if re.match(self.patron_cadena, elemento):
+            return "Cadena"
+        
+        # Identificadores (incluye snake_case)
+        if re.match(self.patron_identificadores, elemento):
+            # Verificar si es snake_case válido (opcional, para tu reporte)
+            if "_" in elemento:
+                return "Identificador (snake_case)"
+            else:
+                return "Identificador"
+        
+        # Si no coincide con ningún patrón válido
+        return "DESCONOCIDO"
+
+    
+    def analizar_archivo(self, contenido):
+        todos_tokens = []
+        todos_errores = []
+        
+        for _, tokens, errores in self._analizar_lineas(contenido.split('\n')):
+            todos_tokens.extend(tokens)
+            todos_errores.extend(errores)
+        
+        return todos_tokens, todos_errores
+
+    def analizar_por_lineas(self, contenido):
+        """
+        Igual que analizar_archivo pero devuelve (IndiceLineas, errores): los
+        tokens ya agrupados y ordenados por línea, listos para el sintáctico,
+        el semántico y la interfaz.
+        """
+        todos_tokens = []
+        todos_errores = []
+        numeros = array('I')
+        inicios = array('I')
+        simbolos = PoolSimbolos()
+
+        for num_linea, tokens, errores in self._analizar_lineas(contenido.split('\n'), simbolos=simbolos):
+            if tokens:
+                numeros.append(num_linea)
+                inicios.append(len(todos_tokens))
+                todos_tokens.extend(tokens)
+            todos_errores.extend(errores)
+        inicios.append(len(todos_tokens))
+
+        return IndiceLineas(todos_tokens, numeros, inicios, simbolos=simbolos), todos_errores
+
+    def analizar_stream(self, origen, encoding='utf-8'):
+        """
+        Analiza una ruta o un archivo abierto línea por línea, sin cargarlo
+        completo en memoria. Genera (num_linea, tokens, errores) por cada
+        línea no vacía; quien consume puede detenerse cuando quiera.
+        """
+        if isinstance(origen, (str, os.PathLike)):
+            with open(origen, 'r', encoding=encoding) as archivo:
+                yield from self._analizar_lineas(archivo)
+        else:
+            lineas = (linea.decode(encoding) if isinstance(linea, bytes) else linea for linea in origen)
+            yield from self._analizar_lineas(lineas)
+
+    def analizar_mapeado(self, documento, simbolos=None):
+        """
+        Analiza un DocumentoMapeado (ver main.manejo_de_archivos.mapear_archivo)
+        trabajando sobre los bytes. Los tokens son TokenMapeado con
+        desplazamientos en el archivo; su texto se decodifica al pedirlo,
+        por lo que el documento debe seguir abierto mientras se usen.
+        Las palabras se internan en 'simbolos' (uno nuevo si no se pasa).
+        """
+        todos_tokens = []
+        todos_errores = []
+        datos = documento.datos
+        if simbolos is None:
+            simbolos = PoolSimbolos()
+        # bytes del nombre -> id, para no decodificar cada aparición
+        ids_bytes = {}
+
+        for num_linea, inicio, fin in documento.lineas():
+            linea = datos[inicio:fin]
+            if linea.isascii():
+                recortada = linea.strip(_ESPACIOS_ASCII)
+                if recortada:
+                    base = linea.index(recortada[:1])
+                    self._escanear_bytes(documento, recortada, base, num_linea, todos_tokens, todos_errores,
+                                         simbolos, ids_bytes)
+            else:
+                self._escanear_texto_mapeado(documento, linea, num_linea, todos_tokens, todos_errores, simbolos)
+
+        return todos_tokens, todos_errores
+
+    def _escanear_bytes(self, documento, linea, base, num_linea, tokens, errores, simbolos, ids_bytes):
+        """Versión en bytes de _escanear_linea para líneas ASCII; 'base' es la columna de la línea recortada"""
+        clases = simbolos.clases
+        palabras = simbolos.palabras
+
+        for coincidencia in PATRON_MAESTRO_BYTES.finditer(linea):
+            grupo = coincidencia.lastgroup
+            inicio, fin = coincidencia.span(grupo)
+            palabra = PAL_NINGUNA
+            simbolo = SIN_SIMBOLO
+
+            if grupo == 'IDENTIFICADOR':
+                # Como en _escanear_linea, un nombre ya visto sale del pool
+                nombre = linea[inicio:fin]
+                simbolo = ids_bytes.get(nombre)
+                if simbolo is not None:
+                    clase = clases[simbolo]
+                    palabra = palabras[simbolo]
+                else:
+                    palabra = PALABRAS_BYTES.get(nombre.lower(), PAL_NINGUNA)
+                    if palabra in PALABRAS_RESERVADAS:
+                        clase = CLASE_PALABRA_RESERVADA
+                    elif 95 in nombre:  # '_'
+                        clase = CLASE_IDENTIFICADOR_SNAKE
+                    else:
+                        clase = CLASE_IDENTIFICADOR
+                    simbolo = ids_bytes[nombre] = simbolos.agregar(nombre.decode('ascii'), clase, palabra)
+            elif grupo == 'CADENA':
+                if fin - inicio > 1 and linea[fin - 1] == 34:  # '"'
+                    clase = CLASE_CADENA
+                elif linea[inicio:fin].strip(_ESPACIOS_ASCII) == b'"':
+                    clase = CLASE_SIGNO
+                else:
+                    clase = CLASE_DESCONOCIDO
+            elif grupo == 'DESCONOCIDO':
+                clase = CLASE_DESCONOCIDO
+            else:
+                clase = _CLASE_POR_GRUPO[grupo]
+
+            if clase == CLASE_DESCONOCIDO:
+                elemento = linea[inicio:fin].decode('ascii')
+                errores.append(diagnostico("LEX001", num_linea, texto=elemento))
+            else:
+                tokens.append(TokenMapeado(documento, base + inicio, fin - inicio, clase, num_linea, palabra, simbolo))
+
+    def _escanear_texto_mapeado(self, documento, linea, num_linea, tokens, errores, simbolos):
+        """
+        Líneas con caracteres no ASCII: se decodifican y se analizan como
+        texto, y las posiciones se traducen de caracteres a bytes.
+        """
+        codificacion = documento.codificacion
+        texto = linea.decode(codificacion)
+        recortado = texto.strip()
+        if not recortado:
+            return
+
+        pos_caracter = 0
+        pos_byte = len(texto[:len(texto) - len(texto.lstrip())].encode(codificacion))
+        for coincidencia in PATRON_MAESTRO.finditer(recortado):
+            grupo = coincidencia.lastgroup
+            inicio, fin = coincidencia.span(grupo)
+            elemento = recortado[inicio:fin]
+            clase, palabra = _clasificar(grupo, elemento)
+
+            if clase == CLASE_DESCONOCIDO:
+                errores.append(diagnostico("LEX001", num_linea, texto=elemento))
+                continue
+            simbolo = simbolos.agregar(elemento, clase, palabra) if clase in CLASES_CON_SIMBOLO else SIN_SIMBOLO
+
+            pos_byte += len(recortado[pos_caracter:inicio].encode(codificacion))
+            largo = len(elemento.encode(codificacion))
+            tokens.append(TokenMapeado(documento, pos_byte, largo, clase, num_linea, palabra, simbolo))
+            pos_caracter = fin
+            pos_byte += largo
+
+    def analizar_tabla(self, contenido):
+        """
+        Igual que analizar_archivo pero guarda los tokens en una TablaTokens
+        (columnas compactas con línea, columna y desplazamientos en el texto).
+        """
+        tabla = TablaTokens()
+        errores = []
+        inicio_linea = 0
+
+        for num_linea, linea in enumerate(contenido.split('\n'), 1):
+            recortada = linea.strip()
+            if recortada:
+                columna_base = len(linea) - len(linea.lstrip())
+                for coincidencia in PATRON_MAESTRO.finditer(recortada):
+                    grupo = coincidencia.lastgroup
+                    inicio, fin = coincidencia.span(grupo)
+                    elemento = recortada[inicio:fin]
+                    clase, palabra = _clasificar(grupo, elemento)
+
+                    if clase == CLASE_DESCONOCIDO:
+                        errores.append(diagnostico("LEX001", num_linea, columna_base + inicio + 1, texto=elemento))
+                    else:
+                        columna = columna_base + inicio
+                        tabla.agregar(elemento, clase, num_linea, columna,
+                                      inicio_linea + columna, inicio_linea + columna_base + fin, palabra)
+            inicio_linea += len(linea) + 1
+
+        return tabla, errores
+
+    def analizar_con_columnas(self, lineas, primera=1, simbolos=None):
+        """
+        Como _analizar_lineas pero con la columna (desde 1, en caracteres) de
+        cada token: da (num_linea, tokens, columnas, errores) por cada línea
+        con contenido. Los errores llevan también su columna. Usa siempre la
+        expresión maestra, sin caché de líneas.
+        """
+        if simbolos is None:
+            simbolos = PoolSimbolos()
+        for num_linea, linea in enumerate(lineas, primera):
+            recortada = linea.strip()
+            if not recortada:
+                continue
+            columna_base = len(linea) - len(linea.lstrip()) + 1
+            tokens = []
+            columnas = []
+            errores = []
+            for coincidencia in PATRON_MAESTRO.finditer(recortada):
+                grupo = coincidencia.lastgroup
+                elemento = coincidencia.group(grupo)
+                columna = columna_base + coincidencia.start(grupo)
+                clase, palabra = _clasificar(grupo, elemento)
+
+                if clase == CLASE_DESCONOCIDO:
+                    errores.append(diagnostico("LEX001", num_linea, columna, texto=elemento))
+                    continue
+                simbolo = SIN_SIMBOLO
+                if clase in CLASES_CON_SIMBOLO:
+                    simbolo = simbolos.agregar(elemento, clase, palabra)
+                    elemento = simbolos.textos[simbolo]
+                tokens.append(Token(elemento, clase, num_linea, palabra, simbolo))
+                columnas.append(columna)
+            yield num_linea, tokens, columnas, errores
+
+    def _analizar_lineas(self, lineas, primera=1, simbolos=None):
+        """Analiza una secuencia de líneas numerándolas desde 'primera', con un pool para todas"""
+        if simbolos is None:
+            simbolos = PoolSimbolos()
+        for num_linea, linea in enumerate(lineas, primera):
+            linea = linea.strip()
+            if linea:
+                tokens, errores = self.analizar_linea(linea, num_linea, simbolos)
+                yield num_linea, tokens, errores
+    
+    def generar_reporte(self, tokens):
+        return a_texto(escribir_reporte_lexico, tokens)
@@ -0,0 +1,81 @@
+"""
+Nodos del árbol sintáctico de PSeInt.
+
+Cada nodo guarda su línea y, en lugar de copiar tokens, la posición
+[inicio, fin) de su línea dentro de la lista de tokens del Programa.
+Todos usan __slots__ para que un archivo grande no cargue un diccionario
+por nodo.
+"""
+from tokens_pseint import ESCRITURAS
+
+
+class Nodo:
+    __slots__ = ('linea', 'inicio', 'fin')
+
+    def __init__(self, linea, inicio, fin):
+        self.linea = linea
+        self.inicio = inicio
+        self.fin = fin
+
+    def __repr__(self):
+        return f"{type(self).__name__}(linea={self.linea})"
+
+
+class Instruccion(Nodo):
+    """Línea simple: asignación, Escribir, Leer, llamada, etc."""
+    __slots__ = ()
+
+
+class Dimension(Nodo):
+    __slots__ = ()
+
+
+class Definicion(Nodo):
+    """Definir <variables> Como <tipo>; 'tipo' es el identificador de palabra o PAL_NINGUNA"""
+    __slots__ = ('variables', 'tipo')
+
+    def __init__(self, linea, inicio, fin, variables, tipo):
+        super().__init__(linea, inicio, fin)
+        self.variables = variables
+        self.tipo = tipo
+
+
+class Bloque(Nodo):
+    """
+    Estructura con cuerpo: Algoritmo, Proceso, SubProceso, Funcion, Si,
+    Para, Mientras, Repetir y Segun. 'sino' solo se usa en Si; si el bloque
+    quedó sin cerrar, 'linea_cierre' es None.
+    """
+    __slots__ = ('palabra', 'cuerpo', 'sino', 'linea_cierre')
+
+    def __init__(self, palabra, linea, inicio, fin):
+        super().__init__(linea, inicio, fin)
+        self.palabra = palabra
+        self.cuerpo = []
+        self.sino = None
+        self.linea_cierre = None
+
+    def __repr__(self):
+        return f"Bloque({ESCRITURAS[self.palabra]}, linea={self.linea}, cuerpo={len(self.cuerpo)})"
+
+
+class Programa:
+    __slots__ = ('tokens', 'cuerpo')
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.cuerpo = []
+
+    def recorrer(self):
+        """Recorre todos los nodos en orden de aparición, sin recursión"""
+        pendientes = [iter(self.cuerpo)]
+        while pendientes:
+            nodo = next(pendientes[-1], None)
+            if nodo is None:
+                pendientes.pop()
+                continue
+            yield nodo
+            if isinstance(nodo, Bloque):
+                if nodo.sino is not None:
+                    pendientes.append(iter(nodo.sino))
+                pendientes.append(iter(nodo.cuerpo))
@@ -0,0 +1,1222 @@
+"""
+Mediciones de rendimiento del analizador.
+
+Uso:
+    python benchmark.py motores [--lineas 100000]
+    python benchmark.py clasificacion
+    python benchmark.py memoria [--tamanos 10000 100000 1000000]
+    python benchmark.py mapeado [--lineas 1000000]
+    python benchmark.py tabla [--lineas 200000]
+    python benchmark.py incremental [--lineas 50000]
+    python benchmark.py cache [--lineas 200000] [--tamanos 64 512 4096]
+    python benchmark.py etapas [--lineas 200000]
+    python benchmark.py definir [--lineas 100000]
+    python benchmark.py simbolos [--funciones 1000 2000 4000 8000]
+    python benchmark.py semantico [--lineas 200000]
+    python benchmark.py lote [--archivos 400] [--trabajadores 1 2 4]
+    python benchmark.py paralelo [--megas 64] [--trabajadores 1 2 4]
+    python benchmark.py resultados [--archivos 200]
+    python benchmark.py paneles [--lineas 200000]
+    python benchmark.py reporte [--lineas 200000]
+    python benchmark.py eventos [--lineas 200000]
+    python benchmark.py perfil [--lineas 200000]
+    python benchmark.py escalado [--tamanos 1000 10000 100000 1000000] [--errores 0.05]
+                                 [--salida RESULTADOS.json] [--comparar ANTERIOR.json]
+    python benchmark.py vigilancia [--archivos 200] [--lineas 5000]
+    python benchmark.py lsp [--lineas 20000]
+    python benchmark.py importacion [--presupuesto 0.05]   (sale con 1 si se excede)
+    python benchmark.py internado [--lineas 100000] [--nombres 1000 10000 40000]
+"""
+import argparse
+import datetime
+import gc
+import glob
+import json
+import os
+import platform
+import queue
+import re
+import subprocess
+import sys
+import threading
+import tempfile
+import time
+import tracemalloc
+
+# Aquí solo el núcleo: cada medición importa los demás módulos que usa,
+# para que un subcomando no cargue los de los otros
+from analizador import AnalizadorLexico, MOTOR_CLASICO, MOTOR_UNA_PASADA
+from semantico import AnalizadorSemantico
+from sintactico import AnalizadorSintactico
+from tokens_pseint import CLASE_IDENTIFICADOR, PAL_COMO, PAL_DEFINIR, PoolSimbolos
+
+CARPETA_PRUEBAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "txt de prueba")
+
+
+def cargar_corpus():
+    """Lee todos los archivos de 'txt de prueba' y devuelve [(nombre, contenido)]"""
+    corpus = []
+    for ruta in sorted(glob.glob(os.path.join(CARPETA_PRUEBAS, "*.txt"))):
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            corpus.append((os.path.basename(ruta), archivo.read()))
+    return corpus
+
+
+def generar_sintetico(num_lineas):
+    """Genera un archivo sintético repitiendo las líneas del corpus"""
+    lineas = [linea for _, contenido in cargar_corpus() for linea in contenido.split('\n')]
+    return '\n'.join(lineas[i % len(lineas)] for i in range(num_lineas))
+
+
+def medir(funcion, *args, repeticiones=3):
+    """Devuelve el mejor tiempo (en segundos) de varias ejecuciones"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(*args)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def comparar_motores(num_lineas):
+    """Verifica que ambos motores produzcan lo mismo y compara sus tiempos"""
+    clasico = AnalizadorLexico(motor=MOTOR_CLASICO)
+    una_pasada = AnalizadorLexico(motor=MOTOR_UNA_PASADA)
+
+    entradas = cargar_corpus()
+    entradas.append((f"sintetico ({num_lineas} líneas)", generar_sintetico(num_lineas)))
+
+    print(f"{'ARCHIVO':<50} {'CLÁSICO':>10} {'UNA PASADA':>12} {'MEJORA':>8}")
+    print("-" * 84)
+    for nombre, contenido in entradas:
+        if clasico.analizar_archivo(contenido) != una_pasada.analizar_archivo(contenido):
+            raise SystemExit(f"Los motores difieren en '{nombre}'")
+        t_clasico = medir(clasico.analizar_archivo, contenido)
+        t_nuevo = medir(una_pasada.analizar_archivo, contenido)
+        print(f"{nombre:<50} {t_clasico * 1000:>8.2f}ms {t_nuevo * 1000:>10.2f}ms {t_clasico / t_nuevo:>7.2f}x")
+
+
+def _determinar_tipo_original(analizador, elemento):
+    """Clasificación tal como estaba antes de la tabla compartida (referencia)"""
+    elemento = elemento.strip()
+    e_lower = elemento.lower()
+    if elemento.startswith("//"):
+        return "Comentario"
+    if e_lower in [p.lower() for p in analizador.palabras_reservadas]:
+        return "Palabra Reservada"
+    if elemento in analizador.operadores:
+        return "Operador"
+    if elemento in analizador.signos_permitidos:
+        return "Signo"
+    if re.match(analizador.patron_numeros, elemento):
+        return "Número"
+    if re.match(analizador.patron_decimal, elemento):
+        return "Decimal"
+    if re.match(analizador.patron_cadena, elemento):
+        return "Cadena"
+    if re.match(analizador.patron_identificadores, elemento):
+        return "Identificador (snake_case)" if "_" in elemento else "Identificador"
+    return "DESCONOCIDO"
+
+
+def comparar_clasificacion():
+    """Costo por token de clasificar y de comparar palabras clave, antes y después"""
+    analizador = AnalizadorLexico()
+    tokens = []
+    for _, contenido in cargar_corpus():
+        tokens.extend(analizador.analizar_archivo(contenido)[0])
+    textos = [tok.texto for tok in tokens]
+    n = len(textos)
+
+    def clasificar_antes():
+        for texto in textos:
+            _determinar_tipo_original(analizador, texto)
+
+    def clasificar_despues():
+        for texto in textos:
+            analizador._determinar_tipo_pseint(texto)
+
+    def comparar_antes():
+        for texto in textos:
+            texto.lower() == "definir"
+
+    def comparar_despues():
+        for tok in tokens:
+            tok.palabra == PAL_DEFINIR
+
+    print(f"Tokens medidos: {n}\n")
+    print(f"{'OPERACIÓN':<40} {'ANTES':>12} {'DESPUÉS':>12}")
+    print("-" * 66)
+    for nombre, antes, despues in (
+        ("Clasificar token", clasificar_antes, clasificar_despues),
+        ("Comparar con palabra clave", comparar_antes, comparar_despues),
+    ):
+        t_antes = medir(antes, repeticiones=5) / n * 1e9
+        t_despues = medir(despues, repeticiones=5) / n * 1e9
+        print(f"{nombre:<40} {t_antes:>9.0f} ns {t_despues:>9.0f} ns")
+
+
+def _pico_memoria(funcion, *args):
+    """Pico de memoria asignada (en MB) mientras se ejecuta la función"""
+    tracemalloc.start()
+    try:
+        funcion(*args)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def comparar_memoria(tamanos):
+    """Pico de memoria de analizar_archivo frente a analizar_stream"""
+    analizador = AnalizadorLexico()
+
+    def completo(ruta):
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            analizador.analizar_archivo(archivo.read())
+
+    def en_flujo(ruta):
+        for _ in analizador.analizar_stream(ruta):
+            pass
+
+    print(f"{'LÍNEAS':>10} {'TAMAÑO':>10} {'ARCHIVO COMPLETO':>18} {'STREAM':>10}")
+    print("-" * 52)
+    with tempfile.TemporaryDirectory() as carpeta:
+        for num_lineas in tamanos:
+            ruta = os.path.join(carpeta, f"sintetico_{num_lineas}.txt")
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                archivo.write(generar_sintetico(num_lineas))
+            tamano = os.path.getsize(ruta) / (1024 * 1024)
+            print(f"{num_lineas:>10} {tamano:>8.1f}MB {_pico_memoria(completo, ruta):>16.1f}MB "
+                  f"{_pico_memoria(en_flujo, ruta):>8.2f}MB")
+
+
+def comparar_mapeado(num_lineas):
+    """Tiempo de apertura y memoria de tokens: lectura completa frente a mmap"""
+    from main import DocumentoMapeado
+
+    analizador = AnalizadorLexico()
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "sintetico.txt")
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(generar_sintetico(num_lineas))
+
+        def abrir_texto():
+            with open(ruta, 'r', encoding='utf-8') as archivo:
+                return archivo.read()
+
+        def abrir_mapeado():
+            DocumentoMapeado(ruta).cerrar()
+
+        t_texto = medir(abrir_texto)
+        t_mapeado = medir(abrir_mapeado)
+
+        def tokens_texto():
+            global _retenido
+            _retenido = analizador.analizar_archivo(abrir_texto())
+
+        def tokens_mapeado():
+            global _retenido
+            _retenido = analizador.analizar_mapeado(DocumentoMapeado(ruta))
+
+        m_texto = _pico_memoria(tokens_texto)
+        m_mapeado = _pico_memoria(tokens_mapeado)
+
+    print(f"Archivo de {num_lineas} líneas\n")
+    print(f"{'':<28} {'TEXTO':>12} {'MMAP':>12}")
+    print("-" * 54)
+    print(f"{'Apertura':<28} {t_texto * 1000:>10.2f}ms {t_mapeado * 1000:>10.2f}ms")
+    print(f"{'Pico de memoria con tokens':<28} {m_texto:>10.1f}MB {m_mapeado:>10.1f}MB")
+
+
+def _memoria_retenida(funcion, *args):
+    """Memoria (en bytes) que sigue ocupando el resultado de la función"""
+    tracemalloc.start()
+    try:
+        resultado = funcion(*args)
+        retenida = tracemalloc.get_traced_memory()[0]
+        return resultado, retenida
+    finally:
+        tracemalloc.stop()
+
+
+def comparar_tabla(num_lineas):
+    """Memoria por millón de tokens: lista de tokens frente a TablaTokens"""
+    analizador = AnalizadorLexico()
+    contenido = generar_sintetico(num_lineas)
+
+    def como_lista():
+        return analizador.analizar_archivo(contenido)[0]
+
+    def como_tabla():
+        return analizador.analizar_tabla(contenido)[0]
+
+    lista, m_lista = _memoria_retenida(como_lista)
+    del lista
+    tabla, m_tabla = _memoria_retenida(como_tabla)
+    por_millon = 1e6 / len(tabla) / (1024 * 1024)
+
+    print(f"Tokens: {len(tabla)} ({len(tabla.textos)} textos distintos)\n")
+    print(f"{'':<28} {'LISTA':>12} {'TABLA':>12}")
+    print("-" * 54)
+    print(f"{'MB por millón de tokens':<28} {m_lista * por_millon:>10.1f}MB {m_tabla * por_millon:>10.1f}MB")
+    print(f"{'Bytes por token':<28} {m_lista / len(tabla):>12.1f} {m_tabla / len(tabla):>12.1f}")
+
+
+def comparar_incremental(num_lineas):
+    """Reanálisis tras editar una línea: documento completo frente a sesión incremental"""
+    from sesion_lexica import SesionLexica
+
+    analizador = AnalizadorLexico()
+    lineas = generar_sintetico(num_lineas).split('\n')
+    sesion = SesionLexica(analizador, '\n'.join(lineas))
+
+    medio = num_lineas // 2
+    editado = list(lineas)
+    editado[medio] = "    resultado <- resultado + 1"
+    insertado = list(lineas)
+    insertado.insert(medio, "    Escribir \"linea nueva\"")
+    versiones = ('\n'.join(editado), '\n'.join(insertado))
+
+    def completo():
+        for contenido in versiones:
+            analizador.analizar_archivo(contenido)
+
+    def incremental():
+        for contenido in versiones:
+            sesion.actualizar(contenido)
+            sesion.analizar()
+
+    t_completo = medir(completo) / 2
+    t_incremental = medir(incremental) / 2
+    print(f"Documento de {num_lineas} líneas, una línea editada/insertada\n")
+    print(f"{'Reanálisis completo':<28} {t_completo * 1000:>10.2f}ms")
+    print(f"{'Sesión incremental':<28} {t_incremental * 1000:>10.2f}ms "
+          f"({sesion.lineas_reanalizadas} línea(s) reanalizada(s))")
+
+
+def comparar_cache(num_lineas, tamanos):
+    """Tasa de aciertos y tiempo del análisis con caché por línea sobre un corpus repetitivo"""
+    contenido = generar_sintetico(num_lineas)
+    distintas = len({linea.strip() for linea in contenido.split('\n')} - {''})
+    sin_cache = AnalizadorLexico()
+    referencia = sin_cache.analizar_archivo(contenido)
+    t_base = medir(sin_cache.analizar_archivo, contenido)
+
+    print(f"Documento de {num_lineas} líneas ({distintas} distintas)\n")
+    print(f"{'CAPACIDAD':>10} {'TIEMPO':>10} {'MEJORA':>8} {'ACIERTOS':>9} {'DESALOJOS':>10}")
+    print("-" * 51)
+    print(f"{'sin caché':>10} {t_base * 1000:>8.1f}ms {1:>7.2f}x {'-':>9} {'-':>10}")
+    for tamano in tamanos:
+        analizador = AnalizadorLexico(tamano_cache=tamano)
+        if analizador.analizar_archivo(contenido) != referencia:
+            raise SystemExit(f"La caché de {tamano} entradas cambia el resultado")
+        # Cada repetición parte de la caché vacía
+        def analizar():
+            analizador.cache.limpiar()
+            analizador.analizar_archivo(contenido)
+        t_cache = medir(analizar)
+        cache = analizador.cache
+        print(f"{tamano:>10} {t_cache * 1000:>8.1f}ms {t_base / t_cache:>7.2f}x "
+              f"{cache.tasa_aciertos:>8.1%} {cache.desalojos:>10}")
+
+
+def _agrupar_original(tokens):
+    """Agrupado por línea que hacía la interfaz antes del índice compartido (referencia)"""
+    tokens_por_linea = {}
+    for tok in tokens:
+        tokens_por_linea.setdefault(tok.linea, []).append(tok)
+    return [(linea, tokens_por_linea[linea]) for linea in sorted(tokens_por_linea.keys())]
+
+
+def comparar_etapas(num_lineas):
+    """
+    Tiempo de punta a punta (léxico, sintáctico, semántico y agrupado de la
+    interfaz): cada etapa reagrupando la lista plana frente al índice por
+    línea que arma el léxico una sola vez
+    """
+    analizador = AnalizadorLexico()
+    sintactico = AnalizadorSintactico()
+    semantico = AnalizadorSemantico()
+    contenido = generar_sintetico(num_lineas)
+    tokens = analizador.analizar_archivo(contenido)[0]
+    indice = analizador.analizar_por_lineas(contenido)[0]
+
+    def recorrer_indice():
+        for _ in indice:
+            pass
+
+    filas = (
+        ("Léxico", lambda: analizador.analizar_archivo(contenido), lambda: analizador.analizar_por_lineas(contenido)),
+        ("Sintáctico", lambda: sintactico.analizar(tokens), lambda: sintactico.analizar(indice)),
+        ("Semántico", lambda: semantico.analizar(tokens), lambda: semantico.analizar(indice)),
+        ("Agrupado de la interfaz", lambda: _agrupar_original(tokens), recorrer_indice),
+    )
+
+    print(f"Documento de {num_lineas} líneas, {len(tokens)} tokens\n")
+    print(f"{'ETAPA':<24} {'LISTA PLANA':>12} {'ÍNDICE':>12}")
+    print("-" * 50)
+    total_antes = total_despues = 0.0
+    for nombre, antes, despues in filas:
+        t_antes = medir(antes)
+        t_despues = medir(despues)
+        total_antes += t_antes
+        total_despues += t_despues
+        print(f"{nombre:<24} {t_antes * 1000:>10.1f}ms {t_despues * 1000:>10.1f}ms")
+    print("-" * 50)
+    print(f"{'Total':<24} {total_antes * 1000:>10.1f}ms {total_despues * 1000:>10.1f}ms "
+          f"({(1 - total_despues / total_antes):.1%} menos)")
+
+
+def _buscar_como_original(tokens):
+    """Búsqueda de 'Como' del sintáctico anterior: desde cada Definir hasta el final del archivo (referencia)"""
+    variables = 0
+    for i, tok in enumerate(tokens):
+        if tok.palabra == PAL_DEFINIR:
+            i_var = i + 1
+            while i_var < len(tokens) and tokens[i_var].palabra != PAL_COMO:
+                if tokens[i_var].clase == CLASE_IDENTIFICADOR:
+                    variables += 1
+                i_var += 1
+    return variables
+
+
+def comparar_definir(num_lineas):
+    """Caso adverso: líneas 'Definir' sin 'Como'. El recorrido anterior es cuadrático; el actual, lineal"""
+    analizador = AnalizadorLexico()
+    sintactico = AnalizadorSintactico()
+
+    print(f"{'LÍNEAS':>10} {'ANTERIOR':>12} {'ACTUAL':>12}")
+    print("-" * 36)
+    tamano = max(num_lineas // 64, 1)
+    while tamano <= num_lineas:
+        indice = analizador.analizar_por_lineas("Definir a, b, c\n" * tamano)[0]
+        t_actual = medir(sintactico.analizar, indice)
+        # El recorrido anterior se corta en 1/32 del máximo: más arriba tarda minutos
+        if tamano <= num_lineas // 32:
+            anterior = f"{medir(_buscar_como_original, indice.tokens, repeticiones=1) * 1000:>10.1f}ms"
+        else:
+            anterior = f"{'-':>12}"
+        print(f"{tamano:>10} {anterior} {t_actual * 1000:>10.1f}ms")
+        tamano *= 2
+
+
+def _programa_con_funciones(num_funciones):
+    """Programa con num_funciones funciones de tres variables locales y tantas globales como funciones"""
+    lineas = []
+    for n in range(num_funciones):
+        lineas += [
+            f"Funcion Calcular{n}(a, b)",
+            "    Definir a, b, total Como Entero",
+            "    total <- a + b",
+            "    Escribir total",
+            "FinFuncion",
+        ]
+    lineas.append("Algoritmo Principal")
+    lineas += [f"    Definir global{n} Como Real" for n in range(num_funciones)]
+    lineas += [f"    global{n} <- {n}.5" for n in range(num_funciones)]
+    lineas.append("FinAlgoritmo")
+    return "\n".join(lineas)
+
+
+def comparar_simbolos(cantidades):
+    """Memoria por símbolo (diccionario frente a Simbolo) y tiempo del semántico según la cantidad de funciones"""
+    from tabla_simbolos import Ambito, Simbolo
+
+    def como_diccionarios():
+        return [{'tipo': 'Entero', 'linea': n, 'usada': False, 'inicializada': False} for n in range(100000)]
+
+    def como_simbolos():
+        ambito = Ambito("global", 0, 0, None)
+        return [Simbolo(n, f"v{n}", 'Entero', n, ambito) for n in range(100000)]
+
+    _, m_dict = _memoria_retenida(como_diccionarios)
+    _, m_simbolo = _memoria_retenida(como_simbolos)
+    # Los nombres de como_simbolos no cuentan: el registro anterior también los tenía como clave
+    m_nombres = _memoria_retenida(lambda: [f"v{n}" for n in range(100000)])[1]
+    print(f"Bytes por símbolo: diccionario {m_dict / 100000:.0f}, Simbolo {(m_simbolo - m_nombres) / 100000:.0f}\n")
+
+    analizador = AnalizadorLexico()
+    semantico = AnalizadorSemantico()
+    print(f"{'FUNCIONES':>10} {'SÍMBOLOS':>10} {'SEMÁNTICO':>12} {'POR FUNCIÓN':>14}")
+    print("-" * 50)
+    for num_funciones in cantidades:
+        indice = analizador.analizar_por_lineas(_programa_con_funciones(num_funciones))[0]
+        t_semantico = medir(semantico.analizar, indice)
+        print(f"{num_funciones:>10} {len(semantico.tabla_simbolos):>10} {t_semantico * 1000:>10.1f}ms "
+              f"{t_semantico / num_funciones * 1e6:>12.1f}µs")
+
+
+def comparar_semantico(num_lineas):
+    """Tiempo del semántico sobre el corpus y un programa sintético, con el corpus contrastado
+    contra los resultados esperados de tests/esperados"""
+    from tests.test_semantico import ruta_esperado, rutas_corpus, resultado_semantico
+
+    for ruta in rutas_corpus():
+        with open(ruta_esperado(ruta), 'r', encoding='utf-8') as archivo:
+            if resultado_semantico(ruta) != json.load(archivo):
+                raise SystemExit(f"El semántico difiere de lo esperado en '{os.path.basename(ruta)}'")
+
+    analizador = AnalizadorLexico()
+    entradas = [(nombre, analizador.analizar_por_lineas(contenido)[0]) for nombre, contenido in cargar_corpus()]
+    entradas.append((f"sintetico ({num_lineas} líneas)", analizador.analizar_por_lineas(generar_sintetico(num_lineas))[0]))
+    semantico = AnalizadorSemantico()
+
+    print("Corpus igual a lo esperado en tests/esperados\n")
+    print(f"{'ARCHIVO':<50} {'TIEMPO':>10} {'ERRORES':>8}")
+    print("-" * 70)
+    for nombre, indice in entradas:
+        t_semantico = medir(semantico.analizar, indice)
+        print(f"{nombre:<50} {t_semantico * 1000:>8.2f}ms {len(semantico.errores):>8}")
+
+
+def comparar_lote(num_archivos, cantidades):
+    """Archivos por segundo del análisis por lotes según la cantidad de procesos"""
+    from lote import analizar_lote
+
+    corpus = [contenido for _, contenido in cargar_corpus()]
+    with tempfile.TemporaryDirectory() as carpeta:
+        rutas = []
+        for n in range(num_archivos):
+            ruta = os.path.join(carpeta, f"entrega_{n:05d}.txt")
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                archivo.write(corpus[n % len(corpus)] * 20)
+            rutas.append(ruta)
+
+        print(f"{num_archivos} archivos, {os.cpu_count()} núcleo(s)\n")
+        print(f"{'PROCESOS':>10} {'TIEMPO':>10} {'ARCHIVOS/S':>12} {'ACELERACIÓN':>12}")
+        print("-" * 48)
+        base = None
+        for trabajadores in cantidades:
+            tiempo = medir(lambda: list(analizar_lote(rutas, trabajadores)), repeticiones=1)
+            base = base or tiempo
+            print(f"{trabajadores:>10} {tiempo:>9.2f}s {num_archivos / tiempo:>12.1f} {base / tiempo:>11.2f}x")
+
+
+def comparar_paralelo(megas, cantidades):
+    """
+    Análisis léxico de un solo archivo grande repartido en bloques entre
+    procesos. Con --megas 1024 se prueba el archivo de 1 GB, pero hace
+    falta memoria para todos sus tokens (varias veces el tamaño del texto).
+    """
+    from lexico_paralelo import analizar_en_paralelo
+
+    corpus = '\n'.join(contenido for _, contenido in cargar_corpus()) + '\n'
+    contenido = corpus * max(1, megas * 1024 * 1024 // len(corpus))
+    print(f"{len(contenido) / 1024 / 1024:.0f} MB, {contenido.count(chr(10)):,} líneas, "
+          f"{os.cpu_count()} núcleo(s)\n")
+    print(f"{'PROCESOS':>10} {'TIEMPO':>10} {'MB/S':>10} {'ACELERACIÓN':>12}")
+    print("-" * 46)
+    base = None
+    for trabajadores in cantidades:
+        tiempo = medir(analizar_en_paralelo, contenido, trabajadores, repeticiones=1)
+        base = base or tiempo
+        print(f"{trabajadores:>10} {tiempo:>9.2f}s {len(contenido) / 1024 / 1024 / tiempo:>10.1f} "
+              f"{base / tiempo:>11.2f}x")
+
+
+def comparar_resultados(num_archivos):
+    """Análisis completo de muchos archivos sin caché, con caché vacía y con caché llena"""
+    from cache_resultados import CacheResultados, analizar_contenido
+
+    corpus = [contenido for _, contenido in cargar_corpus()]
+    archivos = [corpus[n % len(corpus)] * 20 + f"\n// entrega {n}" for n in range(num_archivos)]
+    analizadores = (AnalizadorLexico(), AnalizadorSintactico(), AnalizadorSemantico())
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        cache = CacheResultados(carpeta)
+
+        def analizar_todos(cache):
+            for contenido in archivos:
+                analizar_contenido(contenido, *analizadores, cache=cache)
+
+        t_sin = medir(analizar_todos, None, repeticiones=1)
+        t_vacia = medir(analizar_todos, cache, repeticiones=1)
+        t_llena = medir(analizar_todos, cache, repeticiones=1)
+        ocupado = sum(os.path.getsize(os.path.join(carpeta, nombre)) for nombre in os.listdir(carpeta))
+
+    print(f"{num_archivos} archivos, {ocupado / 1024:.0f} KB en caché "
+          f"({sum(map(len, archivos)) / 1024:.0f} KB de texto)\n")
+    print(f"{'Sin caché':<20} {t_sin * 1000:>10.1f}ms")
+    print(f"{'Caché vacía':<20} {t_vacia * 1000:>10.1f}ms")
+    print(f"{'Caché llena':<20} {t_llena * 1000:>10.1f}ms  ({t_sin / t_llena:.1f}x)")
+    print(f"\nAciertos: {cache.aciertos}, fallos: {cache.fallos}")
+
+
+def _texto_lexico_original(indice, errores_lexicos):
+    """Texto que armaba el panel léxico antes de las listas virtuales"""
+    resultado = "TOKENS RECONOCIDOS:\n"
+    resultado += "=" * 20 + "\n\n"
+    for error in errores_lexicos:
+        resultado += f"• {error}\n"
+    resultado += "TOKENS POR LÍNEA:\n"
+    resultado += "-" * 15 + "\n"
+    for linea, tokens_linea in indice:
+        resultado += f"\nLínea {linea}:\n"
+        for tok in tokens_linea:
+            resultado += f"   '{tok.texto}' → {tok.tipo}\n"
+    return resultado
+
+
+def comparar_paneles(num_lineas):
+    """Preparar el panel léxico: texto completo frente a vista virtual con la primera página"""
+    from vista_filas import FilasErrores, FilasTokens, VistaFilas
+
+    indice, errores = AnalizadorLexico().analizar_por_lineas(generar_sintetico(num_lineas))
+
+    def como_texto():
+        return _texto_lexico_original(indice, errores)
+
+    def como_vista():
+        vista = VistaFilas(FilasTokens(indice))
+        VistaFilas(FilasErrores(errores)).filas(0, 30)
+        return vista.filas(0, 30)
+
+    vista = VistaFilas(FilasTokens(indice))
+    t_texto = medir(como_texto)
+    t_vista = medir(como_vista)
+    t_filtro = medir(lambda: vista.filtrar(linea=num_lineas // 2))
+    t_tipo = medir(lambda: vista.filtrar(tipo="Cadena"))
+    vista.filtrar()
+    t_orden = medir(lambda: vista.ordenar(1))
+
+    print(f"{len(indice.tokens):,} tokens, {len(errores)} errores léxicos\n")
+    print(f"{'Texto completo (antes)':<32} {t_texto * 1000:>10.1f}ms  ({len(como_texto()) / 1024 / 1024:.0f} MB de texto)")
+    print(f"{'Vista + primera página':<32} {t_vista * 1000:>10.3f}ms")
+    print(f"{'Filtrar por línea':<32} {t_filtro * 1000:>10.3f}ms")
+    print(f"{'Filtrar por tipo':<32} {t_tipo * 1000:>10.1f}ms")
+    print(f"{'Ordenar por token':<32} {t_orden * 1000:>10.1f}ms")
+
+
+def _reporte_json_concatenado(tokens):
+    """Reporte JSON armado como un solo texto, como se hacía con el de texto"""
+    import json
+    return json.dumps({"tokens": [{"texto": t, "tipo": tipo, "linea": linea} for t, tipo, linea in tokens]},
+                      ensure_ascii=False)
+
+
+def comparar_reporte(num_lineas):
+    """Tiempo y pico de memoria del reporte escrito de a partes en un archivo"""
+    from reportes import escribir_reporte
+
+    indice, errores = AnalizadorLexico().analizar_por_lineas(generar_sintetico(num_lineas))
+    sintacticos = AnalizadorSintactico().analizar(indice)
+    semanticos, tabla = AnalizadorSemantico().analizar(indice)
+    tokens = indice.tokens
+
+    def a_archivo(formato):
+        with open(os.devnull, 'w', encoding='utf-8', newline='') as salida:
+            escribir_reporte(salida, formato, tokens, errores, sintacticos, semanticos, tabla)
+
+    print(f"{len(tokens):,} tokens\n")
+    print(f"{'REPORTE':<32} {'TIEMPO':>10} {'PICO MEMORIA':>14}")
+    print("-" * 58)
+    casos = (
+        ("JSON en un solo texto", lambda: _reporte_json_concatenado(tokens)),
+        ("JSON escrito de a partes", lambda: a_archivo("json")),
+        ("CSV escrito de a partes", lambda: a_archivo("csv")),
+        ("Texto escrito de a partes", lambda: a_archivo("texto")),
+    )
+    for nombre, funcion in casos:
+        tiempo = medir(funcion, repeticiones=1)
+        pico = _pico_memoria(funcion)
+        print(f"{nombre:<32} {tiempo * 1000:>8.0f}ms {pico:>12.1f}MB")
+
+
+class _SalidaCronometrada:
+    """Descarta lo escrito y anota cuándo llega la primera escritura"""
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.primera = None
+        self.escrituras = 0
+
+    def write(self, texto):
+        if self.primera is None:
+            self.primera = time.perf_counter() - self.inicio
+        self.escrituras += 1
+
+    def flush(self):
+        pass
+
+
+def comparar_eventos(num_lineas):
+    """Latencia hasta el primer evento y tiempo total del flujo JSON Lines"""
+    from eventos_jsonl import escribir_eventos
+    from reportes import escribir_reporte
+
+    contenido = generar_sintetico(num_lineas)
+
+    def reporte_json(salida):
+        indice, errores = AnalizadorLexico().analizar_por_lineas(contenido)
+        sintacticos = AnalizadorSintactico().analizar(indice)
+        semanticos, tabla = AnalizadorSemantico().analizar(indice)
+        escribir_reporte(salida, "json", indice.tokens, errores, sintacticos, semanticos, tabla)
+
+    print(f"{num_lineas:,} líneas\n")
+    print(f"{'SALIDA':<32} {'PRIMER DATO':>12} {'TOTAL':>10} {'ESCRITURAS':>11}")
+    print("-" * 68)
+    casos = (
+        ("Reporte JSON", reporte_json),
+        ("Eventos JSON Lines", lambda salida: escribir_eventos(salida, contenido)),
+        ("Eventos, solo diagnósticos", lambda salida: escribir_eventos(salida, contenido, con_tokens=False)),
+    )
+    for nombre, funcion in casos:
+        # La primera escritura se mide desde el comienzo del análisis
+        salida = _SalidaCronometrada()
+        funcion(salida)
+        total = time.perf_counter() - salida.inicio
+        print(f"{nombre:<32} {salida.primera * 1000:>10.0f}ms {total * 1000:>8.0f}ms {salida.escrituras:>11,}")
+
+
+def comparar_perfil(num_lineas):
+    """Costo del análisis completo sin perfil y con perfil, y lo que mide este"""
+    from cache_resultados import analizar_contenido
+    from perfil import Perfil
+    from reportes import a_texto, escribir_perfil
+
+    contenido = generar_sintetico(num_lineas)
+
+    def analizar(perfil):
+        # Analizadores nuevos: los de la corrida anterior retienen su resultado
+        # y con el montículo más grande el recolector tarda más
+        analizar_contenido(contenido, AnalizadorLexico(), AnalizadorSintactico(), AnalizadorSemantico(), perfil=perfil)
+
+    # Alternadas y con el recolector al día, para que afecte por igual a las dos
+    sin_perfil = con_perfil = float('inf')
+    for _ in range(5):
+        gc.collect()
+        sin_perfil = min(sin_perfil, medir(analizar, None, repeticiones=1))
+        gc.collect()
+        con_perfil = min(con_perfil, medir(analizar, Perfil(), repeticiones=1))
+    print(f"Sin perfil: {sin_perfil * 1000:.0f}ms   con perfil: {con_perfil * 1000:.0f}ms   "
+          f"({(con_perfil / sin_perfil - 1) * 100:+.1f}%)\n")
+
+    perfil = Perfil()
+    analizar(perfil)
+    print(a_texto(escribir_perfil, perfil))
+
+
+# Tamaños por defecto de 'escalado'; 10.000.000 de líneas también funciona
+# pero necesita varios GB de memoria
+TAMANOS_ESCALADO = [1000, 10000, 100000, 1000000]
+
+# Un tiempo que crece más que esto respecto de la corrida anterior se marca
+TOLERANCIA_REGRESION = 1.10
+
+_ETAPAS = ("lexico", "sintactico", "semantico", "total")
+
+
+def medir_escalado(tamanos, generador_base, repeticiones=3):
+    """
+    Mide cada etapa por separado y el análisis completo sobre programas
+    sintéticos de cada tamaño. El léxico se mide con analizar_archivo; el
+    sintáctico y el semántico reciben el IndiceLineas de analizar_por_lineas,
+    como en la interfaz. Devuelve una lista de resultados por tamaño.
+    """
+    from corpus_sintetico import GeneradorPseint
+
+    resultados = []
+    for tamano in tamanos:
+        parametros = dict(generador_base.parametros(), lineas=tamano)
+        contenido = GeneradorPseint(**parametros).generar()
+        # Los archivos enormes se miden una sola vez
+        veces = repeticiones if tamano < 1000000 else 1
+
+        lexico = AnalizadorLexico()
+        t_lexico = medir(lexico.analizar_archivo, contenido, repeticiones=veces)
+        indice, errores = lexico.analizar_por_lineas(contenido)
+        sintactico = AnalizadorSintactico()
+        t_sintactico = medir(sintactico.analizar, indice, repeticiones=veces)
+        semantico = AnalizadorSemantico()
+        t_semantico = medir(semantico.analizar, indice, repeticiones=veces)
+        tokens = len(indice.tokens)
+        errores = len(errores) + len(sintactico.errores) + len(semantico.errores)
+        del indice
+
+        def completo():
+            indice, _ = AnalizadorLexico().analizar_por_lineas(contenido)
+            AnalizadorSintactico().analizar(indice)
+            AnalizadorSemantico().analizar(indice)
+        t_total = medir(completo, repeticiones=veces)
+
+        resultados.append({
+            "lineas": tamano,
+            "bytes": len(contenido.encode('utf-8')),
+            "tokens": tokens,
+            "errores": errores,
+            "segundos": {"lexico": t_lexico, "sintactico": t_sintactico,
+                         "semantico": t_semantico, "total": t_total},
+            "lineas_por_segundo": tamano / t_total,
+        })
+    return resultados
+
+
+def comparar_escalado(tamanos, generador_base, repeticiones, ruta_salida, ruta_anterior):
+    """Curva de tiempos por tamaño; guarda la corrida en JSON y la compara con otra"""
+    from cache_resultados import version_analizador
+
+    generador = {clave: valor for clave, valor in generador_base.parametros().items() if clave != "lineas"}
+    anterior = {}
+    if ruta_anterior:
+        with open(ruta_anterior, 'r', encoding='utf-8') as archivo:
+            corrida_anterior = json.load(archivo)
+        anterior = {resultado["lineas"]: resultado for resultado in corrida_anterior["resultados"]}
+        if corrida_anterior["generador"] != generador:
+            print(f"Aviso: la corrida anterior usó otros programas: {corrida_anterior['generador']}\n")
+
+    print(f"{'LÍNEAS':>10} {'TOKENS':>11} {'LÉXICO':>10} {'SINTÁCTICO':>11} {'SEMÁNTICO':>10} {'TOTAL':>10} {'LÍNEAS/S':>10}")
+    print("-" * 80)
+    resultados = []
+    for tamano in tamanos:
+        # De a un tamaño para mostrar cada fila apenas está
+        resultado, = medir_escalado([tamano], generador_base, repeticiones)
+        resultados.append(resultado)
+        segundos = resultado["segundos"]
+        print(f"{tamano:>10,} {resultado['tokens']:>11,} {segundos['lexico'] * 1000:>8.0f}ms "
+              f"{segundos['sintactico'] * 1000:>9.0f}ms {segundos['semantico'] * 1000:>8.0f}ms "
+              f"{segundos['total'] * 1000:>8.0f}ms {resultado['lineas_por_segundo']:>10,.0f}")
+        previo = anterior.get(tamano)
+        if previo is not None:
+            cambios = []
+            for etapa in _ETAPAS:
+                proporcion = segundos[etapa] / previo["segundos"][etapa]
+                marca = " (más lento)" if proporcion > TOLERANCIA_REGRESION else ""
+                cambios.append(f"{etapa} {proporcion:.2f}x{marca}")
+            print(f"{'':>10} frente a la corrida anterior: {', '.join(cambios)}")
+
+    if ruta_salida:
+        corrida = {
+            "esquema": 1,
+            "fecha": datetime.datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "version_analizador": version_analizador(),
+            "generador": generador,
+            "repeticiones": repeticiones,
+            "resultados": resultados,
+        }
+        with open(ruta_salida, 'w', encoding='utf-8') as archivo:
+            json.dump(corrida, archivo, ensure_ascii=False, indent=2)
+        print(f"\nResultados guardados en {ruta_salida}")
+
+
+def comparar_vigilancia(num_archivos, num_lineas, cambios=20):
+    """
+    Costo de una revisión del modo vigilancia sobre una carpeta y demora
+    entre guardar un archivo y tener sus diagnósticos, reanalizando todo o
+    reutilizando las líneas que no cambiaron. La espera del antirrebote
+    (vigilancia.ESPERA) se suma aparte: acá se mide con espera 0.
+    """
+    from cache_resultados import analizar_contenido
+    from corpus_sintetico import GeneradorPseint
+    from main import leer_texto
+    from vigilancia import AnalisisIncremental, Vigilante
+
+    cambios = min(cambios, num_archivos)
+    with tempfile.TemporaryDirectory() as carpeta:
+        rutas = []
+        for numero in range(num_archivos):
+            ruta = os.path.join(carpeta, f"programa_{numero:04d}.txt")
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                GeneradorPseint(num_lineas, semilla=numero).escribir(archivo)
+            rutas.append(ruta)
+
+        vigilante = Vigilante([carpeta], espera=0)
+        vigilante.tomar_estado()
+        t_revision = medir(vigilante.revisar, repeticiones=20)
+        print(f"Revisión de {num_archivos} archivos sin cambios: {t_revision * 1000:.2f}ms")
+
+        analisis = AnalisisIncremental()
+        for ruta in rutas[:cambios]:
+            analisis.analizar(ruta, leer_texto(ruta))
+
+        completo = incremental = 0.0
+        for numero, ruta in enumerate(rutas[:cambios]):
+            lineas = leer_texto(ruta).split('\n')
+            lineas[len(lineas) // 2] += f" // cambio {numero}"
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                archivo.write('\n'.join(lineas))
+
+            inicio = time.perf_counter()
+            listos, _ = vigilante.revisar()
+            contenido = leer_texto(listos[0])
+            analisis.analizar(listos[0], contenido)
+            incremental += time.perf_counter() - inicio
+            completo += medir(analizar_contenido, contenido, AnalizadorLexico(), AnalizadorSintactico(),
+                              AnalizadorSemantico(), repeticiones=1)
+
+        print(f"Guardar -> diagnósticos ({num_lineas} líneas), promedio de {cambios} cambios:")
+        print(f"  revisión + análisis incremental: {incremental / cambios * 1000:.1f}ms")
+        print(f"  análisis completo:               {completo / cambios * 1000:.1f}ms")
+
+
+class ClienteLsp:
+    """Cliente mínimo que habla con servidor_lsp.py en otro proceso"""
+    def __init__(self):
+        servidor = os.path.join(os.path.dirname(os.path.abspath(__file__)), "servidor_lsp.py")
+        self.proceso = subprocess.Popen([sys.executable, servidor], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        # (momento de llegada, mensaje); un hilo lee para no trabar las escrituras
+        self.recibidos = queue.Queue()
+        threading.Thread(target=self._leer, daemon=True).start()
+        self._numero = 0
+
+    def _leer(self):
+        from servidor_lsp import leer_mensaje
+
+        while True:
+            mensaje = leer_mensaje(self.proceso.stdout)
+            if mensaje is None:
+                return
+            self.recibidos.put((time.perf_counter(), mensaje))
+
+    def notificar(self, metodo, parametros):
+        from servidor_lsp import escribir_mensaje
+
+        escribir_mensaje(self.proceso.stdin, {"jsonrpc": "2.0", "method": metodo, "params": parametros})
+
+    def solicitar(self, metodo, parametros):
+        from servidor_lsp import escribir_mensaje
+
+        self._numero += 1
+        escribir_mensaje(self.proceso.stdin, {"jsonrpc": "2.0", "id": self._numero, "method": metodo, "params": parametros})
+        while True:
+            _, mensaje = self.recibidos.get(timeout=60)
+            if mensaje.get("id") == self._numero:
+                return mensaje
+
+    def esperar_diagnosticos(self, version):
+        """(momento, diagnósticos) de la próxima publicación de 'version'"""
+        while True:
+            momento, mensaje = self.recibidos.get(timeout=60)
+            if mensaje.get("method") == "textDocument/publishDiagnostics" and mensaje["params"].get("version") == version:
+                return momento, mensaje["params"]["diagnostics"]
+
+    def cerrar(self):
+        self.solicitar("shutdown", None)
+        self.notificar("exit", None)
+        return self.proceso.wait(timeout=10)
+
+
+def comparar_lsp(num_lineas, pausa=0.1):
+    """
+    Servidor LSP con un documento sintético: costo de aplicar cada tecla en
+    el proceso y, desde otro proceso como un editor, el primer análisis, la
+    demora entre cada tecla y su primera publicación (léxico nuevo y el resto
+    trasladado) y la del análisis completo tras la última tecla.
+    """
+    from corpus_sintetico import GeneradorPseint
+    from sesion_lexica import SesionLexica
+    from servidor_lsp import ESPERA as ESPERA_LSP, aplicar_cambio, diagnosticos_lsp
+
+    contenido = GeneradorPseint(num_lineas, funciones=20, identificadores=200, errores=0.01).generar()
+    mitad = num_lineas // 2
+    palabra = "total <- total + 1 @"
+
+    # Teclas: Enter al final de la línea del medio y después la palabra letra por letra
+    largo = len(contenido.split('\n')[mitad])
+    cambios = [{"range": {"start": {"line": mitad, "character": largo}, "end": {"line": mitad, "character": largo}},
+                "text": "\n"}]
+    for columna, letra in enumerate(palabra):
+        posicion = {"line": mitad + 1, "character": columna}
+        cambios.append({"range": {"start": posicion, "end": posicion}, "text": letra})
+
+    # --- En el proceso: solo la edición de la sesión léxica ---
+    sesion = SesionLexica(contenido=contenido)
+    tiempos = []
+    for cambio in cambios:
+        inicio = time.perf_counter()
+        aplicar_cambio(sesion, cambio)
+        tiempos.append(time.perf_counter() - inicio)
+    print(f"Aplicar una tecla ({num_lineas} líneas): Enter {tiempos[0] * 1000:.2f}ms   "
+          f"letra (promedio) {sum(tiempos[1:]) / len(tiempos[1:]) * 1000:.3f}ms")
+
+    indice = sesion.indice()
+    errores = sesion.errores() + AnalizadorSintactico().analizar(indice) + AnalizadorSemantico().analizar(indice)[0]
+    esperados = diagnosticos_lsp(errores, sesion)
+
+    # --- Desde otro proceso, como un editor ---
+    cliente = ClienteLsp()
+    cliente.solicitar("initialize", {"processId": os.getpid(), "rootUri": None, "capabilities": {}})
+    cliente.notificar("initialized", {})
+    uri = "file:///sintetico.psc"
+    inicio = time.perf_counter()
+    cliente.notificar("textDocument/didOpen", {"textDocument": {"uri": uri, "languageId": "pseint", "version": 1,
+                                                                "text": contenido}})
+    momento, diagnosticos = cliente.esperar_diagnosticos(1)
+    print(f"Abrir y primer análisis: {(momento - inicio) * 1000:.0f}ms ({len(diagnosticos)} diagnósticos)")
+
+    demoras = []
+    for version, cambio in enumerate(cambios, 2):
+        inicio = time.perf_counter()
+        cliente.notificar("textDocument/didChange", {"textDocument": {"uri": uri, "version": version},
+                                                     "contentChanges": [cambio]})
+        momento, _ = cliente.esperar_diagnosticos(version)
+        demoras.append(momento - inicio)
+        time.sleep(max(0.0, pausa - (time.perf_counter() - inicio)))
+    momento, diagnosticos = cliente.esperar_diagnosticos(len(cambios) + 1)
+    demoras.sort()
+    print(f"{len(cambios)} teclas cada {pausa * 1000:.0f}ms, tecla -> primera publicación: "
+          f"mediana {demoras[len(demoras) // 2] * 1000:.0f}ms   máximo {demoras[-1] * 1000:.0f}ms "
+          f"(antirrebote {ESPERA_LSP * 1000:.0f}ms)")
+    print(f"Última tecla -> análisis completo: {(momento - inicio) * 1000:.0f}ms")
+    print(f"Diagnósticos iguales a un análisis completo: {'sí' if diagnosticos == esperados else 'NO'}")
+    cliente.cerrar()
+
+
+# Módulos que se usan sin la interfaz: analizadores, caché, reportes y archivos (main)
+MODULOS_NUCLEO = (
+    "tokens_pseint", "diagnosticos", "analizador", "sintactico", "semantico", "sesion_lexica",
+    "cache_resultados", "reportes", "main",
+)
+
+# Módulos de la interfaz, que el núcleo no debe cargar
+MODULOS_INTERFAZ = ("tkinter", "_tkinter")
+
+# Segundos que puede tardar la importación en frío del núcleo
+PRESUPUESTO_IMPORTACION = 0.05
+
+
+def medir_importacion(modulos):
+    """
+    Importa los módulos en un intérprete nuevo con -X importtime. Devuelve
+    los segundos de cada módulo pedido (con todo lo que importa) y la lista
+    de módulos cargados.
+    """
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modulos)],
+                             cwd=carpeta, capture_output=True, text=True, check=True)
+    segundos = {}
+    cargados = []
+    # Formato: "import time: <propio us> | <acumulado us> | <sangría><módulo>"
+    for linea in proceso.stderr.splitlines():
+        partes = linea.split("|")
+        if len(partes) != 3 or not partes[1].strip().isdigit():
+            continue
+        nombre = partes[2].rstrip()
+        cargados.append(nombre.strip())
+        # Los importados por otro van con más sangría; los pedidos, con un espacio
+        if len(nombre) - len(nombre.lstrip()) == 1 and nombre.strip() in modulos:
+            segundos[nombre.strip()] = int(partes[1]) / 1e6
+    return segundos, cargados
+
+
+def comparar_importacion(presupuesto=PRESUPUESTO_IMPORTACION, repeticiones=5):
+    """
+    Importación en frío del núcleo, la menor de varias corridas. Devuelve
+    False si se excede el presupuesto o si se cargó tkinter.
+    """
+    mejor = None
+    for _ in range(repeticiones):
+        segundos, cargados = medir_importacion(MODULOS_NUCLEO)
+        if mejor is None or sum(segundos.values()) < sum(mejor[0].values()):
+            mejor = segundos, cargados
+    segundos, cargados = mejor
+    total = sum(segundos.values())
+
+    for modulo, tiempo in segundos.items():
+        print(f"  {modulo:<20} {tiempo * 1000:7.1f}ms")
+    print(f"Núcleo ({len(cargados)} módulos cargados): {total * 1000:.1f}ms   "
+          f"presupuesto {presupuesto * 1000:.0f}ms")
+
+    interfaz = [modulo for modulo in MODULOS_INTERFAZ if modulo in cargados]
+    if interfaz:
+        print(f"ERROR: el núcleo importa la interfaz ({', '.join(interfaz)})")
+    if total > presupuesto:
+        print("ERROR: la importación excede el presupuesto")
+    return not interfaz and total <= presupuesto
+
+
+def _tokens_con_pool(analizador, contenido, pool_por_linea):
+    """
+    Tokens del documento y el pool de símbolos. Con un pool nuevo por línea
+    cada aparición de un nombre en otra línea es otra cadena, como antes del
+    pool por documento.
+    """
+    simbolos = PoolSimbolos()
+    tokens = []
+    for num_linea, linea in enumerate(contenido.split('\n'), 1):
+        linea = linea.strip()
+        if linea:
+            if pool_por_linea:
+                simbolos = PoolSimbolos()
+            tokens.extend(analizador.analizar_linea(linea, num_linea, simbolos)[0])
+    return tokens, simbolos
+
+
+def comparar_internado(num_lineas, cantidades):
+    """
+    Pool de símbolos por documento frente a uno por línea según la cantidad
+    de nombres distintos: memoria de los tokens, tiempo del léxico y costo
+    de buscar cada aparición de un identificador por nombre o por id.
+    """
+    from corpus_sintetico import GeneradorPseint
+
+    analizador = AnalizadorLexico()
+    print(f"{'NOMBRES':>8} {'SÍMBOLOS':>9} {'MEMORIA':>17} {'LÉXICO':>19} {'BÚSQUEDA':>19} {'SEMÁNTICO':>10}")
+    print(f"{'':>8} {'':>9} {'POR LÍNEA':>9} {'DOC':>7} {'POR LÍNEA':>10} {'DOC':>8} {'NOMBRE':>10} {'ID':>8}")
+    print("-" * 80)
+    for cantidad in cantidades:
+        contenido = GeneradorPseint(num_lineas, identificadores=cantidad, funciones=50).generar()
+        gc.collect()
+        (tokens_linea, _), m_linea = _memoria_retenida(_tokens_con_pool, analizador, contenido, True)
+        gc.collect()
+        (tokens, simbolos), m_documento = _memoria_retenida(_tokens_con_pool, analizador, contenido, False)
+        t_linea = medir(_tokens_con_pool, analizador, contenido, True)
+        t_documento = medir(_tokens_con_pool, analizador, contenido, False)
+
+        # Cada aparición de un identificador, buscada como lo hace el semántico
+        nombres_linea = [tok.texto for tok in tokens_linea if tok.clase == CLASE_IDENTIFICADOR]
+        ids = [tok.simbolo for tok in tokens if tok.clase == CLASE_IDENTIFICADOR]
+        por_nombre = {texto: texto for texto in simbolos.textos[1:]}
+        por_id = list(simbolos.textos)
+        t_nombre = medir(lambda: [por_nombre.get(nombre) for nombre in nombres_linea])
+        t_id = medir(lambda: [por_id[simbolo] for simbolo in ids])
+        del tokens_linea, nombres_linea
+
+        indice = analizador.analizar_por_lineas(contenido)[0]
+        t_semantico = medir(AnalizadorSemantico().analizar, indice)
+        print(f"{cantidad:>8} {len(simbolos) - 1:>9} {m_linea / 2**20:>7.1f}MB {m_documento / 2**20:>5.1f}MB "
+              f"{t_linea * 1000:>8.0f}ms {t_documento * 1000:>6.0f}ms "
+              f"{t_nombre * 1000:>8.1f}ms {t_id * 1000:>6.1f}ms {t_semantico * 1000:>8.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del analizador PSeInt")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    p_motores = subparsers.add_parser("motores", help="Compara el motor clásico con el de una pasada")
+    p_motores.add_argument("--lineas", type=int, default=100000)
+
+    subparsers.add_parser("clasificacion", help="Costo por token de la tabla de palabras clave")
+
+    p_memoria = subparsers.add_parser("memoria", help="Pico de memoria del análisis completo y en flujo")
+    p_memoria.add_argument("--tamanos", type=int, nargs="+", default=[10000, 100000, 1000000])
+
+    p_mapeado = subparsers.add_parser("mapeado", help="Apertura y memoria con archivos mapeados")
+    p_mapeado.add_argument("--lineas", type=int, default=1000000)
+
+    p_tabla = subparsers.add_parser("tabla", help="Memoria de la lista de tokens frente a TablaTokens")
+    p_tabla.add_argument("--lineas", type=int, default=200000)
+
+    p_incremental = subparsers.add_parser("incremental", help="Reanálisis léxico tras editar una línea")
+    p_incremental.add_argument("--lineas", type=int, default=50000)
+
+    p_cache = subparsers.add_parser("cache", help="Análisis con caché por contenido de línea")
+    p_cache.add_argument("--lineas", type=int, default=200000)
+    p_cache.add_argument("--tamanos", type=int, nargs="+", default=[64, 512, 4096])
+
+    p_etapas = subparsers.add_parser("etapas", help="Tiempo por etapa con y sin índice por línea compartido")
+    p_etapas.add_argument("--lineas", type=int, default=200000)
+
+    p_definir = subparsers.add_parser("definir", help="Sintáctico con muchas líneas 'Definir' sin 'Como'")
+    p_definir.add_argument("--lineas", type=int, default=100000)
+
+    p_simbolos = subparsers.add_parser("simbolos", help="Memoria por símbolo y semántico con muchas funciones")
+    p_simbolos.add_argument("--funciones", type=int, nargs="+", default=[1000, 2000, 4000, 8000])
+
+    p_semantico = subparsers.add_parser("semantico", help="Tiempo del semántico, contrastado con lo esperado")
+    p_semantico.add_argument("--lineas", type=int, default=200000)
+
+    p_lote = subparsers.add_parser("lote", help="Escalado del análisis por lotes con varios procesos")
+    p_lote.add_argument("--archivos", type=int, default=400)
+    p_lote.add_argument("--trabajadores", type=int, nargs="+", default=[1, 2, 4])
+
+    p_paralelo = subparsers.add_parser("paralelo", help="Léxico de un archivo grande repartido entre procesos")
+    p_paralelo.add_argument("--megas", type=int, default=64)
+    p_paralelo.add_argument("--trabajadores", type=int, nargs="+", default=[1, 2, 4])
+
+    p_resultados = subparsers.add_parser("resultados", help="Análisis completo con la caché de resultados en disco")
+    p_resultados.add_argument("--archivos", type=int, default=200)
+
+    p_paneles = subparsers.add_parser("paneles", help="Panel léxico como texto frente a lista virtual")
+    p_paneles.add_argument("--lineas", type=int, default=200000)
+
+    p_reporte = subparsers.add_parser("reporte", help="Reportes en texto, JSON y CSV escritos de a partes")
+    p_reporte.add_argument("--lineas", type=int, default=200000)
+
+    p_eventos = subparsers.add_parser("eventos", help="Latencia y tiempo total del flujo de eventos JSON Lines")
+    p_eventos.add_argument("--lineas", type=int, default=200000)
+
+    p_perfil = subparsers.add_parser("perfil", help="Costo de medir con un Perfil y sus tiempos por fase")
+    p_perfil.add_argument("--lineas", type=int, default=200000)
+
+    p_escalado = subparsers.add_parser("escalado", help="Tiempo por etapa según el tamaño, con programas sintéticos")
+    p_escalado.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS_ESCALADO)
+    p_escalado.add_argument("--profundidad", type=int, default=4)
+    p_escalado.add_argument("--funciones", type=int, default=20)
+    p_escalado.add_argument("--identificadores", type=int, default=200)
+    p_escalado.add_argument("--errores", type=float, default=0.0, help="Proporción de sentencias rotas (0 a 1)")
+    p_escalado.add_argument("--semilla", type=int, default=0)
+    p_escalado.add_argument("--repeticiones", type=int, default=3)
+    p_escalado.add_argument("--salida", help="Guarda los resultados en este archivo JSON")
+    p_escalado.add_argument("--comparar", help="Archivo JSON de una corrida anterior")
+
+    p_vigilancia = subparsers.add_parser("vigilancia", help="Revisión de una carpeta y demora entre guardar y diagnosticar")
+    p_vigilancia.add_argument("--archivos", type=int, default=200)
+    p_vigilancia.add_argument("--lineas", type=int, default=5000)
+
+    p_lsp = subparsers.add_parser("lsp", help="Servidor LSP: costo por tecla y demora de los diagnósticos")
+    p_lsp.add_argument("--lineas", type=int, default=20000)
+
+    p_importacion = subparsers.add_parser("importacion", help="Importación en frío del núcleo sin tkinter, con presupuesto")
+    p_importacion.add_argument("--presupuesto", type=float, default=PRESUPUESTO_IMPORTACION, help="Segundos")
+
+    p_internado = subparsers.add_parser("internado", help="Pool de símbolos por documento: memoria, léxico y búsqueda por id")
+    p_internado.add_argument("--lineas", type=int, default=100000)
+    p_internado.add_argument("--nombres", type=int, nargs="+", default=[1000, 10000, 40000])
+
+    args = parser.parse_args()
+    if args.comando == "motores":
+        comparar_motores(args.lineas)
+    elif args.comando == "clasificacion":
+        comparar_clasificacion()
+    elif args.comando == "memoria":
+        comparar_memoria(args.tamanos)
+    elif args.comando == "mapeado":
+        comparar_mapeado(args.lineas)
+    elif args.comando == "tabla":
+        comparar_tabla(args.lineas)
+    elif args.comando == "incremental":
+        comparar_incremental(args.lineas)
+    elif args.comando == "cache":
+        comparar_cache(args.lineas, args.tamanos)
+    elif args.comando == "etapas":
+        comparar_etapas(args.lineas)
+    elif args.comando == "definir":
+        comparar_definir(args.lineas)
+    elif args.comando == "simbolos":
+        comparar_simbolos(args.funciones)
+    elif args.comando == "semantico":
+        comparar_semantico(args.lineas)
+    elif args.comando == "lote":
+        comparar_lote(args.archivos, args.trabajadores)
+    elif args.comando == "paralelo":
+        comparar_paralelo(args.megas, args.trabajadores)
+    elif args.comando == "resultados":
+        comparar_resultados(args.archivos)
+    elif args.comando == "paneles":
+        comparar_paneles(args.lineas)
+    elif args.comando == "reporte":
+        comparar_reporte(args.lineas)
+    elif args.comando == "eventos":
+        comparar_eventos(args.lineas)
+    elif args.comando == "perfil":
+        comparar_perfil(args.lineas)
+    elif args.comando == "escalado":
+        from corpus_sintetico import GeneradorPseint
+
+        generador = GeneradorPseint(1, args.profundidad, args.funciones, args.identificadores,
+                                    args.errores, args.semilla)
+        comparar_escalado(args.tamanos, generador, args.repeticiones, args.salida, args.comparar)
+    elif args.comando == "vigilancia":
+        comparar_vigilancia(args.archivos, args.lineas)
+    elif args.comando == "lsp":
+        comparar_lsp(args.lineas)
+    elif args.comando == "importacion":
+        if not comparar_importacion(args.presupuesto):
+            sys.exit(1)
+    elif args.comando == "internado":
+        comparar_internado(args.lineas, args.nombres)
+
+
+if __name__ == "__main__":
+    main()
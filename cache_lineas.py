@@ -0,0 +1,62 @@
+"""
+Caché de análisis por contenido de línea.
+
+Los programas en PSeInt repiten muchas líneas idénticas (FinSi, FinPara,
+asignaciones, Escribir). La caché guarda lo que produjo el análisis de
+cada texto de línea, sin número de línea, y descarta la entrada usada
+hace más tiempo cuando se llena.
+"""
+from collections import OrderedDict
+
+
+class CacheLineas:
+    def __init__(self, capacidad=4096):
+        if capacidad < 1:
+            raise ValueError(f"La capacidad de la caché debe ser positiva: {capacidad}")
+        self.capacidad = capacidad
+        self._entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def obtener(self, linea):
+        """Devuelve lo guardado para la línea o None, y la marca como usada"""
+        entrada = self._entradas.get(linea)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(linea)
+        self.aciertos += 1
+        return entrada
+
+    def guardar(self, linea, entrada):
+        self._entradas[linea] = entrada
+        self._entradas.move_to_end(linea)
+        if len(self._entradas) > self.capacidad:
+            self._entradas.popitem(last=False)
+            self.desalojos += 1
+
+    def limpiar(self):
+        """Vacía la caché y reinicia los contadores"""
+        self._entradas.clear()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    @property
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def estadisticas(self):
+        return {
+            'capacidad': self.capacidad,
+            'entradas': len(self._entradas),
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'tasa_aciertos': self.tasa_aciertos,
+        }
@@ -0,0 +1,325 @@
+"""
+Caché en disco de resultados de análisis completos.
+
+La clave es un hash del contenido del archivo y de la versión del
+analizador (el hash del código de sus módulos), así que un archivo que no
+cambió nunca se vuelve a analizar y cualquier cambio en los analizadores
+invalida todo lo guardado. Cada resultado es un archivo propio: tokens en
+columnas, errores de las tres etapas, tabla de símbolos y funciones
+declaradas, serializados con marshal y comprimidos.
+
+Varios procesos pueden compartir la carpeta: las escrituras van a un
+archivo temporal que después se renombra (os.replace es atómico) y un
+archivo que desaparece o llega dañado cuenta como fallo, y una escritura
+que falla (carpeta de solo lectura o llena) solo deja el resultado sin
+guardar. El tamaño total se limita desalojando los archivos usados hace
+más tiempo (cada acierto actualiza su fecha de modificación). Cada
+proceso solo estima lo que escribe él, así que el tamaño se vuelve a medir
+en disco cada tantas escrituras y al desalojar; en esa medición también se
+borran los temporales viejos que dejaron escritores que murieron antes del
+renombrado.
+"""
+import marshal
+import os
+import zlib
+from array import array
+
+from diagnosticos import a_tupla, desde_tupla
+from perfil import medir
+from tokens_pseint import IndiceLineas, PoolSimbolos, Token
+
+# hashlib y tempfile se importan al usar la caché: quien solo analiza no los paga
+
+# Cambia si cambia la forma de lo guardado
+FORMATO = 4
+
+# Módulos cuyo código define el resultado del análisis
+_MODULOS_ANALIZADOR = (
+    'analizador.py', 'arbol_sintactico.py', 'diagnosticos.py', 'semantico.py', 'sintactico.py',
+    'tabla_simbolos.py', 'tokens_pseint.py',
+)
+
+EXTENSION = '.res'
+
+LIMITE_PREDETERMINADO = 256 * 1024 * 1024
+
+TEMPORAL = '.tmp'
+
+# Un temporal más viejo que esto (en segundos) es de un escritor que murió
+ANTIGUEDAD_TEMPORALES = 3600
+
+# Cada cuántas escrituras se vuelve a medir la carpeta, por lo que escriben otros procesos
+_MEDIR_CADA = 64
+
+_version = None
+
+
+def version_analizador():
+    """Hash del código de los analizadores; se calcula una vez por proceso"""
+    global _version
+    if _version is None:
+        import hashlib
+
+        resumen = hashlib.sha256(str(FORMATO).encode('ascii'))
+        carpeta = os.path.dirname(os.path.abspath(__file__))
+        for nombre in _MODULOS_ANALIZADOR:
+            with open(os.path.join(carpeta, nombre), 'rb') as archivo:
+                resumen.update(archivo.read())
+        _version = resumen.hexdigest()[:16]
+    return _version
+
+
+def carpeta_predeterminada():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'analizador_pseint')
+
+
+class ResultadoAnalisis:
+    """Lo que producen las tres etapas para un archivo"""
+    __slots__ = ('indice', 'lexicos', 'sintacticos', 'semanticos', 'tabla_simbolos', 'funciones', 'desde_cache')
+
+    def __init__(self, indice, lexicos, sintacticos, semanticos, tabla_simbolos, funciones, desde_cache=False):
+        self.indice = indice
+        self.lexicos = lexicos
+        self.sintacticos = sintacticos
+        self.semanticos = semanticos
+        self.tabla_simbolos = tabla_simbolos
+        # nombre -> datos de la función, como AnalizadorSemantico.funciones
+        self.funciones = funciones
+        self.desde_cache = desde_cache
+
+
+def _serializar(resultado):
+    # Los textos de las palabras son los del pool: marshal guarda cada uno
+    # una sola vez y al leerlos los tokens vuelven a compartirlos
+    tokens = resultado.indice.tokens
+    simbolos = resultado.indice.simbolos
+    datos = (
+        FORMATO,
+        [tok.texto for tok in tokens],
+        bytes(tok.clase for tok in tokens),
+        array('H', [tok.palabra for tok in tokens]).tobytes(),
+        array('I', [tok.linea for tok in tokens]).tobytes(),
+        array('I', [tok.simbolo for tok in tokens]).tobytes(),
+        simbolos.textos,
+        simbolos.clases.tobytes(),
+        simbolos.palabras.tobytes(),
+        array('I', resultado.indice.numeros).tobytes(),
+        array('I', resultado.indice.inicios).tobytes(),
+        # marshal no acepta subclases de str: los Diagnostico van como tuplas
+        [a_tupla(error) for error in resultado.lexicos],
+        [a_tupla(error) for error in resultado.sintacticos],
+        [a_tupla(error) for error in resultado.semanticos],
+        list(resultado.tabla_simbolos.items()),
+        list(resultado.funciones.items()),
+    )
+    return zlib.compress(marshal.dumps(datos), 1)
+
+
+def _deserializar(datos):
+    (formato, textos, clases, palabras, lineas, simbolos, textos_pool, clases_pool, palabras_pool,
+     numeros, inicios, lexicos, sintacticos, semanticos, tabla, funciones) = marshal.loads(zlib.decompress(datos))
+    if formato != FORMATO:
+        raise ValueError(f"Formato de caché desconocido: {formato}")
+    palabras = array('H', palabras)
+    lineas = array('I', lineas)
+    simbolos = array('I', simbolos)
+    tokens = list(map(Token, textos, clases, lineas, palabras, simbolos))
+    pool = PoolSimbolos.desde_columnas(textos_pool, clases_pool, palabras_pool)
+    indice = IndiceLineas(tokens, array('I', numeros), array('I', inicios), simbolos=pool)
+    lexicos = [desde_tupla(error) for error in lexicos]
+    sintacticos = [desde_tupla(error) for error in sintacticos]
+    semanticos = [desde_tupla(error) for error in semanticos]
+    return ResultadoAnalisis(indice, lexicos, sintacticos, semanticos, dict(tabla), dict(funciones),
+                             desde_cache=True)
+
+
+class CacheResultados:
+    def __init__(self, carpeta=None, limite_bytes=LIMITE_PREDETERMINADO):
+        if limite_bytes < 1:
+            raise ValueError(f"El límite de la caché debe ser positivo: {limite_bytes}")
+        self.carpeta = carpeta or carpeta_predeterminada()
+        self.limite_bytes = limite_bytes
+        os.makedirs(self.carpeta, exist_ok=True)
+        # Tamaño estimado de la carpeta; se mide de verdad al desalojar
+        self._ocupado = None
+        self._sin_medir = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.escrituras = 0
+        self.desalojos = 0
+        self.temporales_borrados = 0
+
+    def clave(self, contenido):
+        import hashlib
+
+        resumen = hashlib.sha256(version_analizador().encode('ascii'))
+        resumen.update(contenido.encode('utf-8', 'surrogatepass'))
+        return resumen.hexdigest()
+
+    def _ruta(self, clave):
+        return os.path.join(self.carpeta, clave + EXTENSION)
+
+    def obtener(self, contenido):
+        """ResultadoAnalisis guardado para el contenido, o None"""
+        ruta = self._ruta(self.clave(contenido))
+        try:
+            with open(ruta, 'rb') as archivo:
+                resultado = _deserializar(archivo.read())
+        except FileNotFoundError:
+            self.fallos += 1
+            return None
+        except (OSError, EOFError, ValueError, TypeError, zlib.error):
+            # Archivo dañado (o de otro formato): se descarta
+            self._borrar(ruta)
+            self.fallos += 1
+            return None
+
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+        self.aciertos += 1
+        return resultado
+
+    def guardar(self, contenido, resultado):
+        import tempfile
+
+        datos = _serializar(resultado)
+        temporal = None
+        try:
+            descriptor, temporal = tempfile.mkstemp(dir=self.carpeta, suffix=TEMPORAL)
+            with os.fdopen(descriptor, 'wb') as archivo:
+                archivo.write(datos)
+            os.replace(temporal, self._ruta(self.clave(contenido)))
+        except OSError:
+            # Carpeta de solo lectura, llena o borrada: el resultado no se guarda
+            if temporal is not None:
+                self._borrar(temporal)
+            return
+        self.escrituras += 1
+
+        self._sin_medir += 1
+        if self._ocupado is None or self._sin_medir >= _MEDIR_CADA:
+            self._ocupado = self._medir()[1]
+        else:
+            self._ocupado += len(datos)
+        if self._ocupado > self.limite_bytes:
+            self._desalojar()
+
+    def _entradas(self):
+        """(ruta, tamaño, último uso) de cada resultado guardado"""
+        return self._escanear(EXTENSION)
+
+    def _escanear(self, extension):
+        with os.scandir(self.carpeta) as entradas:
+            for entrada in entradas:
+                if entrada.name.endswith(extension):
+                    try:
+                        estado = entrada.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield entrada.path, estado.st_size, estado.st_mtime
+
+    def _medir(self):
+        """
+        Mide la carpeta en disco: devuelve las entradas de resultados y el
+        total ocupado, que incluye los temporales de escrituras en curso.
+        Los temporales más viejos que ANTIGUEDAD_TEMPORALES se borran.
+        """
+        import time
+
+        limite_temporales = time.time() - ANTIGUEDAD_TEMPORALES
+        ocupado = 0
+        for ruta, tamano, modificado in list(self._escanear(TEMPORAL)):
+            if modificado < limite_temporales:
+                if self._borrar(ruta):
+                    self.temporales_borrados += 1
+            else:
+                ocupado += tamano
+        entradas = list(self._entradas())
+        ocupado += sum(tamano for _, tamano, _ in entradas)
+        self._sin_medir = 0
+        return entradas, ocupado
+
+    def _desalojar(self):
+        """Borra los menos usados hasta quedar en el 90% del límite, medido en disco"""
+        entradas, ocupado = self._medir()
+        entradas.sort(key=lambda entrada: entrada[2])
+        objetivo = self.limite_bytes * 9 // 10
+        for ruta, tamano, _ in entradas:
+            if ocupado <= objetivo:
+                break
+            if self._borrar(ruta):
+                self.desalojos += 1
+            ocupado -= tamano
+        self._ocupado = ocupado
+
+    @staticmethod
+    def _borrar(ruta):
+        try:
+            os.remove(ruta)
+            return True
+        except OSError:
+            # Otro proceso ya lo borró
+            return False
+
+    def limpiar(self):
+        """Borra todos los resultados guardados y los temporales viejos, y reinicia los contadores"""
+        for ruta, _, _ in list(self._entradas()):
+            self._borrar(ruta)
+        self._ocupado = self._medir()[1]
+        self.aciertos = 0
+        self.fallos = 0
+        self.escrituras = 0
+        self.desalojos = 0
+        self.temporales_borrados = 0
+
+    @property
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def estadisticas(self):
+        return {
+            'carpeta': self.carpeta,
+            'limite_bytes': self.limite_bytes,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'escrituras': self.escrituras,
+            'desalojos': self.desalojos,
+            'temporales_borrados': self.temporales_borrados,
+            'tasa_aciertos': self.tasa_aciertos,
+        }
+
+
+def analizar_contenido(contenido, lexico, sintactico, semantico, cache=None, perfil=None):
+    """
+    Corre las tres etapas sobre el contenido y devuelve un ResultadoAnalisis.
+    Con caché, un contenido ya visto sale del disco y uno nuevo se guarda.
+    Con un Perfil (ver perfil.py) se miden las etapas y sus pasadas.
+    """
+    if cache is not None:
+        with medir(perfil, "cache"):
+            resultado = cache.obtener(contenido)
+        if resultado is not None:
+            if perfil is not None:
+                perfil.contar("cache.aciertos")
+                perfil.contar_resultado(contenido, resultado)
+            return resultado
+
+    sintactico.perfil = semantico.perfil = perfil
+    with medir(perfil, "lexico"):
+        indice, lexicos = lexico.analizar_por_lineas(contenido)
+    with medir(perfil, "sintactico"):
+        sintacticos = sintactico.analizar(indice)
+    with medir(perfil, "semantico"):
+        semanticos, tabla_simbolos = semantico.analizar(indice)
+    resultado = ResultadoAnalisis(indice, lexicos, sintacticos, semanticos, tabla_simbolos, semantico.funciones)
+
+    if cache is not None:
+        with medir(perfil, "cache"):
+            cache.guardar(contenido, resultado)
+    if perfil is not None:
+        perfil.contar_resultado(contenido, resultado)
+    return resultado
@@ -0,0 +1,314 @@
+"""
+Generador de programas PSeInt sintéticos para medir el analizador.
+
+Arma programas del tamaño que se pida, con funciones, estructuras anidadas
+hasta una profundidad máxima y un conjunto configurable de identificadores
+distintos. Con errores=0 el programa es válido para las tres etapas (no
+produce ningún error); con errores > 0 esa proporción de las sentencias se
+reemplaza por una variante rota (token desconocido, paréntesis sin cerrar,
+variable sin declarar, tipos incompatibles, cierre suelto...). La misma
+semilla da siempre el mismo programa.
+
+Las líneas se generan de a una, así que se puede escribir un archivo de
+millones de líneas sin tenerlo entero en memoria.
+
+Uso:
+    python corpus_sintetico.py --lineas 100000 [--profundidad 4] [--funciones 20]
+                               [--identificadores 200] [--errores 0.05] [--semilla 1]
+                               [--salida RUTA]
+"""
+import argparse
+import random
+import sys
+
+# Partes de los nombres de variables. Sin 'O' ni 'Y' mayúsculas: el léxico
+# las toma como operadores y cortaría el identificador.
+_RAICES = ("total", "suma", "contador", "indice", "valor", "nota", "precio",
+           "cantidad", "promedio", "resultado", "saldo", "edad", "monto", "puntaje")
+_SUFIJOS = ("", "Parcial", "Actual", "Final", "Maximo", "Minimo", "Nuevo", "Anterior",
+            "Temporal", "General", "Base", "Medio")
+
+# Tipo de cada identificador generado, en rotación (la mitad de las
+# sentencias usan enteros, así que hay más)
+_TIPOS = ("Entero", "Entero", "Real", "Caracter", "Logico")
+_TIPOS_DISTINTOS = ("Entero", "Real", "Caracter", "Logico")
+
+# Variantes rotas de una sentencia (ver GeneradorPseint._sentencia_rota)
+ERRORES = ("desconocido", "parentesis", "no_declarada", "tipo", "reservada", "cierre_suelto")
+
+# Líneas que se juntan antes de cada write
+_LINEAS_POR_BLOQUE = 4096
+
+
+class _Ambito:
+    """Variables visibles en el cuerpo que se está generando, por tipo"""
+    def __init__(self, nombres, tipos, contadores):
+        self.por_tipo = {tipo: [] for tipo in _TIPOS_DISTINTOS}
+        for nombre, tipo in zip(nombres, tipos):
+            self.por_tipo[tipo].append(nombre)
+        # Una variable de Para por nivel de anidamiento
+        self.contadores = contadores
+
+
+class GeneradorPseint:
+    def __init__(self, lineas=1000, profundidad=4, funciones=10, identificadores=50, errores=0.0, semilla=0):
+        if lineas < 1:
+            raise ValueError(f"La cantidad de líneas debe ser positiva: {lineas}")
+        if not 0.0 <= errores <= 1.0:
+            raise ValueError(f"La proporción de errores debe estar entre 0 y 1: {errores}")
+        self.total_lineas = lineas
+        self.profundidad = max(1, profundidad)
+        self.funciones = max(0, funciones)
+        self.identificadores = max(len(_TIPOS), identificadores)
+        self.errores = errores
+        self.semilla = semilla
+
+    def parametros(self):
+        """Parámetros de generación (para guardarlos junto a los resultados)"""
+        return {
+            "lineas": self.total_lineas,
+            "profundidad": self.profundidad,
+            "funciones": self.funciones,
+            "identificadores": self.identificadores,
+            "errores": self.errores,
+            "semilla": self.semilla,
+        }
+
+    def generar(self):
+        """Devuelve el programa completo como un solo texto"""
+        return '\n'.join(self.lineas())
+
+    def escribir(self, salida):
+        """Escribe el programa en 'salida' de a bloques de líneas"""
+        bloque = []
+        for linea in self.lineas():
+            bloque.append(linea)
+            if len(bloque) == _LINEAS_POR_BLOQUE:
+                bloque.append('')
+                salida.write('\n'.join(bloque))
+                bloque.clear()
+        salida.write('\n'.join(bloque))
+
+    def lineas(self):
+        """Genera las líneas del programa, sin el salto de línea final"""
+        self._azar = random.Random(self.semilla)
+        self._emitidas = 0
+        # Cada variable lleva su inicialización: con pocas líneas se usan menos
+        identificadores = max(len(_TIPOS), min(self.identificadores, (self.total_lineas - 10 - self.profundidad) // 2))
+        nombres = [self._nombre(n) for n in range(identificadores)]
+        tipos = [_TIPOS[n % len(_TIPOS)] for n in range(identificadores)]
+        contadores = [f"i{nivel}" for nivel in range(1, self.profundidad + 1)]
+
+        # Líneas fijas de cada función y del programa principal (encabezado,
+        # declaraciones, una inicialización por variable y el cierre); el
+        # resto se reparte por mitades entre los cuerpos de las funciones y
+        # el del programa principal
+        fijas_funcion = 9 + self.profundidad
+        fijas_principal = 2 + len(_TIPOS_DISTINTOS) + 1 + identificadores + self.profundidad
+        disponibles = self.total_lineas - fijas_principal
+        funciones = min(self.funciones, max(0, disponibles // (2 * (fijas_funcion + 3))))
+        cuerpo_funcion = 0
+        if funciones:
+            cuerpo_funcion = max(3, disponibles // 2 // funciones - fijas_funcion)
+        firmas = []
+
+        for numero in range(funciones):
+            nombre = f"Calcular{numero}"
+            firmas.append(nombre)
+            yield from self._funcion(nombre, cuerpo_funcion, contadores)
+
+        # --- Programa principal ---
+        yield from self._emitir("Algoritmo Principal")
+        for tipo in _TIPOS_DISTINTOS:
+            declaradas = [nombre for nombre, tipo_nombre in zip(nombres, tipos) if tipo_nombre == tipo]
+            if tipo == "Entero":
+                declaradas += contadores
+            yield from self._emitir(f"    Definir {', '.join(declaradas)} Como {tipo}")
+        yield from self._emitir("    // Inicialización")
+        ambito = _Ambito(nombres, tipos, contadores)
+        for nombre, tipo in zip(nombres, tipos):
+            yield from self._emitir(f"    {nombre} <- {self._literal(tipo)}")
+        for contador in contadores:
+            yield from self._emitir(f"    {contador} <- 0")
+
+        restantes = self.total_lineas - self._emitidas - 1
+        yield from self._cuerpo(ambito, restantes, firmas)
+        yield from self._emitir("FinAlgoritmo")
+
+    # ------------------------------------------------------------
+    # PARTES DEL PROGRAMA
+    # ------------------------------------------------------------
+
+    def _emitir(self, linea):
+        self._emitidas += 1
+        yield linea
+
+    def _nombre(self, numero):
+        raiz = _RAICES[numero % len(_RAICES)]
+        sufijo = _SUFIJOS[(numero // len(_RAICES)) % len(_SUFIJOS)]
+        vuelta = numero // (len(_RAICES) * len(_SUFIJOS))
+        return f"{raiz}{sufijo}{vuelta}" if vuelta else f"{raiz}{sufijo}"
+
+    def _funcion(self, nombre, cuerpo, contadores):
+        locales = ["a", "b", "parcial", "etiqueta", "listo"]
+        tipos = ["Entero", "Entero", "Real", "Caracter", "Logico"]
+        yield from self._emitir(f"Funcion {nombre}(a, b)")
+        yield from self._emitir(f"    Definir a, b, {', '.join(contadores)} Como Entero")
+        yield from self._emitir("    Definir parcial Como Real")
+        yield from self._emitir("    Definir etiqueta Como Caracter")
+        yield from self._emitir("    Definir listo Como Logico")
+        yield from self._emitir("    parcial <- a + 0.5")
+        yield from self._emitir('    etiqueta <- "inicio"')
+        yield from self._emitir("    listo <- Falso")
+        for contador in contadores:
+            yield from self._emitir(f"    {contador} <- 0")
+        yield from self._cuerpo(_Ambito(locales, tipos, contadores), cuerpo, ())
+        yield from self._emitir("FinFuncion")
+
+    def _cuerpo(self, ambito, limite, firmas):
+        """
+        Sentencias y estructuras anidadas hasta ocupar exactamente 'limite'
+        líneas (si alcanza para abrir y cerrar lo necesario).
+        """
+        azar = self._azar
+        abiertos = []  # [cierre, admite_sino] de cada estructura abierta
+        emitidas = 0
+        while emitidas + len(abiertos) < limite:
+            nivel = len(abiertos)
+            sangria = "    " * (nivel + 1)
+            sorteo = azar.random()
+            libres = limite - emitidas - nivel
+
+            if nivel < self.profundidad and sorteo < 0.18 and libres >= 4:
+                apertura, cierre = self._estructura(ambito, nivel)
+                for linea in apertura:
+                    yield from self._emitir(sangria + linea)
+                emitidas += len(apertura)
+                abiertos.append([cierre, cierre == "FinSi"])
+            elif abiertos and sorteo < 0.30:
+                cierre, admite_sino = abiertos[-1]
+                sangria = "    " * nivel
+                if admite_sino and sorteo < 0.22 and libres >= 3:
+                    abiertos[-1][1] = False
+                    yield from self._emitir(sangria + "SiNo")
+                else:
+                    abiertos.pop()
+                    yield from self._emitir(sangria + cierre)
+                emitidas += 1
+            elif self.errores and azar.random() < self.errores:
+                cierre_actual = abiertos[-1][0] if abiertos else None
+                yield from self._emitir(sangria + self._sentencia_rota(ambito, cierre_actual))
+                emitidas += 1
+            else:
+                yield from self._emitir(sangria + self._sentencia(ambito, firmas))
+                emitidas += 1
+
+        while abiertos:
+            yield from self._emitir("    " * len(abiertos) + abiertos.pop()[0])
+
+    def _variable(self, ambito, tipo):
+        return self._azar.choice(ambito.por_tipo[tipo])
+
+    def _literal(self, tipo):
+        azar = self._azar
+        if tipo == "Entero":
+            return str(azar.randrange(100))
+        if tipo == "Real":
+            return f"{azar.randrange(100)}.{azar.randrange(10)}"
+        if tipo == "Caracter":
+            return f'"texto {azar.randrange(1000)}"'
+        return azar.choice(("Verdadero", "Falso"))
+
+    def _condicion(self, ambito):
+        azar = self._azar
+        forma = azar.randrange(3)
+        if forma == 0:
+            return f"{self._variable(ambito, 'Entero')} > {azar.randrange(100)}"
+        if forma == 1:
+            return self._variable(ambito, "Logico")
+        return f"{self._variable(ambito, 'Entero')} <= {self._variable(ambito, 'Entero')} Y {self._variable(ambito, 'Real')} <> 0"
+
+    def _estructura(self, ambito, nivel):
+        """
+        Líneas de apertura de una estructura y su cierre. No se genera
+        Repetir: 'Que' no es palabra del léxico y 'Hasta Que' daría error.
+        """
+        forma = self._azar.randrange(4)
+        if forma == 0:
+            return [f"Si {self._condicion(ambito)} Entonces"], "FinSi"
+        if forma == 1:
+            return [f"Mientras {self._condicion(ambito)} Hacer"], "FinMientras"
+        if forma == 2:
+            return [f"Para {ambito.contadores[nivel]} <- 1 Hasta {self._azar.randrange(2, 50)} Hacer"], "FinPara"
+        return [f"Segun {self._variable(ambito, 'Entero')} Hacer", f"    {self._azar.randrange(10)}:"], "FinSegun"
+
+    def _sentencia(self, ambito, firmas):
+        azar = self._azar
+        forma = azar.randrange(9)
+        if forma <= 1:
+            destino = self._variable(ambito, "Entero")
+            operador = azar.choice(("+", "-", "*"))
+            return f"{destino} <- {self._variable(ambito, 'Entero')} {operador} {azar.randrange(1, 100)}"
+        if forma == 2:
+            return f"{self._variable(ambito, 'Real')} <- {self._variable(ambito, 'Real')} / {self._literal('Real')}"
+        if forma == 3:
+            return f"{self._variable(ambito, 'Caracter')} <- {self._literal('Caracter')}"
+        if forma == 4:
+            return f"{self._variable(ambito, 'Logico')} <- {self._variable(ambito, 'Entero')} >= {azar.randrange(100)}"
+        if forma == 5:
+            return f'Escribir "valor: ", {self._variable(ambito, "Entero")}'
+        if forma == 6:
+            return f"Leer {self._variable(ambito, 'Entero')}"
+        if forma == 7 and firmas:
+            # Dentro de Escribir: el semántico toma el nombre de una función
+            # asignada como una variable sin declarar
+            argumentos = f"{self._variable(ambito, 'Entero')}, {self._variable(ambito, 'Entero')}"
+            return f"Escribir {azar.choice(firmas)}({argumentos})"
+        return f"// comentario {azar.randrange(1000)}"
+
+    def _sentencia_rota(self, ambito, cierre_actual):
+        azar = self._azar
+        tipo = azar.choice(ERRORES)
+        entero = self._variable(ambito, "Entero")
+        if tipo == "desconocido":
+            return f"{entero} <- {entero} {azar.choice('@$?¿')} {azar.randrange(100)}"
+        if tipo == "parentesis":
+            return f"{entero} <- ({entero} + {azar.randrange(100)}"
+        if tipo == "no_declarada":
+            return f"{entero} <- sinDeclarar{azar.randrange(1000)} + 1"
+        if tipo == "tipo":
+            # Las cadenas no cuentan para el tipo de la expresión; un lógico sí
+            return f"{entero} <- {self._variable(ambito, 'Logico')}"
+        if tipo == "reservada":
+            return f"Definir {azar.choice(('Mientras', 'Hacer', 'Escribir'))} Como Entero"
+        # Un cierre que no corresponde a la estructura abierta: el sintáctico
+        # informa el error sin sacarla de la pila
+        return azar.choice([cierre for cierre in ("FinSi", "FinMientras", "FinPara") if cierre != cierre_actual])
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Genera un programa PSeInt sintético")
+    parser.add_argument("--lineas", type=int, default=1000)
+    parser.add_argument("--profundidad", type=int, default=4, help="Anidamiento máximo de estructuras")
+    parser.add_argument("--funciones", type=int, default=10)
+    parser.add_argument("--identificadores", type=int, default=50, help="Variables distintas del programa principal")
+    parser.add_argument("--errores", type=float, default=0.0, help="Proporción de sentencias rotas (0 a 1)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", "-o", help="Archivo de salida (por defecto, la salida estándar)")
+    args = parser.parse_args(argumentos)
+
+    try:
+        generador = GeneradorPseint(args.lineas, args.profundidad, args.funciones,
+                                    args.identificadores, args.errores, args.semilla)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as salida:
+            generador.escribir(salida)
+    else:
+        generador.escribir(sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Catálogo de diagnósticos con código estable.
+
+Cada error que informan las fases tiene un código fijo (LEX001, SIN005,
+SEM006...) con su fase, su severidad y una plantilla cuyos parámetros van
+por nombre. Un Diagnostico es el mismo texto de siempre ("Línea n: ...")
+para quien lo trata como str, y además lleva el código, la línea, la
+columna y los parámetros para quien necesita leerlo sin interpretar el
+mensaje. Los códigos no se reutilizan: si un mensaje cambia de sentido
+se le da un código nuevo.
+"""
+
+FASE_LEXICA = "lexico"
+FASE_SINTACTICA = "sintactico"
+FASE_SEMANTICA = "semantico"
+
+SEVERIDAD_ERROR = "error"
+SEVERIDAD_ADVERTENCIA = "advertencia"
+
+# código -> (fase, severidad, plantilla)
+CATALOGO = {
+    "LEX001": (FASE_LEXICA, SEVERIDAD_ERROR, "Token no reconocido '{texto}'"),
+
+    "SIN001": (FASE_SINTACTICA, SEVERIDAD_ERROR, "'{simbolo}' sin apertura previa"),
+    "SIN002": (FASE_SINTACTICA, SEVERIDAD_ERROR, "cierre de cadena sin apertura previa"),
+    "SIN003": (FASE_SINTACTICA, SEVERIDAD_ERROR, "'{texto}' es palabra reservada, no puede usarse como identificador"),
+    "SIN004": (FASE_SINTACTICA, SEVERIDAD_ERROR, "'{palabra}' sin estructura de apertura"),
+    "SIN005": (FASE_SINTACTICA, SEVERIDAD_ERROR, "'{palabra}' no corresponde con '{apertura}' de línea {linea_apertura}"),
+    "SIN006": (FASE_SINTACTICA, SEVERIDAD_ERROR, "'Hasta' sin estructura 'Repetir' o 'Para' correspondiente"),
+    "SIN007": (FASE_SINTACTICA, SEVERIDAD_ERROR, "estructura 'Para' incompleta, falta asignación (<-)"),
+    "SIN008": (FASE_SINTACTICA, SEVERIDAD_ERROR, "estructura 'Para' incompleta, falta 'Hasta'"),
+    "SIN009": (FASE_SINTACTICA, SEVERIDAD_ERROR, "estructura 'Para' incompleta, falta 'Hacer'"),
+    "SIN010": (FASE_SINTACTICA, SEVERIDAD_ERROR, "definición incompleta"),
+    "SIN011": (FASE_SINTACTICA, SEVERIDAD_ERROR, "'{nombre}' es palabra reservada, no puede usarse como nombre de variable"),
+    "SIN012": (FASE_SINTACTICA, SEVERIDAD_ERROR, "no se especificaron variables en definición"),
+    "SIN013": (FASE_SINTACTICA, SEVERIDAD_ERROR, "se esperaba 'Como' en definición"),
+    "SIN014": (FASE_SINTACTICA, SEVERIDAD_ERROR, "se esperaba tipo después de 'Como'"),
+    "SIN015": (FASE_SINTACTICA, SEVERIDAD_ERROR, "tipo no válido '{tipo}'"),
+    "SIN016": (FASE_SINTACTICA, SEVERIDAD_ERROR, "paréntesis '(' sin cerrar"),
+    "SIN017": (FASE_SINTACTICA, SEVERIDAD_ERROR, "corchete '[' sin cerrar"),
+    "SIN018": (FASE_SINTACTICA, SEVERIDAD_ERROR, "cadena sin cerrar"),
+    "SIN019": (FASE_SINTACTICA, SEVERIDAD_ERROR, "estructura '{palabra}' sin cerrar"),
+
+    "SEM001": (FASE_SEMANTICA, SEVERIDAD_ERROR, "variable '{nombre}' ya declarada anteriormente"),
+    "SEM002": (FASE_SEMANTICA, SEVERIDAD_ERROR, "tipo no válido '{tipo}'"),
+    "SEM003": (FASE_SEMANTICA, SEVERIDAD_ERROR, "declaración incompleta, falta 'Como [tipo]'"),
+    "SEM004": (FASE_SEMANTICA, SEVERIDAD_ERROR, "falta nombre de la función"),
+    "SEM005": (FASE_SEMANTICA, SEVERIDAD_ERROR, "función '{nombre}' ya declarada anteriormente"),
+    "SEM006": (FASE_SEMANTICA, SEVERIDAD_ERROR, "variable '{nombre}' no declarada"),
+    "SEM007": (FASE_SEMANTICA, SEVERIDAD_ERROR, "incompatibilidad en asignación '{nombre}': {tipo_declarado} <- {tipo_expresion}"),
+    "SEM008": (FASE_SEMANTICA, SEVERIDAD_ERROR, "'Retornar' fuera de una función"),
+    "SEM009": (FASE_SEMANTICA, SEVERIDAD_ERROR, "tipo de retorno incompatible en función '{funcion}' ({tipo_expresion} ≠ {tipo_declarado})"),
+    "SEM010": (FASE_SEMANTICA, SEVERIDAD_ERROR, "función '{nombre}' no declarada"),
+    "SEM011": (FASE_SEMANTICA, SEVERIDAD_ERROR, "variable '{nombre}' usada sin declarar"),
+    "SEM012": (FASE_SEMANTICA, SEVERIDAD_ADVERTENCIA, "variable '{nombre}' declarada pero no usada"),
+}
+
+
+class Diagnostico(str):
+    """
+    Mensaje de error con código. Se compara, se ordena y se muestra igual
+    que el str del mensaje, así que reemplaza a los f-strings sin cambiar
+    reportes ni deduplicación. La columna (desde 1) es None cuando la fase
+    no la conoce.
+    """
+    def __new__(cls, codigo, linea, parametros, columna=None):
+        plantilla = CATALOGO[codigo][2]
+        diagnostico = super().__new__(cls, f"Línea {linea}: " + plantilla.format(**parametros))
+        diagnostico.codigo = codigo
+        diagnostico.linea = linea
+        diagnostico.columna = columna
+        diagnostico.parametros = parametros
+        return diagnostico
+
+    def __reduce__(self):
+        # Para pickle (trabajadores de lote y del léxico en paralelo)
+        return (Diagnostico, (self.codigo, self.linea, self.parametros, self.columna))
+
+    @property
+    def fase(self):
+        return CATALOGO[self.codigo][0]
+
+    @property
+    def severidad(self):
+        return CATALOGO[self.codigo][1]
+
+    @property
+    def descripcion(self):
+        """El mensaje sin el prefijo 'Línea n: ', para quien ya muestra la línea"""
+        return CATALOGO[self.codigo][2].format(**self.parametros)
+
+    def como_tupla(self):
+        """Forma serializable con marshal (ver cache_resultados)"""
+        return (self.codigo, self.linea, self.parametros, self.columna)
+
+    def como_evento(self):
+        """Diccionario con el esquema de evento 'diagnostico' (ver eventos_jsonl)"""
+        return {
+            "evento": "diagnostico",
+            "codigo": self.codigo,
+            "fase": self.fase,
+            "severidad": self.severidad,
+            "linea": self.linea,
+            "columna": self.columna,
+            "parametros": self.parametros,
+            "mensaje": str(self),
+        }
+
+
+def diagnostico(codigo, linea, columna=None, **parametros):
+    """Crea el Diagnostico 'codigo' de la línea con los parámetros de su plantilla"""
+    return Diagnostico(codigo, linea, parametros, columna)
+
+
+def desde_tupla(tupla):
+    """Inverso de Diagnostico.como_tupla; los mensajes sueltos (str) quedan igual"""
+    if isinstance(tupla, str):
+        return tupla
+    return Diagnostico(*tupla)
+
+
+def a_tupla(error):
+    """Diagnostico -> tupla para marshal; un str que no es Diagnostico queda igual"""
+    if isinstance(error, Diagnostico):
+        return error.como_tupla()
+    return str(error)
@@ -0,0 +1,160 @@
+"""
+Eventos del análisis en formato JSON Lines, para otras herramientas.
+
+Cada línea de la salida es un objeto JSON (UTF-8) con la clave "evento".
+Esquema, versión 1:
+
+  inicio       {"evento": "inicio", "esquema": 1, "archivo": str | null}
+  token        {"evento": "token", "linea": int, "columna": int,
+                "texto": str, "tipo": str}
+  diagnostico  {"evento": "diagnostico", "codigo": str,
+                "fase": "lexico" | "sintactico" | "semantico",
+                "severidad": "error" | "advertencia",
+                "linea": int, "columna": int | null,
+                "parametros": {nombre: valor}, "mensaje": str}
+  fase         {"evento": "fase", "fase": str, "diagnosticos": int}
+  fin          {"evento": "fin", "tokens": int, "diagnosticos": int}
+
+Las líneas y columnas empiezan en 1 y la columna cuenta caracteres. Las
+fases sintáctica y semántica no conocen la columna y la dejan en null.
+"codigo" es estable; la lista de códigos, con la fase, la severidad y los
+nombres de sus parámetros, está en diagnosticos.CATALOGO. "mensaje" es el
+mismo texto de los reportes, pensado para personas: no hace falta
+interpretarlo. "tipo" es el nombre de la clase del token, el mismo de los
+reportes ("Identificador", "Palabra Reservada", ...). Un evento "fase"
+cierra cada fase y "fin" cierra el flujo; un consumidor debe ignorar
+claves y eventos que no conozca.
+
+Los eventos léxicos salen a medida que se recorre el archivo, línea por
+línea (los tokens de la línea y después sus diagnósticos). La salida se
+vacía cada EVENTOS_POR_BLOQUE eventos y al cerrar cada fase, así que el
+flujo se puede ir procesando mientras el análisis sigue.
+
+Uso:
+    python eventos_jsonl.py ARCHIVO [--sin-tokens] [--salida RUTA]
+"""
+import argparse
+import json
+import sys
+from array import array
+
+from analizador import AnalizadorLexico
+from diagnosticos import FASE_LEXICA, FASE_SEMANTICA, FASE_SINTACTICA
+from semantico import AnalizadorSemantico
+from sintactico import AnalizadorSintactico
+from tokens_pseint import NOMBRES_CLASE, IndiceLineas, PoolSimbolos
+
+VERSION_ESQUEMA = 1
+
+# Eventos que se juntan antes de cada write + flush
+EVENTOS_POR_BLOQUE = 1024
+
+
+class EscritorEventos:
+    """Escribe eventos de a bloques y vacía la salida después de cada uno"""
+    def __init__(self, salida, eventos_por_bloque=EVENTOS_POR_BLOQUE):
+        self.salida = salida
+        self.eventos_por_bloque = eventos_por_bloque
+        self.codificar = json.JSONEncoder(ensure_ascii=False).encode
+        self._bloque = []
+
+    def escribir(self, evento):
+        self.agregar_linea(self.codificar(evento))
+
+    def agregar_linea(self, linea):
+        """Agrega una línea JSON ya codificada"""
+        self._bloque.append(linea)
+        if len(self._bloque) >= self.eventos_por_bloque:
+            self.vaciar()
+
+    def vaciar(self):
+        if self._bloque:
+            self._bloque.append('')
+            self.salida.write('\n'.join(self._bloque))
+            self._bloque.clear()
+        self.salida.flush()
+
+
+def escribir_eventos(salida, contenido, archivo=None, con_tokens=True, eventos_por_bloque=EVENTOS_POR_BLOQUE):
+    """
+    Analiza el contenido y escribe sus eventos en 'salida' a medida que se
+    producen. Devuelve la cantidad de diagnósticos de cada fase.
+    """
+    escritor = EscritorEventos(salida, eventos_por_bloque)
+    codificar = escritor.codificar
+    escritor.escribir({"evento": "inicio", "esquema": VERSION_ESQUEMA, "archivo": archivo})
+
+    # --- Fase léxica: se emite línea por línea mientras se arma el índice ---
+    tokens = []
+    numeros = array('I')
+    inicios = array('I')
+    # Los textos y tipos se repiten mucho: cada uno se codifica una sola vez
+    codificados = {}
+    tipos = [codificar(nombre) for nombre in NOMBRES_CLASE]
+    diagnosticos = {FASE_LEXICA: 0, FASE_SINTACTICA: 0, FASE_SEMANTICA: 0}
+
+    lineas = contenido.split('\n')
+    simbolos = PoolSimbolos()
+    analizador = AnalizadorLexico()
+    for num_linea, tokens_linea, columnas, errores in analizador.analizar_con_columnas(lineas, simbolos=simbolos):
+        if tokens_linea:
+            numeros.append(num_linea)
+            inicios.append(len(tokens))
+            tokens.extend(tokens_linea)
+            if con_tokens:
+                for tok, columna in zip(tokens_linea, columnas):
+                    texto = codificados.get(tok.texto)
+                    if texto is None:
+                        texto = codificados[tok.texto] = codificar(tok.texto)
+                    escritor.agregar_linea(f'{{"evento": "token", "linea": {num_linea}, "columna": {columna}, '
+                                           f'"texto": {texto}, "tipo": {tipos[tok.clase]}}}')
+        for error in errores:
+            escritor.escribir(error.como_evento())
+        diagnosticos[FASE_LEXICA] += len(errores)
+    inicios.append(len(tokens))
+    _cerrar_fase(escritor, FASE_LEXICA, diagnosticos)
+
+    # --- Fases sintáctica y semántica sobre el índice ya armado ---
+    indice = IndiceLineas(tokens, numeros, inicios, simbolos=simbolos)
+    for error in AnalizadorSintactico().analizar(indice):
+        escritor.escribir(error.como_evento())
+        diagnosticos[FASE_SINTACTICA] += 1
+    _cerrar_fase(escritor, FASE_SINTACTICA, diagnosticos)
+
+    errores, _ = AnalizadorSemantico().analizar(indice)
+    for error in errores:
+        escritor.escribir(error.como_evento())
+    diagnosticos[FASE_SEMANTICA] = len(errores)
+    _cerrar_fase(escritor, FASE_SEMANTICA, diagnosticos)
+
+    escritor.escribir({"evento": "fin", "tokens": len(tokens), "diagnosticos": sum(diagnosticos.values())})
+    escritor.vaciar()
+    return diagnosticos
+
+
+def _cerrar_fase(escritor, fase, diagnosticos):
+    escritor.escribir({"evento": "fase", "fase": fase, "diagnosticos": diagnosticos[fase]})
+    escritor.vaciar()
+
+
+def main(argumentos=None):
+    from main import leer_texto
+
+    parser = argparse.ArgumentParser(description="Escribe los tokens y diagnósticos de un archivo PSeInt en JSON Lines")
+    parser.add_argument("archivo")
+    parser.add_argument("--sin-tokens", action="store_true", help="Emitir solo los diagnósticos")
+    parser.add_argument("--salida", "-o", help="Archivo de salida (por defecto, la salida estándar)")
+    args = parser.parse_args(argumentos)
+
+    contenido = leer_texto(args.archivo)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as salida:
+            diagnosticos = escribir_eventos(salida, contenido, args.archivo, not args.sin_tokens)
+    else:
+        diagnosticos = escribir_eventos(sys.stdout, contenido, args.archivo, not args.sin_tokens)
+    # Como lote.py: 1 si hubo algún diagnóstico
+    return 1 if any(diagnosticos.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Análisis léxico de un solo archivo grande repartido entre varios procesos.
+
+El analizador léxico no arrastra estado de una línea a la siguiente (una
+cadena sin cerrar termina con la línea), así que el texto se puede cortar
+en bloques de líneas completas. Cada proceso analiza sus bloques con la
+numeración global de líneas y devuelve columnas compactas (textos, clases,
+palabras, líneas e ids de símbolo) en lugar de objetos Token, que son
+lentos de serializar; este proceso arma los tokens y el IndiceLineas en
+orden. Cada bloque trae su propio PoolSimbolos y sus ids se traducen a los
+del pool del documento con una consulta por nombre distinto, no por token.
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from analizador import MOTOR_UNA_PASADA, AnalizadorLexico
+from tokens_pseint import IndiceLineas, PoolSimbolos, Token
+
+# Por debajo de este tamaño (en caracteres) crear los procesos cuesta más de lo que se gana
+UMBRAL_PARALELO = 4 * 1024 * 1024
+
+# Límites del tamaño automático de bloque
+BLOQUE_MINIMO = 1024 * 1024
+BLOQUE_MAXIMO = 16 * 1024 * 1024
+
+# Analizador de cada proceso, creado una vez en el inicializador
+_analizador = None
+
+
+def _iniciar_trabajador(motor):
+    global _analizador
+    _analizador = AnalizadorLexico(motor=motor)
+
+
+def _analizar_bloque(bloque):
+    """Analiza un bloque de líneas y devuelve sus columnas, su pool de símbolos y sus errores"""
+    primera, texto = bloque
+    textos = []
+    clases = array('B')
+    palabras = array('H')
+    lineas = array('I')
+    simbolos = array('I')
+    pool = PoolSimbolos()
+    errores = []
+    for num_linea, tokens, errores_linea in _analizador._analizar_lineas(texto.split('\n'), primera, pool):
+        for tok in tokens:
+            textos.append(tok.texto)
+            clases.append(tok.clase)
+            palabras.append(tok.palabra)
+            simbolos.append(tok.simbolo)
+        lineas.extend([num_linea] * len(tokens))
+        errores.extend(errores_linea)
+    return textos, clases, palabras, lineas, simbolos, pool, errores
+
+
+def tamano_bloque_automatico(largo, trabajadores):
+    """Unos cuatro bloques por proceso para repartir bien la carga, dentro de los límites"""
+    return max(BLOQUE_MINIMO, min(BLOQUE_MAXIMO, largo // (trabajadores * 4)))
+
+
+def cortar_en_bloques(contenido, tamano):
+    """
+    Genera (primera_linea, texto) con bloques de alrededor de 'tamano'
+    caracteres, cortados siempre en un salto de línea.
+    """
+    inicio = 0
+    primera = 1
+    largo = len(contenido)
+    while inicio < largo:
+        corte = contenido.find('\n', inicio + tamano)
+        if corte == -1:
+            corte = largo
+        yield primera, contenido[inicio:corte]
+        primera += contenido.count('\n', inicio, corte) + 1
+        inicio = corte + 1
+
+
+def analizar_en_paralelo(contenido, trabajadores=None, tamano_bloque=None, motor=MOTOR_UNA_PASADA):
+    """
+    Mismo resultado que AnalizadorLexico.analizar_por_lineas: (IndiceLineas,
+    errores). Los archivos chicos o un solo trabajador se analizan en este
+    proceso.
+    """
+    trabajadores = trabajadores or os.cpu_count() or 1
+    if trabajadores == 1 or (tamano_bloque is None and len(contenido) < UMBRAL_PARALELO):
+        return AnalizadorLexico(motor=motor).analizar_por_lineas(contenido)
+
+    tamano = tamano_bloque or tamano_bloque_automatico(len(contenido), trabajadores)
+    tokens = []
+    errores = []
+    numeros = array('I')
+    inicios = array('I')
+    pool = PoolSimbolos()
+    textos_pool = pool.textos
+    with ProcessPoolExecutor(max_workers=trabajadores, initializer=_iniciar_trabajador,
+                             initargs=(motor,)) as grupo:
+        for textos, clases, palabras, lineas, simbolos, pool_bloque, errores_bloque in grupo.map(
+                _analizar_bloque, cortar_en_bloques(contenido, tamano)):
+            _agregar_lineas(tokens, numeros, inicios, lineas)
+            traduccion = pool.fusionar(pool_bloque)
+            simbolos = [traduccion[simbolo] for simbolo in simbolos]
+            # Las palabras toman el texto del pool del documento, compartido entre bloques
+            textos = [textos_pool[simbolo] if simbolo else texto for texto, simbolo in zip(textos, simbolos)]
+            tokens.extend(map(Token, textos, clases, lineas, palabras, simbolos))
+            errores.extend(errores_bloque)
+    inicios.append(len(tokens))
+    return IndiceLineas(tokens, numeros, inicios, simbolos=pool), errores
+
+
+def _agregar_lineas(tokens, numeros, inicios, lineas):
+    """Agrega al índice el número y la posición de inicio de cada línea del bloque"""
+    base = len(tokens)
+    anterior = None
+    for posicion, num_linea in enumerate(lineas, base):
+        if num_linea != anterior:
+            anterior = num_linea
+            numeros.append(num_linea)
+            inicios.append(posicion)
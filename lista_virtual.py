@@ -0,0 +1,120 @@
+"""
+Lista virtual sobre ttk.Treeview.
+
+El Treeview solo tiene tantos ítems como filas entran en pantalla; al
+desplazarse se cambian sus valores con las filas de la vista (VistaFilas)
+que quedan visibles. Así mostrar cientos de miles de tokens cuesta lo
+mismo que mostrar veinte.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+
+class ListaVirtual(tk.Frame):
+    def __init__(self, padre, columnas, anchos, filas_visibles=8, al_elegir=None, **opciones):
+        super().__init__(padre, **opciones)
+        # al_elegir(fila) se llama con los valores de la fila al hacer doble clic
+        self.al_elegir = al_elegir
+        self.vista = None
+        self.primera = 0
+        self.filas_visibles = filas_visibles
+
+        self.arbol = ttk.Treeview(self, columns=columnas, show="headings", height=filas_visibles, selectmode="browse")
+        for posicion, (columna, ancho) in enumerate(zip(columnas, anchos)):
+            self.arbol.heading(columna, text=columna, command=lambda posicion=posicion: self._ordenar(posicion))
+            self.arbol.column(columna, width=ancho, stretch=posicion == len(columnas) - 1)
+
+        self.barra = tk.Scrollbar(self, orient="vertical", command=self._desplazar)
+        self.barra.pack(side="right", fill="y")
+        self.arbol.pack(fill="both", expand=True)
+
+        self.arbol.bind("<MouseWheel>", lambda evento: self._mover(-1 if evento.delta > 0 else 1, "units"))
+        self.arbol.bind("<Button-4>", lambda evento: self._mover(-1, "units"))
+        self.arbol.bind("<Button-5>", lambda evento: self._mover(1, "units"))
+        self.arbol.bind("<Prior>", lambda evento: self._mover(-1, "pages"))
+        self.arbol.bind("<Next>", lambda evento: self._mover(1, "pages"))
+        self.arbol.bind("<Configure>", self._redimensionar)
+        self.arbol.bind("<Double-1>", self._elegir)
+        self.arbol.bind("<Return>", self._elegir)
+
+    def mostrar(self, vista):
+        """Muestra otra vista (o None para vaciar la lista) desde el principio"""
+        self.vista = vista
+        self.primera = 0
+        self._actualizar_encabezados()
+        self._pintar()
+
+    def refrescar(self):
+        """Vuelve a pintar después de filtrar u ordenar la vista actual"""
+        self.primera = 0
+        self._actualizar_encabezados()
+        self._pintar()
+
+    def _pintar(self):
+        total = len(self.vista) if self.vista is not None else 0
+        self.primera = max(0, min(self.primera, total - self.filas_visibles))
+        filas = self.vista.filas(self.primera, self.primera + self.filas_visibles) if total else []
+
+        # Se reutilizan los ítems existentes; solo se crean o borran los que sobran o faltan
+        items = self.arbol.get_children()
+        for item, fila in zip(items, filas):
+            self.arbol.item(item, values=fila)
+        if len(items) > len(filas):
+            self.arbol.delete(*items[len(filas):])
+        for fila in filas[len(items):]:
+            self.arbol.insert("", "end", values=fila)
+
+        if total:
+            self.barra.set(self.primera / total, (self.primera + len(filas)) / total)
+        else:
+            self.barra.set(0, 1)
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        """Comando de la barra: 'moveto fracción' o 'scroll n units|pages'"""
+        if self.vista is None:
+            return
+        if accion == "moveto":
+            self.primera = int(float(cantidad) * len(self.vista))
+            self._pintar()
+        else:
+            self._mover(int(cantidad), unidad)
+
+    def _mover(self, cantidad, unidad):
+        if self.vista is None:
+            return "break"
+        paso = self.filas_visibles if unidad == "pages" else 3
+        self.primera += cantidad * paso
+        self._pintar()
+        return "break"
+
+    def _redimensionar(self, evento):
+        # Alto de fila aproximado de ttk.Treeview con la fuente por defecto
+        filas = max(1, (evento.height - 25) // 20)
+        if filas != self.filas_visibles:
+            self.filas_visibles = filas
+            self._pintar()
+
+    def _elegir(self, evento):
+        if self.al_elegir is None or self.vista is None:
+            return
+        item = self.arbol.focus()
+        if item:
+            # Se pide la fila a la vista: los valores del ítem vuelven de Tk como texto
+            posicion = self.primera + self.arbol.index(item)
+            if posicion < len(self.vista):
+                self.al_elegir(self.vista.fila(posicion))
+
+    def _ordenar(self, columna):
+        if self.vista is None:
+            return
+        # El segundo clic en la misma columna invierte el orden
+        descendente = self.vista.orden == columna and not self.vista.descendente
+        self.vista.ordenar(columna, descendente)
+        self.refrescar()
+
+    def _actualizar_encabezados(self):
+        for posicion, columna in enumerate(self.arbol["columns"]):
+            flecha = ""
+            if self.vista is not None and self.vista.orden == posicion:
+                flecha = " ▼" if self.vista.descendente else " ▲"
+            self.arbol.heading(columna, text=columna + flecha)
@@ -0,0 +1,180 @@
+"""
+Análisis por lotes desde la línea de comandos, sin interfaz gráfica.
+
+Uso:
+    python lote.py ENTRADA [ENTRADA ...] [--trabajadores N] [--detalle] [--extension .txt]
+                   [--cache [CARPETA]] [--limite-cache MB]
+
+Cada ENTRADA puede ser un archivo, una carpeta (se recorre completa) o un
+patrón glob ("entregas/**/*.txt"). Los archivos se reparten entre varios
+procesos; cada resultado se imprime apenas está listo, en el orden de la
+lista, y al final se muestra un resumen. Con --cache los resultados se
+guardan en disco por contenido y los archivos sin cambios no se vuelven a
+analizar.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from analizador import AnalizadorLexico
+from cache_resultados import LIMITE_PREDETERMINADO, CacheResultados, analizar_contenido, carpeta_predeterminada
+from main import leer_texto
+from semantico import AnalizadorSemantico
+from sintactico import AnalizadorSintactico
+
+# Analizadores (y caché) de cada proceso: se crean una vez y se reutilizan en todos sus archivos
+_analizadores = None
+_cache = None
+
+
+def _iniciar_trabajador(carpeta_cache=None, limite_cache=None):
+    global _analizadores, _cache
+    _analizadores = (AnalizadorLexico(), AnalizadorSintactico(), AnalizadorSemantico())
+    _cache = None
+    if carpeta_cache is not None:
+        _cache = CacheResultados(carpeta_cache, limite_cache or LIMITE_PREDETERMINADO)
+
+
+def expandir_entradas(entradas, extension=".txt"):
+    """Convierte archivos, carpetas y patrones glob en una lista ordenada de archivos sin repetir"""
+    rutas = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            for carpeta, _, archivos in os.walk(entrada):
+                rutas.extend(os.path.join(carpeta, nombre) for nombre in archivos
+                             if nombre.lower().endswith(extension))
+        elif os.path.isfile(entrada):
+            rutas.append(entrada)
+        else:
+            rutas.extend(ruta for ruta in glob.glob(entrada, recursive=True) if os.path.isfile(ruta))
+    return sorted(dict.fromkeys(os.path.normpath(ruta) for ruta in rutas))
+
+
+def analizar_ruta(ruta):
+    """Analiza un archivo completo y devuelve un diccionario con sus errores por etapa"""
+    if _analizadores is None:
+        _iniciar_trabajador()
+    resultado = {'ruta': ruta, 'lexicos': [], 'sintacticos': [], 'semanticos': [], 'fallo': None,
+                 'cache': False}
+
+    inicio = time.perf_counter()
+    try:
+        analisis = analizar_contenido(leer_texto(ruta), *_analizadores, cache=_cache)
+        resultado['tokens'] = len(analisis.indice.tokens)
+        resultado['lexicos'] = analisis.lexicos
+        resultado['sintacticos'] = analisis.sintacticos
+        resultado['semanticos'] = analisis.semanticos
+        resultado['cache'] = analisis.desde_cache
+    except Exception as error:
+        # Un archivo ilegible o un caso que rompe un analizador no detiene el lote
+        resultado['fallo'] = f"{type(error).__name__}: {error}"
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+
+def cantidad_trabajadores(trabajadores, cantidad_rutas):
+    """Procesos que usa analizar_lote: None o 0 es uno por núcleo, y uno solo si hay un archivo"""
+    if trabajadores is not None and trabajadores < 0:
+        raise ValueError(f"La cantidad de trabajadores no puede ser negativa: {trabajadores}")
+    if cantidad_rutas <= 1:
+        return 1
+    return trabajadores or os.cpu_count() or 1
+
+
+def analizar_lote(rutas, trabajadores=None, carpeta_cache=None, limite_cache=None):
+    """
+    Genera el resultado de cada ruta en el mismo orden. Con un solo
+    trabajador se analiza en este proceso, sin crear el grupo de procesos.
+    Si se indica carpeta_cache, todos los procesos comparten esa caché.
+    """
+    trabajadores = cantidad_trabajadores(trabajadores, len(rutas))
+    if trabajadores == 1:
+        _iniciar_trabajador(carpeta_cache, limite_cache)
+        yield from map(analizar_ruta, rutas)
+        return
+
+    # Bloques de varios archivos por envío para no pagar la comunicación por archivo
+    bloque = max(1, min(32, len(rutas) // (trabajadores * 4)))
+    with ProcessPoolExecutor(max_workers=trabajadores, initializer=_iniciar_trabajador,
+                             initargs=(carpeta_cache, limite_cache)) as grupo:
+        yield from grupo.map(analizar_ruta, rutas, chunksize=bloque)
+
+
+def _imprimir_resultado(resultado, detalle, salida):
+    if resultado['fallo']:
+        salida.write(f"{resultado['ruta']}: FALLO ({resultado['fallo']})\n")
+        return
+
+    cantidades = [len(resultado[etapa]) for etapa in ('lexicos', 'sintacticos', 'semanticos')]
+    if not any(cantidades):
+        salida.write(f"{resultado['ruta']}: OK\n")
+        return
+
+    salida.write(f"{resultado['ruta']}: {cantidades[0]} léxicos, {cantidades[1]} sintácticos, "
+                 f"{cantidades[2]} semánticos\n")
+    if detalle:
+        for etapa, nombre in (('lexicos', 'léxico'), ('sintacticos', 'sintáctico'), ('semanticos', 'semántico')):
+            for error in resultado[etapa]:
+                salida.write(f"    [{nombre}] {error}\n")
+
+
+def _entero_positivo(texto):
+    """Tipo de argparse para cantidades que deben ser 1 o más"""
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaba un entero: {texto!r}")
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"debe ser 1 o más: {valor}")
+    return valor
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Analiza archivos PSeInt por lotes, en paralelo")
+    parser.add_argument("entradas", nargs="+", help="Archivos, carpetas o patrones glob")
+    parser.add_argument("--trabajadores", "-j", type=_entero_positivo, default=os.cpu_count() or 1,
+                        help="Cantidad de procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--detalle", action="store_true", help="Muestra cada error, no solo las cantidades")
+    parser.add_argument("--extension", default=".txt", help="Extensión de los archivos buscados en carpetas")
+    parser.add_argument("--cache", nargs="?", const=carpeta_predeterminada(), default=None, metavar="CARPETA",
+                        help="Reutiliza resultados guardados en disco (por defecto en la carpeta de caché del usuario)")
+    parser.add_argument("--limite-cache", type=_entero_positivo, default=LIMITE_PREDETERMINADO // (1024 * 1024), metavar="MB", help="Tamaño máximo de la caché")
+    args = parser.parse_args(argumentos)
+
+    rutas = expandir_entradas(args.entradas, args.extension.lower())
+    if not rutas:
+        print("No se encontraron archivos para analizar", file=sys.stderr)
+        return 2
+
+    salida = sys.stdout
+    trabajadores = cantidad_trabajadores(args.trabajadores, len(rutas))
+    inicio = time.perf_counter()
+    con_errores = fallidos = total_errores = desde_cache = 0
+    for resultado in analizar_lote(rutas, trabajadores, args.cache, args.limite_cache * 1024 * 1024):
+        _imprimir_resultado(resultado, args.detalle, salida)
+        salida.flush()
+        desde_cache += resultado['cache']
+        if resultado['fallo']:
+            fallidos += 1
+            continue
+        errores = len(resultado['lexicos']) + len(resultado['sintacticos']) + len(resultado['semanticos'])
+        total_errores += errores
+        con_errores += errores > 0
+    transcurrido = time.perf_counter() - inicio
+
+    print("-" * 60)
+    print(f"Archivos: {len(rutas)} | sin errores: {len(rutas) - con_errores - fallidos} | "
+          f"con errores: {con_errores} | fallidos: {fallidos}")
+    print(f"Errores en total: {total_errores}")
+    print(f"Tiempo: {transcurrido:.2f}s ({len(rutas) / transcurrido:.1f} archivos/s, "
+          f"{trabajadores} trabajador(es))")
+    if args.cache:
+        print(f"Caché: {desde_cache} aciertos, {len(rutas) - desde_cache} analizados ({args.cache})")
+    return 1 if con_errores or fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,86 @@
-import tkinter as tk
-from tkinter import filedialog
+import codecs
+import mmap
+from array import array
+import re
+
+# Fin de línea universal, igual que al abrir el archivo en modo texto
+_FIN_LINEA = re.compile(rb'\r\n|\r|\n')
+
+# Espacios ASCII que str.strip() elimina
+ESPACIOS_ASCII = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
+# Bytes que se examinan para decidir entre UTF-8 y Latin-1
+_MUESTRA_CODIFICACION = 64 * 1024
+
+
+def detectar_codificacion(datos):
+    """Devuelve 'utf-8' si la muestra inicial es UTF-8 válido y 'latin-1' si no"""
+    decodificador = codecs.getincrementaldecoder('utf-8')()
+    try:
+        decodificador.decode(datos[:_MUESTRA_CODIFICACION], final=len(datos) <= _MUESTRA_CODIFICACION)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def leer_texto(ruta):
+    """Lee el archivo como UTF-8 y, si no lo es, como Latin-1"""
+    with open(ruta, 'rb') as archivo:
+        datos = archivo.read()
+    try:
+        return datos.decode('utf-8')
+    except UnicodeDecodeError:
+        return datos.decode('latin-1')
+
+
+class DocumentoMapeado:
+    """
+    Archivo abierto con mmap. Los tokens guardan desplazamientos en bytes
+    y el texto solo se decodifica cuando alguien lo pide.
+    """
+    def __init__(self, ruta, codificacion='auto'):
+        self.ruta = ruta
+        self._archivo = open(ruta, 'rb')
+        try:
+            self.datos = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap no admite archivos vacíos
+            self.datos = b''
+        if codificacion == 'auto':
+            codificacion = detectar_codificacion(self.datos)
+        self.codificacion = codificacion
+        # Desplazamiento de inicio de cada línea; se llena al recorrer lineas()
+        self._inicios = array('Q')
+
+    def decodificar(self, inicio, fin):
+        return self.datos[inicio:fin].decode(self.codificacion)
+
+    def inicio_linea(self, num_linea):
+        return self._inicios[num_linea - 1]
+
+    def lineas(self):
+        """Genera (num_linea, inicio, fin) de cada línea, en bytes y sin el salto final"""
+        datos = self.datos
+        inicios = self._inicios = array('Q', [0])
+        inicio = 0
+        num_linea = 1
+        for salto in _FIN_LINEA.finditer(datos):
+            yield num_linea, inicio, salto.start()
+            inicio = salto.end()
+            inicios.append(inicio)
+            num_linea += 1
+        yield num_linea, inicio, len(datos)
+
+    def cerrar(self):
+        if isinstance(self.datos, mmap.mmap):
+            self.datos.close()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
 
 class manejo_de_archivos:
     def __init__(self):
@@ -8,6 +89,10 @@ class manejo_de_archivos:
     
     def seleccionar_archivo(self):
         #Abre el explorador de archivos para seleccionar un archivo
+        # tkinter se importa recién acá: el resto del módulo no lo necesita
+        import tkinter as tk
+        from tkinter import filedialog
+
         root = tk.Tk()
         root.withdraw() 
         archivo = filedialog.askopenfilename(
@@ -26,14 +111,30 @@ class manejo_de_archivos:
             return "No se ha seleccionado un archivo"
         
         try:
-            with open(ruta, 'r', encoding='utf-8') as archivo:
-                self.contenido = archivo.read()
+            # Con el mismo respaldo Latin-1 que el análisis, lotes y vigilancia
+            self.contenido = leer_texto(ruta)
             return self.contenido
-        except Exception as error_contenido:
+        except OSError as error_contenido:
             mensaje_de_error = f"Error al leer archivo: {str(error_contenido)}"
             self.contenido = mensaje_de_error
             return mensaje_de_error
         
+    #Abre el archivo con mmap; el contenido se decodifica solo cuando se necesita
+    def mapear_archivo(self, ruta_archivo=None, codificacion='auto'):
+        ruta = ruta_archivo or self.ruta_archivo
+        if not ruta:
+            return None
+        return DocumentoMapeado(ruta, codificacion)
+
+    #Recorre el archivo línea por línea sin cargarlo completo en memoria
+    def leer_por_lineas(self, ruta_archivo=None):
+        ruta = ruta_archivo or self.ruta_archivo
+        if not ruta:
+            return
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            for linea in archivo:
+                yield linea
+        
     #Muestra el contenido del archivo en pantalla
     def mostrar_contenido(self, contenido=None):
         texto = contenido or self.contenido
@@ -49,3 +150,9 @@ class manejo_de_archivos:
         contenido = self.leer_archivo(ruta_archivo)
         self.mostrar_contenido(contenido)
         return contenido
+
+
+if __name__ == "__main__":
+    # La interfaz gráfica es una capa aparte: se carga solo al ejecutar el programa
+    from ventana import ventana_principal
+    ventana_principal()
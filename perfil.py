@@ -0,0 +1,127 @@
+"""
+Tiempos por fase y contadores del análisis.
+
+Un Perfil junta el tiempo de cada fase y subpasada ("lexico",
+"semantico.visita", "interfaz.vistas"...) y contadores de líneas, tokens,
+símbolos y errores. Los nombres con punto son subpasadas de la fase que
+va antes del punto.
+
+Medir es opcional y no cuesta nada si está apagado. Quien corre el análisis
+pasa perfil=None (lo normal) o un Perfil; los analizadores tienen un
+atributo 'perfil' y solo lo consultan una vez por pasada, nunca por token
+o por línea.
+"""
+import time
+from contextlib import nullcontext
+
+# Contexto vacío que devuelve medir() cuando no hay perfil
+_SIN_PERFIL = nullcontext()
+
+# Fases cuya suma es el tiempo de análisis (para tokens por segundo)
+FASES_ANALISIS = ("lexico", "sintactico", "semantico")
+
+
+class _Fase:
+    __slots__ = ('perfil', 'nombre', 'inicio')
+
+    def __init__(self, perfil, nombre):
+        self.perfil = perfil
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.perfil.registrar(self.nombre, self.inicio)
+        return False
+
+
+class Perfil:
+    def __init__(self):
+        # nombre de la fase -> segundos acumulados, en el orden en que aparecen
+        self.tiempos = {}
+        self.contadores = {}
+
+    def fase(self, nombre):
+        """Contexto que suma su duración a la fase 'nombre'"""
+        return _Fase(self, nombre)
+
+    @staticmethod
+    def reloj():
+        return time.perf_counter()
+
+    def registrar(self, nombre, desde):
+        """Suma a 'nombre' el tiempo transcurrido desde 'desde' y devuelve el reloj actual"""
+        ahora = time.perf_counter()
+        self.tiempos[nombre] = self.tiempos.get(nombre, 0.0) + (ahora - desde)
+        return ahora
+
+    def contar(self, nombre, cantidad=1):
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def fases(self):
+        """
+        (nombre, segundos) de cada fase seguida de sus subpasadas. Una fase
+        termina después que sus subpasadas, así que en 'tiempos' quedan
+        antes que ella.
+        """
+        principales = [nombre for nombre in self.tiempos if "." not in nombre]
+        for fase in principales:
+            yield fase, self.tiempos[fase]
+            prefijo = fase + "."
+            for nombre, segundos in self.tiempos.items():
+                if nombre.startswith(prefijo):
+                    yield nombre, segundos
+        # Subpasadas cuya fase no se midió
+        for nombre, segundos in self.tiempos.items():
+            if "." in nombre and nombre.split(".", 1)[0] not in self.tiempos:
+                yield nombre, segundos
+
+    def conteos(self):
+        """(nombre, cantidad) con los contadores generales antes que los de cada fase"""
+        return sorted(self.contadores.items(), key=lambda par: "." in par[0])
+
+    def contar_resultado(self, contenido, resultado):
+        """Contadores generales de un ResultadoAnalisis sobre 'contenido'"""
+        self.contar("lineas", contenido.count('\n') + 1)
+        self.contar("tokens", len(resultado.indice.tokens))
+        self.contar("simbolos", len(resultado.tabla_simbolos))
+        self.contar("errores.lexico", len(resultado.lexicos))
+        self.contar("errores.sintactico", len(resultado.sintacticos))
+        self.contar("errores.semantico", len(resultado.semanticos))
+
+    def tiempo_analisis(self):
+        """Segundos de las tres etapas, sin la interfaz ni los reportes"""
+        return sum(self.tiempos.get(fase, 0.0) for fase in FASES_ANALISIS)
+
+    def tokens_por_segundo(self):
+        tiempo = self.tiempo_analisis()
+        return self.contadores.get("tokens", 0) / tiempo if tiempo else 0.0
+
+    def limpiar(self):
+        self.tiempos.clear()
+        self.contadores.clear()
+
+    def como_diccionario(self):
+        return {
+            "tiempos": dict(self.fases()),
+            "contadores": dict(self.conteos()),
+            "tiempo_analisis": self.tiempo_analisis(),
+            "tokens_por_segundo": self.tokens_por_segundo(),
+        }
+
+    def resumen_corto(self):
+        """Una línea para la barra de estado"""
+        partes = [f"{fase} {self.tiempos[fase] * 1000:.0f} ms" for fase in FASES_ANALISIS if fase in self.tiempos]
+        if "cache" in self.tiempos:
+            partes.append(f"caché {self.tiempos['cache'] * 1000:.0f} ms")
+        partes.append(f"{self.contadores.get('tokens', 0):,} tokens")
+        if self.tiempo_analisis():
+            partes.append(f"{self.tokens_por_segundo():,.0f} tokens/s")
+        return " · ".join(partes)
+
+
+def medir(perfil, nombre):
+    """Contexto que mide la fase 'nombre' en 'perfil', o no hace nada si perfil es None"""
+    return _SIN_PERFIL if perfil is None else perfil.fase(nombre)
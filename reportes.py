@@ -0,0 +1,330 @@
+"""
+Reportes del análisis escritos directamente en un archivo (o cualquier
+objeto con write): texto, JSON y CSV.
+
+Cada función recorre los tokens una sola vez y escribe a medida que
+avanza, sin armar el reporte completo en memoria; solo se acumulan los
+conteos por token distinto y los tokens no reconocidos. El formato de
+texto es exactamente el que mostraban los generar_reporte de los
+analizadores y de la ventana, que ahora usan estas funciones.
+
+Uso:
+    python reportes.py ARCHIVO [--formato texto|json|csv] [--salida RUTA]
+"""
+import csv
+import io
+import json
+import re
+import sys
+
+FORMATOS = ("texto", "json", "csv")
+
+_PATRON_LINEA = re.compile(r'Línea (\d+)')
+
+# Tokens que se juntan antes de cada write en JSON y CSV
+_TOKENS_POR_BLOQUE = 4096
+
+
+def linea_del_mensaje(mensaje):
+    """Número de línea que trae un mensaje de error ('Línea N: ...'), o 0"""
+    linea = getattr(mensaje, "linea", None)
+    if linea is not None:
+        # Diagnostico: la línea ya viene aparte
+        return linea
+    coincidencia = _PATRON_LINEA.search(mensaje)
+    return int(coincidencia.group(1)) if coincidencia else 0
+
+
+def a_texto(funcion, *args):
+    """Devuelve como str lo que 'funcion' escribiría en un archivo"""
+    salida = io.StringIO()
+    funcion(salida, *args)
+    return salida.getvalue()
+
+
+# ------------------------------------------------------------
+# Texto
+# ------------------------------------------------------------
+
+def escribir_reporte_lexico(salida, tokens):
+    """Reporte de tokens del analizador léxico; 'tokens' puede ser cualquier iterable"""
+    contador_tokens = {}
+    contador_tipos = {}
+    no_reconocidos = {}
+    total = 0
+    for token, tipo, linea in tokens:
+        total += 1
+        clave = (token, tipo)
+        contador_tokens[clave] = contador_tokens.get(clave, 0) + 1
+        contador_tipos[tipo] = contador_tipos.get(tipo, 0) + 1
+        if tipo == "DESCONOCIDO":
+            no_reconocidos.setdefault(linea, []).append(token)
+
+    escribir = salida.write
+    escribir("REPORTE DE TOKENS - ANALIZADOR LÉXICO (PSEINT)\n")
+    escribir("=" * 65 + "\n\n")
+    escribir("TOKENS ENCONTRADOS (CLASIFICADOS POR TIPO Y CANTIDAD):\n")
+    escribir("=" * 70 + "\n\n")
+    escribir(f"{'TOKEN':<20} {'TIPO':<25} {'CANTIDAD':<10}\n")
+    escribir("-" * 55 + "\n")
+    for (token, tipo), cantidad in sorted(contador_tokens.items(), key=lambda x: (x[0][1], x[0][0])):
+        escribir(f"{token:<20} {tipo:<25} {cantidad:<10}\n")
+
+    escribir("\n" + "=" * 55 + "\n")
+    escribir("RESUMEN POR TIPO DE TOKEN:\n")
+    escribir("-" * 40 + "\n")
+    for tipo, cantidad in contador_tipos.items():
+        escribir(f"{tipo}: {cantidad} tokens\n")
+
+    cantidad_no_reconocidos = contador_tipos.get("DESCONOCIDO", 0)
+    escribir("\n" + "=" * 55 + "\n")
+    escribir(f"TOTAL DE TOKENS VÁLIDOS: {total - cantidad_no_reconocidos}\n")
+    escribir(f"TOTAL DE TOKENS NO RECONOCIDOS: {cantidad_no_reconocidos}\n")
+    escribir(f"TOTAL GENERAL: {total}\n")
+
+    if no_reconocidos:
+        escribir("\nTOKENS NO RECONOCIDOS (ERRORES LÉXICOS):\n")
+        escribir("-" * 45 + "\n")
+        for linea in sorted(no_reconocidos):
+            tokens_str = ', '.join([f'"{t}"' for t in no_reconocidos[linea]])
+            escribir(f"Línea {linea}: {tokens_str}\n")
+
+
+def escribir_reporte_sintactico(salida, errores):
+    escribir = salida.write
+    if not errores:
+        escribir("✓ ANÁLISIS SINTÁCTICO: Correcto - No se encontraron errores sintácticos")
+        return
+
+    escribir("❌ ERRORES SINTÁCTICOS:\n")
+    escribir("----------------------\n")
+    for error in errores:
+        escribir(f"• {error}\n")
+    escribir(f"\nTotal de errores sintácticos: {len(errores)}")
+
+    # Resumen de verificaciones
+    escribir("\n\nVERIFICACIONES REALIZADAS:\n")
+    escribir("-------------------------\n")
+    escribir("✓ Balanceo de paréntesis y corchetes\n")
+    escribir("✓ Cierre de cadenas\n")
+    escribir("✓ Estructuras de control (Si, Mientras, Para, Segun)\n")
+    escribir("✓ Declaraciones de variables\n")
+    escribir("✓ Uso de palabras reservadas\n")
+
+
+def escribir_reporte_semantico(salida, errores, simbolos, funciones):
+    """'simbolos' son los Simbolo de la tabla; 'funciones' el diccionario del analizador semántico"""
+    escribir = salida.write
+    if not errores:
+        escribir("✓ ANÁLISIS SEMÁNTICO: Correcto\n\n")
+    else:
+        escribir("❌ ERRORES SEMÁNTICOS:\n")
+        escribir("----------------------\n")
+        for error in errores:
+            escribir(f"• {error}\n")
+        escribir(f"\nTotal: {len(errores)} error(es)\n\n")
+
+    if simbolos:
+        escribir("📊 TABLA DE SÍMBOLOS:\n")
+        escribir("---------------------\n")
+        simbolos = sorted(simbolos, key=lambda simbolo: simbolo.nombre_visible)
+        for simbolo in simbolos:
+            estado = "✓" if simbolo.usada or simbolo.es_parametro else "⚠️"
+            tipo = simbolo.tipo if simbolo.tipo is not None else "Parámetro"
+            escribir(f"{estado} {simbolo.nombre_visible}: {tipo}\n")
+        escribir(f"\nTotal variables: {len(simbolos)}\n")
+
+    if funciones:
+        escribir("\n📘 FUNCIONES DETECTADAS:\n")
+        escribir("------------------------\n")
+        for nombre, datos in funciones.items():
+            usadosim = "✓" if datos['usada'] else "⚠️"
+            escribir(f"{usadosim} {nombre}({', '.join(datos['parametros'])}) → {datos['tipo_retorno']}\n")
+
+
+def escribir_reporte_texto(salida, tokens, lexicos, sintacticos, semanticos, tabla_simbolos, perfil=None):
+    """Reporte completo de la ventana: el léxico más el resumen de las tres etapas"""
+    escribir_reporte_lexico(salida, tokens)
+
+    escribir = salida.write
+    # Agregar información completa al reporte
+    escribir("\n" + "=" * 60 + "\n")
+    escribir("REPORTE GENERAL - ANÁLISIS COMPLETO\n")
+    escribir("=" * 60 + "\n\n")
+
+    # Resumen de cada análisis
+    escribir("RESUMEN DE ANÁLISIS:\n")
+    escribir("-" * 20 + "\n")
+    escribir(f"Léxico: {'❌' if lexicos else '✅'} {len(lexicos) if lexicos else 0} errores\n")
+    escribir(f"Sintáctico: {'❌' if sintacticos else '✅'} {len(sintacticos) if sintacticos else 0} errores\n")
+    escribir(f"Semántico: {'❌' if semanticos else '✅'} {len(semanticos) if semanticos else 0} errores\n")
+
+    # Tabla de símbolos completa
+    if tabla_simbolos:
+        escribir("\nTABLA DE SÍMBOLOS COMPLETA:\n")
+        escribir("-" * 25 + "\n")
+        for variable, tipo in tabla_simbolos.items():
+            escribir(f"  {variable} : {tipo}\n")
+
+    if perfil is not None:
+        escribir_perfil(salida, perfil)
+
+
+def escribir_perfil(salida, perfil):
+    """Sección con los tiempos por fase y los contadores de un Perfil"""
+    escribir = salida.write
+    escribir("\nPERFIL DEL ANÁLISIS:\n")
+    escribir("-" * 20 + "\n")
+    for fase, segundos in perfil.fases():
+        # Las subpasadas ('semantico.visita') van debajo de su fase
+        sangria = "    " if fase.split(".", 1)[0] in perfil.tiempos and "." in fase else "  "
+        escribir(f"{sangria}{fase:<28} {segundos * 1000:>10.2f} ms\n")
+    for nombre, cantidad in perfil.conteos():
+        escribir(f"  {nombre:<28} {cantidad:>10,}\n")
+    escribir(f"  {'tokens por segundo':<28} {perfil.tokens_por_segundo():>10,.0f}\n")
+
+
+# ------------------------------------------------------------
+# JSON y CSV
+# ------------------------------------------------------------
+
+def escribir_reporte_json(salida, tokens, lexicos, sintacticos, semanticos, tabla_simbolos, perfil=None):
+    """
+    Un objeto JSON con tokens, resumen, errores por etapa y tabla de
+    símbolos. Los tokens se escriben por bloques a medida que se recorren.
+    """
+    valor = json.JSONEncoder(ensure_ascii=False).encode
+
+    escribir = salida.write
+    contador_tipos = {}
+    # Los textos y tipos se repiten mucho: cada uno se codifica una sola vez
+    codificados = {}
+    bloque = []
+    escribir('{"tokens": [')
+    separador = "\n  "
+    for token, tipo, linea in tokens:
+        contador_tipos[tipo] = contador_tipos.get(tipo, 0) + 1
+        texto_json = codificados.get(token)
+        if texto_json is None:
+            texto_json = codificados[token] = valor(token)
+        tipo_json = codificados.get(tipo)
+        if tipo_json is None:
+            tipo_json = codificados[tipo] = valor(tipo)
+        bloque.append(f'{separador}{{"texto": {texto_json}, "tipo": {tipo_json}, "linea": {linea}}}')
+        separador = ",\n  "
+        if len(bloque) == _TOKENS_POR_BLOQUE:
+            escribir(''.join(bloque))
+            bloque.clear()
+    escribir(''.join(bloque))
+    escribir("\n],\n")
+
+    total = sum(contador_tipos.values())
+    no_reconocidos = contador_tipos.get("DESCONOCIDO", 0)
+    resumen = {
+        "por_tipo": contador_tipos,
+        "validos": total - no_reconocidos,
+        "no_reconocidos": no_reconocidos,
+        "total": total,
+    }
+    escribir(f'"resumen": {valor(resumen)},\n')
+
+    escribir('"errores": {')
+    for posicion, (etapa, errores) in enumerate((("lexicos", lexicos), ("sintacticos", sintacticos),
+                                                 ("semanticos", semanticos))):
+        escribir(f'{"," if posicion else ""}\n  {valor(etapa)}: [')
+        separador = "\n    "
+        for error in errores:
+            codigo = valor(getattr(error, "codigo", None))
+            escribir(f'{separador}{{"linea": {linea_del_mensaje(error)}, "codigo": {codigo}, "mensaje": {valor(error)}}}')
+            separador = ",\n    "
+        escribir("\n  ]" if errores else "]")
+    escribir("\n},\n")
+
+    escribir(f'"tabla_simbolos": {valor(dict(tabla_simbolos))}')
+    if perfil is not None:
+        escribir(f',\n"perfil": {valor(perfil.como_diccionario())}')
+    escribir("\n}\n")
+
+
+def escribir_reporte_csv(salida, tokens, lexicos, sintacticos, semanticos, tabla_simbolos, perfil=None):
+    """Una fila por token, error o símbolo; la primera columna dice cuál es"""
+    escritor = csv.writer(salida, lineterminator="\n")
+    escritor.writerow(("seccion", "linea", "texto", "tipo", "mensaje"))
+    bloque = []
+    for token, tipo, linea in tokens:
+        bloque.append(("token", linea, token, tipo, ""))
+        if len(bloque) == _TOKENS_POR_BLOQUE:
+            escritor.writerows(bloque)
+            bloque.clear()
+    escritor.writerows(bloque)
+    for seccion, errores in (("error_lexico", lexicos), ("error_sintactico", sintacticos),
+                             ("error_semantico", semanticos)):
+        for error in errores:
+            escritor.writerow((seccion, linea_del_mensaje(error) or "", "", "", error))
+    for variable, tipo in tabla_simbolos.items():
+        escritor.writerow(("simbolo", "", variable, tipo, ""))
+    if perfil is not None:
+        # Segundos y cantidades van en la columna 'mensaje'
+        for fase, segundos in perfil.fases():
+            escritor.writerow(("tiempo", "", fase, "segundos", f"{segundos:.6f}"))
+        for nombre, cantidad in perfil.conteos():
+            escritor.writerow(("contador", "", nombre, "", cantidad))
+
+
+_ESCRITORES = {
+    "texto": escribir_reporte_texto,
+    "json": escribir_reporte_json,
+    "csv": escribir_reporte_csv,
+}
+
+
+def escribir_reporte(salida, formato, tokens, lexicos, sintacticos, semanticos, tabla_simbolos, perfil=None):
+    """
+    Escribe el reporte completo en el formato pedido ('texto', 'json' o
+    'csv'). Con un Perfil se agregan sus tiempos y contadores.
+    """
+    if formato not in _ESCRITORES:
+        raise ValueError(f"Formato de reporte desconocido: '{formato}'")
+    _ESCRITORES[formato](salida, tokens, lexicos, sintacticos, semanticos, tabla_simbolos, perfil)
+
+
+def formato_por_extension(ruta, predeterminado="texto"):
+    extension = ruta.rsplit('.', 1)[-1].lower() if '.' in ruta else ''
+    return {"json": "json", "csv": "csv", "txt": "texto"}.get(extension, predeterminado)
+
+
+def main(argumentos=None):
+    import argparse
+
+    from analizador import AnalizadorLexico
+    from cache_resultados import analizar_contenido
+    from main import leer_texto
+    from perfil import Perfil
+    from semantico import AnalizadorSemantico
+    from sintactico import AnalizadorSintactico
+
+    parser = argparse.ArgumentParser(description="Genera el reporte del análisis de un archivo PSeInt")
+    parser.add_argument("archivo")
+    parser.add_argument("--formato", choices=FORMATOS, help="Por defecto, según la extensión de --salida")
+    parser.add_argument("--salida", "-o", help="Archivo de salida (por defecto, la salida estándar)")
+    parser.add_argument("--perfil", action="store_true", help="Agregar tiempos por fase y contadores")
+    args = parser.parse_args(argumentos)
+
+    perfil = Perfil() if args.perfil else None
+    resultado = analizar_contenido(leer_texto(args.archivo), AnalizadorLexico(), AnalizadorSintactico(),
+                                   AnalizadorSemantico(), perfil=perfil)
+    datos = (resultado.indice.tokens, resultado.lexicos, resultado.sintacticos, resultado.semanticos,
+             resultado.tabla_simbolos, perfil)
+
+    formato = args.formato or (formato_por_extension(args.salida) if args.salida else "texto")
+    if args.salida:
+        # newline='' para que csv controle los fines de línea
+        with open(args.salida, 'w', encoding='utf-8', newline='') as salida:
+            escribir_reporte(salida, formato, *datos)
+    else:
+        escribir_reporte(sys.stdout, formato, *datos)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,85 +1,150 @@
-import re
+from tokens_pseint import (
+    CLASE_CADENA, CLASE_COMENTARIO, CLASE_DECIMAL, CLASE_IDENTIFICADOR,
+    CLASE_NUMERO, ESCRITURAS, INSTRUCCIONES_EXTRA, OPERADORES_PALABRA,
+    PALABRAS_RESERVADAS, TIPOS_DATO,
+    PAL_ALGORITMO, PAL_COMO, PAL_DE, PAL_DEFINIR, PAL_DIMENSION, PAL_ESCRIBIR,
+    PAL_FALSO, PAL_FINALGORITMO, PAL_FINFUNCION, PAL_FINPROCESO,
+    PAL_FINSUBPROCESO, PAL_FUNCION, PAL_LEER, PAL_MODO, PAL_MOSTRAR, PAL_NINGUNA,
+    PAL_OTRO, PAL_PROCESO, PAL_RETORNAR, PAL_SEGUN, PAL_SUBPROCESO, PAL_VERDADERO,
+    asegurar_indice,
+)
+from diagnosticos import diagnostico
+from tabla_simbolos import Simbolo, TablaSimbolos
+from reportes import a_texto, escribir_reporte_semantico
+
+# Palabras que no pueden ser nombres de variables ni de funciones
+RESERVADAS_SEMANTICO = PALABRAS_RESERVADAS | INSTRUCCIONES_EXTRA
+
+# Palabras que marcan un contexto donde un identificador no es una variable
+_CONTEXTO_SALIDA = frozenset({PAL_ESCRIBIR, PAL_MOSTRAR})
+_CONTEXTO_SEGUN = frozenset({PAL_SEGUN, PAL_DE, PAL_OTRO, PAL_MODO})
+_CONTEXTO_ENCABEZADO = frozenset({PAL_FUNCION, PAL_ALGORITMO, PAL_PROCESO})
+_FIN_DE_BLOQUE = frozenset({PAL_FINFUNCION, PAL_FINALGORITMO, PAL_FINPROCESO})
+
+# Estructuras que abren y cierran un ámbito de variables
+_APERTURA_AMBITO = frozenset({PAL_ALGORITMO, PAL_PROCESO, PAL_FUNCION, PAL_SUBPROCESO})
+_CIERRE_AMBITO = frozenset({PAL_FINALGORITMO, PAL_FINPROCESO, PAL_FINFUNCION, PAL_FINSUBPROCESO})
 
 class AnalizadorSemantico:
     def __init__(self):
         # Tabla de símbolos y estructuras auxiliares
-        self.tabla_simbolos = {}
+        self.tabla_simbolos = TablaSimbolos()
         self.errores = []
         self.funciones = {}
-        self.variables_usadas = set()
-
-    def limpiar(self):
-        self.tabla_simbolos = {}
+        # variables_usadas[clave] es 1 si la variable con esa clave se usó
+        self.variables_usadas = bytearray()
+        self._vistos = set()
+        # Perfil opcional (ver perfil.py) donde se miden las pasadas
+        self.perfil = None
+
+    def limpiar(self, cantidad_claves=0):
+        """'cantidad_claves' es el largo del PoolSimbolos del documento a analizar"""
+        self.tabla_simbolos = TablaSimbolos(cantidad_claves)
         self.errores = []
         self.funciones = {}
-        self.variables_usadas = set()
+        self.variables_usadas = bytearray(cantidad_claves)
+        self._vistos = set()
+
+    def _agregar_error(self, destino, mensaje):
+        """Agrega el mensaje a 'destino' salvo que ya se haya informado"""
+        if mensaje not in self._vistos:
+            self._vistos.add(mensaje)
+            destino.append(mensaje)
 
     # ------------------------------------------------------------
     # MÉTODOS PRINCIPALES
     # ------------------------------------------------------------
 
     def analizar(self, tokens):
-        self.limpiar()
-
-        # Agrupar tokens por línea
-        tokens_por_linea = {}
-        for token, tipo, linea in tokens:
-            tokens_por_linea.setdefault(linea, []).append((token, tipo))
-
-        # PRIMERA PASADA: Declaraciones y funciones
-        for linea in sorted(tokens_por_linea.keys()):
-            lista = tokens_por_linea[linea]
-            if not lista:
-                continue
-
-            self._analizar_funcion_pseint(linea, lista)
-            self._analizar_definicion_pseint(linea, lista)
-            self._analizar_dimension_pseint(linea, lista)
-
-        # SEGUNDA PASADA: Asignaciones y uso de variables
+        """
+        Recibe el IndiceLineas del léxico (o una lista plana de tokens).
+        Hace dos pasadas por las líneas: la primera registra declaraciones,
+        funciones y ámbitos; la segunda visita cada línea una vez y revisa
+        asignaciones, usos, retornos y llamadas. Las variables se buscan por
+        el id de símbolo de sus tokens, no por el texto.
+        """
+        indice = asegurar_indice(tokens)
+        self.limpiar(len(indice.simbolos))
+        perfil = self.perfil
+        marca = perfil.reloj() if perfil is not None else 0.0
+
+        # PRIMERA PASADA: Declaraciones y funciones (crea los ámbitos)
+        for linea, lista in indice:
+            self._actualizar_ambito(linea, lista, None)
+            primero = lista[0].palabra
+            if primero == PAL_FUNCION:
+                self._analizar_funcion_pseint(linea, lista)
+            elif primero == PAL_DEFINIR:
+                self._analizar_definicion_pseint(linea, lista)
+            elif primero == PAL_DIMENSION:
+                self._analizar_dimension_pseint(linea, lista)
+
+        if perfil is not None:
+            marca = perfil.registrar("semantico.declaraciones", marca)
+
+        # SEGUNDA PASADA: Visita cada línea en los mismos ámbitos. Los errores
+        # de llamadas se informan después de los de uso, como antes
+        self.tabla_simbolos.volver_al_global()
+        ambitos = iter(self.tabla_simbolos.ambitos[1:])
+        errores_llamadas = []
         contexto_funcion = None
-        for linea in sorted(tokens_por_linea.keys()):
-            lista = tokens_por_linea[linea]
-            if not lista:
-                continue
+        for linea, lista in indice:
+            self._actualizar_ambito(linea, lista, ambitos)
 
             # Detectar inicio o fin de función
-            if lista[0][0].lower() == "funcion" and len(lista) > 1:
-                contexto_funcion = lista[1][0]
-            elif lista[0][0].lower() in {"finfuncion", "finalgoritmo", "finproceso"}:
+            if lista[0].palabra == PAL_FUNCION and len(lista) > 1:
+                contexto_funcion = lista[1].texto
+            elif lista[0].palabra in _FIN_DE_BLOQUE:
                 contexto_funcion = None
 
-            self._analizar_asignaciones_pseint(linea, lista)
-            self._verificar_usos_variables(linea, lista)
-            self._analizar_retorno_pseint(linea, lista, contexto_funcion)
+            self._visitar_linea(linea, lista, contexto_funcion, errores_llamadas)
 
-        # TERCERA PASADA: Verificar llamadas a funciones
-        for linea in sorted(tokens_por_linea.keys()):
-            lista = tokens_por_linea[linea]
-            if not lista:
-                continue
-            self._verificar_llamadas_funciones(linea, lista)
+        self.errores.extend(errores_llamadas)
+        if perfil is not None:
+            marca = perfil.registrar("semantico.visita", marca)
 
-        # CUARTA PASADA: Variables no usadas
+        # Variables no usadas (recorre la tabla, no las líneas)
         self._verificar_variables_no_usadas()
+        if perfil is not None:
+            marca = perfil.registrar("semantico.no_usadas", marca)
 
-        # Eliminar errores duplicados
-        seen = set()
-        errores_unicos = []
-        for e in self.errores:
-            if e not in seen:
-                errores_unicos.append(e)
-                seen.add(e)
-
-        # Crear tabla de símbolos simplificada
+        # Crear tabla de símbolos simplificada (los parámetros sin Definir no tienen tipo)
         tabla_simbolos_simple = {}
-        for var, info in self.tabla_simbolos.items():
-            if isinstance(info, dict):
-                tabla_simbolos_simple[var] = info['tipo']
+        for simbolo in self.tabla_simbolos.simbolos():
+            if simbolo.tipo is not None:
+                tabla_simbolos_simple[simbolo.nombre_visible] = simbolo.tipo
+
+        if perfil is not None:
+            perfil.registrar("semantico.tabla", marca)
+            perfil.contar("semantico.funciones", len(self.funciones))
+            perfil.contar("semantico.ambitos", len(self.tabla_simbolos.ambitos))
+        return list(self.errores), tabla_simbolos_simple
+
+    # ------------------------------------------------------------
+    # ÁMBITOS
+    # ------------------------------------------------------------
+
+    def _actualizar_ambito(self, linea, lista, ambitos):
+        """
+        Abre o cierra el ámbito según la primera palabra de la línea. En la
+        primera pasada (ambitos=None) se crean; en las siguientes se vuelve
+        a entrar, en el mismo orden, a los ámbitos ya creados.
+        """
+        primero = lista[0].palabra
+        if primero in _APERTURA_AMBITO:
+            if ambitos is None:
+                self.tabla_simbolos.abrir(self._nombre_de_encabezado(lista), primero, linea)
             else:
-                tabla_simbolos_simple[var] = info
+                self.tabla_simbolos.entrar(next(ambitos))
+        elif primero in _CIERRE_AMBITO:
+            self.tabla_simbolos.salir()
 
-        return errores_unicos, tabla_simbolos_simple
+    def _nombre_de_encabezado(self, lista):
+        """Nombre del algoritmo o función: el identificador antes de '(' o el que sigue a la palabra clave"""
+        for i in range(2, len(lista)):
+            if lista[i].texto == "(":
+                return lista[i - 1].texto
+        return lista[1].texto if len(lista) > 1 else ESCRITURAS[lista[0].palabra]
 
     # ------------------------------------------------------------
     # DECLARACIONES
@@ -87,81 +152,84 @@ class AnalizadorSemantico:
 
     def _analizar_definicion_pseint(self, linea, lista):
         """Analiza declaraciones con 'Definir' de PSeInt"""
-        if len(lista) >= 4 and lista[0][0].lower() == "definir":
+        if len(lista) >= 4 and lista[0].palabra == PAL_DEFINIR:
             i = 1
             variables = []
 
-            while i < len(lista) and lista[i][0].lower() != "como":
-                if lista[i][1] == "Identificador":
-                    var_name = lista[i][0]
-                    if var_name in self.tabla_simbolos:
-                        self.errores.append(f"Línea {linea}: variable '{var_name}' ya declarada anteriormente")
+            while i < len(lista) and lista[i].palabra != PAL_COMO:
+                if lista[i].clase == CLASE_IDENTIFICADOR:
+                    var = lista[i]
+                    existente = self.tabla_simbolos.buscar_local(var.simbolo)
+                    if existente is not None and not (existente.es_parametro and existente.tipo is None):
+                        self._agregar_error(self.errores, diagnostico("SEM001", linea, nombre=var.texto))
                     else:
-                        variables.append(var_name)
+                        variables.append(var)
                 i += 1
 
-            if i < len(lista) - 1 and lista[i][0].lower() == "como":
-                tipo = lista[i + 1][0].capitalize()
-                tipos_validos = {"Entero", "Real", "Caracter", "Logico"}
-
-                if tipo in tipos_validos:
+            if i < len(lista) - 1 and lista[i].palabra == PAL_COMO:
+                if lista[i + 1].palabra in TIPOS_DATO:
+                    tipo = ESCRITURAS[lista[i + 1].palabra]
                     for var in variables:
-                        self.tabla_simbolos[var] = {
-                            'tipo': tipo,
-                            'linea': linea,
-                            'usada': False,
-                            'inicializada': False
-                        }
+                        parametro = self.tabla_simbolos.buscar_local(var.simbolo)
+                        if parametro is not None:
+                            # Definir dentro de la función le da tipo al parámetro
+                            parametro.tipo = tipo
+                        else:
+                            self.tabla_simbolos.declarar(Simbolo(var.simbolo, var.texto, tipo, linea,
+                                                                 self.tabla_simbolos.actual))
                 else:
-                    self.errores.append(f"Línea {linea}: tipo no válido '{tipo}'")
+                    tipo = lista[i + 1].texto.capitalize()
+                    self._agregar_error(self.errores, diagnostico("SEM002", linea, tipo=tipo))
             else:
-                self.errores.append(f"Línea {linea}: declaración incompleta, falta 'Como [tipo]'")
+                self._agregar_error(self.errores, diagnostico("SEM003", linea))
 
     def _analizar_dimension_pseint(self, linea, lista):
         """Analiza declaraciones con 'Dimension'"""
-        if len(lista) >= 2 and lista[0][0].lower() == "dimension":
+        if len(lista) >= 2 and lista[0].palabra == PAL_DIMENSION:
             for i in range(1, len(lista)):
-                token, tipo = lista[i]
-                if tipo == "Identificador":
-                    var_name = token
-                    if var_name not in self.tabla_simbolos:
-                        self.tabla_simbolos[var_name] = {
-                            'tipo': 'Real',
-                            'linea': linea,
-                            'usada': False,
-                            'inicializada': True,
-                            'es_arreglo': True
-                        }
+                if lista[i].clase == CLASE_IDENTIFICADOR:
+                    var = lista[i]
+                    if self.tabla_simbolos.buscar_local(var.simbolo) is None:
+                        self.tabla_simbolos.declarar(Simbolo(var.simbolo, var.texto, 'Real', linea,
+                                                             self.tabla_simbolos.actual,
+                                                             inicializada=True, es_arreglo=True))
                     else:
-                        self.errores.append(f"Línea {linea}: variable '{var_name}' ya declarada anteriormente")
+                        self._agregar_error(self.errores, diagnostico("SEM001", linea, nombre=var.texto))
 
     def _analizar_funcion_pseint(self, linea, lista):
         """Analiza definiciones de funciones"""
-        if len(lista) >= 2 and lista[0][0].lower() == "funcion":
+        if len(lista) >= 2 and lista[0].palabra == PAL_FUNCION:
             nombre_funcion = None
             parametros = []
+            claves = []
             tipo_retorno = "Void"
 
             i = 1
-            if lista[i][1] == "Identificador":
-                nombre_funcion = lista[i][0]
+            if lista[i].clase == CLASE_IDENTIFICADOR:
+                nombre_funcion = lista[i].texto
                 i += 1
             else:
-                self.errores.append(f"Línea {linea}: falta nombre de la función")
+                self._agregar_error(self.errores, diagnostico("SEM004", linea))
                 return
 
             # Leer parámetros dentro de paréntesis
-            if i < len(lista) and lista[i][0] == "(":
+            if i < len(lista) and lista[i].texto == "(":
                 i += 1
-                while i < len(lista) and lista[i][0] != ")":
-                    token, tipo = lista[i]
-                    if tipo == "Identificador":
-                        parametros.append(token)
+                while i < len(lista) and lista[i].texto != ")":
+                    if lista[i].clase == CLASE_IDENTIFICADOR:
+                        parametros.append(lista[i].texto)
+                        claves.append(lista[i].simbolo)
                     i += 1
 
+            # Los parámetros son locales a la función; su tipo llega con Definir
+            for clave, parametro in zip(claves, parametros):
+                if self.tabla_simbolos.buscar_local(clave) is None:
+                    self.tabla_simbolos.declarar(Simbolo(clave, parametro, None, linea, self.tabla_simbolos.actual,
+                                                         inicializada=True, es_parametro=True))
+
             # Registrar la función
             if nombre_funcion in self.funciones:
-                self.errores.append(f"Línea {linea}: función '{nombre_funcion}' ya declarada anteriormente")
+                self._agregar_error(self.errores, diagnostico("SEM005", linea, nombre=nombre_funcion))
             else:
                 self.funciones[nombre_funcion] = {
                     "parametros": parametros,
@@ -171,113 +239,127 @@ class AnalizadorSemantico:
                 }
 
     # ------------------------------------------------------------
-    # ASIGNACIONES Y USOS
+    # ASIGNACIONES, USOS, RETORNOS Y LLAMADAS
     # ------------------------------------------------------------
 
-    def _analizar_asignaciones_pseint(self, linea, lista):
-        """Analiza asignaciones (<-)"""
-        for idx, (tok, tok_tipo) in enumerate(lista):
-            if tok in ('<-', '='):
-                if idx > 0 and idx < len(lista) - 1:
-                    lhs_tok, lhs_tipo = lista[idx - 1]
-
-                    if lhs_tipo == "Identificador":
-                        if lhs_tok not in self.tabla_simbolos:
-                            self.errores.append(f"Línea {linea}: variable '{lhs_tok}' no declarada")
-                        else:
-                            self.tabla_simbolos[lhs_tok]['usada'] = True
-                            self.tabla_simbolos[lhs_tok]['inicializada'] = True
-                            self.variables_usadas.add(lhs_tok)
-
-                        expr_tokens = lista[idx + 1:]
-                        tipo_expr = self._evaluar_expresion(expr_tokens, linea)
-                        if tipo_expr and lhs_tok in self.tabla_simbolos:
-                            tipo_decl = self._obtener_tipo_variable(lhs_tok)
-                            if tipo_decl and not self._compatibles_pseint(tipo_decl, tipo_expr):
-                                self.errores.append(
-                                    f"Línea {linea}: incompatibilidad en asignación '{lhs_tok}': {tipo_decl} <- {tipo_expr}"
-                                )
-
-    def _verificar_usos_variables(self, linea, lista):
-        """Verifica uso de variables"""
-        for i, (tok, tok_tipo) in enumerate(lista):
-            if tok_tipo == "Identificador" and not self._es_palabra_reservada_pseint(tok):
-                if i > 0 and lista[i - 1][0].lower() == "algoritmo":
-                    continue
-
-                if tok in self.tabla_simbolos:
-                    self.tabla_simbolos[tok]['usada'] = True
-                    self.variables_usadas.add(tok)
-
-                    if i > 0 and lista[i - 1][0].lower() == "leer":
-                        self.tabla_simbolos[tok]['inicializada'] = True
+    def _visitar_linea(self, linea, lista, contexto_funcion, errores_llamadas):
+        """
+        Recorre los tokens de la línea una sola vez. Los errores se juntan
+        por tipo y se agregan en el orden de siempre: asignaciones, usos y
+        retornos; las llamadas van aparte a errores_llamadas.
+        """
+        asignaciones = []
+        usos = []
+        retornos = []
+        seguros = None
+        ultimo = len(lista) - 1
+
+        for i, token in enumerate(lista):
+            texto = token.texto
+
+            # --- Asignación (<-) ---
+            if (texto == '<-' or texto == '=') and 0 < i < ultimo and lista[i - 1].clase == CLASE_IDENTIFICADOR:
+                lhs = lista[i - 1]
+                lhs_tok = lhs.texto
+                simbolo = self.tabla_simbolos.buscar(lhs.simbolo)
+                if simbolo is None:
+                    asignaciones.append(diagnostico("SEM006", linea, nombre=lhs_tok))
                 else:
-                    if not self._es_contexto_seguro(lista, i):
-                        self.errores.append(f"Línea {linea}: variable '{tok}' usada sin declarar")
-
-    def _verificar_llamadas_funciones(self, linea, lista):
-        """Verifica llamadas a funciones"""
-        for i in range(len(lista)):
-            token, tipo = lista[i]
-            if tipo == "Identificador" and i + 1 < len(lista) and lista[i + 1][0] == "(":
-                if not self._es_palabra_reservada_pseint(token):
-                    if token not in self.funciones:
-                        self.errores.append(f"Línea {linea}: función '{token}' no declarada")
-                    else:
-                        self.funciones[token]["usada"] = True
-
-    def _analizar_retorno_pseint(self, linea, lista, contexto_funcion):
-        """Analiza instrucciones 'Retornar'"""
-        for i, (tok, tipo) in enumerate(lista):
-            if tok.lower() == "retornar":
+                    simbolo.usada = True
+                    simbolo.inicializada = True
+                    self.variables_usadas[lhs.simbolo] = 1
+
+                tipo_expr = self._evaluar_expresion(lista[i + 1:], linea)
+                if tipo_expr and simbolo is not None:
+                    tipo_decl = simbolo.tipo
+                    if tipo_decl and not self._compatibles_pseint(tipo_decl, tipo_expr):
+                        asignaciones.append(diagnostico("SEM007", linea, nombre=lhs_tok,
+                                                         tipo_declarado=tipo_decl, tipo_expresion=tipo_expr))
+
+            # --- Retornar ---
+            elif token.palabra == PAL_RETORNAR:
                 if not contexto_funcion:
-                    self.errores.append(f"Línea {linea}: 'Retornar' fuera de una función")
+                    retornos.append(diagnostico("SEM008", linea))
                 else:
-                    expr = lista[i + 1:] if i + 1 < len(lista) else []
-                    tipo_expr = self._evaluar_expresion(expr, linea)
+                    tipo_expr = self._evaluar_expresion(lista[i + 1:], linea)
                     tipo_decl = self.funciones[contexto_funcion]["tipo_retorno"]
                     if tipo_expr and tipo_decl != "Void" and not self._compatibles_pseint(tipo_decl, tipo_expr):
-                        self.errores.append(
-                            f"Línea {linea}: tipo de retorno incompatible en función '{contexto_funcion}' ({tipo_expr} ≠ {tipo_decl})"
-                        )
+                        retornos.append(diagnostico("SEM009", linea, funcion=contexto_funcion,
+                                                     tipo_expresion=tipo_expr, tipo_declarado=tipo_decl))
+
+            if token.clase != CLASE_IDENTIFICADOR or token.palabra in RESERVADAS_SEMANTICO:
+                continue
+
+            # --- Llamada a función ---
+            if i < ultimo and lista[i + 1].texto == "(":
+                funcion = self.funciones.get(texto)
+                if funcion is None:
+                    self._agregar_error(errores_llamadas, diagnostico("SEM010", linea, nombre=texto))
+                else:
+                    funcion["usada"] = True
+
+            # --- Uso de variable ---
+            anterior = lista[i - 1].palabra if i > 0 else PAL_NINGUNA
+            if anterior == PAL_ALGORITMO:
+                continue
+            simbolo = self.tabla_simbolos.buscar(token.simbolo)
+            if simbolo is not None:
+                simbolo.usada = True
+                self.variables_usadas[token.simbolo] = 1
+                if anterior == PAL_LEER:
+                    simbolo.inicializada = True
+            else:
+                if seguros is None:
+                    seguros = self._contextos_seguros(lista)
+                if not seguros[i]:
+                    usos.append(diagnostico("SEM011", linea, nombre=texto))
+
+        for mensaje in asignaciones:
+            self._agregar_error(self.errores, mensaje)
+        for mensaje in usos:
+            self._agregar_error(self.errores, mensaje)
+        for mensaje in retornos:
+            self._agregar_error(self.errores, mensaje)
 
     # ------------------------------------------------------------
     # FUNCIONES AUXILIARES
     # ------------------------------------------------------------
 
-    def _es_contexto_seguro(self, lista, indice):
+    def _contextos_seguros(self, lista):
         """
-        Determina si un identificador está en un contexto donde no representa una variable real.
-        Versión genérica válida para cualquier pseudocódigo PSeInt.
+        Marca las posiciones de la línea donde un identificador no representa
+        una variable real: cerca de Escribir/Mostrar, de Segun/De/Otro/Modo o
+        del encabezado de una función, después de Leer, antes de '<-' y las
+        cadenas. Se calcula una vez por línea en lugar de revisar una ventana
+        de tokens por cada identificador.
         """
-        if lista[indice][1] == "Cadena":
-            return True
-
-        for i in range(max(0, indice - 3), indice):
-            if lista[i][0].lower() in {"escribir", "mostrar"}:
-                return True
-
-        for i in range(max(0, indice - 3), min(len(lista), indice + 3)):
-            if lista[i][0].lower() in {"segun", "de", "otro", "modo"}:
-                return True
-
-        for i in range(max(0, indice - 2), min(len(lista), indice + 2)):
-            if lista[i][0].lower() in {"funcion", "algoritmo", "proceso"}:
-                return True
-
-        for i in range(max(0, indice - 1), indice):
-            if lista[i][0].lower() == "leer":
-                return True
-
-        if indice + 1 < len(lista) and lista[indice + 1][0] == "<-":
-            return True
-
-        return False
+        largo = len(lista)
+        seguros = [False] * largo
+
+        def marcar(desde, hasta):
+            for i in range(max(0, desde), min(largo, hasta)):
+                seguros[i] = True
+
+        for p, tok in enumerate(lista):
+            palabra = tok.palabra
+            if tok.clase == CLASE_CADENA:
+                seguros[p] = True
+            if palabra in _CONTEXTO_SALIDA:
+                marcar(p + 1, p + 4)
+            elif palabra in _CONTEXTO_SEGUN:
+                marcar(p - 2, p + 4)
+            elif palabra in _CONTEXTO_ENCABEZADO:
+                marcar(p - 1, p + 3)
+            elif palabra == PAL_LEER:
+                marcar(p + 1, p + 2)
+            if tok.texto == "<-":
+                marcar(p - 1, p)
+        return seguros
 
     def _verificar_variables_no_usadas(self):
-        for var_name, info in self.tabla_simbolos.items():
-            if isinstance(info, dict) and not info['usada']:
-                self.errores.append(f"Línea {info['linea']}: variable '{var_name}' declarada pero no usada")
+        for simbolo in self.tabla_simbolos.simbolos():
+            if not simbolo.usada and not simbolo.es_parametro:
+                self._agregar_error(self.errores, diagnostico("SEM012", simbolo.linea, nombre=simbolo.nombre))
 
     # ------------------------------------------------------------
     # EVALUACIÓN DE EXPRESIONES Y TIPOS
@@ -288,20 +370,18 @@ class AnalizadorSemantico:
             return None
 
         operandos_tipos = []
-        operadores = {'+','-','*','/','%','^','=','<>','<','>','<=','>=','y','o','no','&'}
-        contiene_comparador = any(tok[0] in {'=','<>','<','>','<=','>='} for tok in expr_tokens)
-
-        for tok, tok_tipo in expr_tokens:
-            tok_lower = tok.lower()
+        operadores = {'+','-','*','/','%','^','=','<>','<','>','<=','>=','&'}
+        contiene_comparador = any(tok.texto in {'=','<>','<','>','<=','>='} for tok in expr_tokens)
 
-            if tok.startswith("//") or tok_tipo == "Cadena":
+        for tok in expr_tokens:
+            if tok.clase == CLASE_COMENTARIO or tok.clase == CLASE_CADENA:
                 continue
-            if tok in {',', '[', ']', ';', '(', ')'}:
+            if tok.texto in {',', '[', ']', ';', '(', ')'}:
                 continue
-            if tok_lower in operadores:
+            if tok.texto in operadores or tok.palabra in OPERADORES_PALABRA:
                 continue
 
-            tipo = self._obtener_tipo_token(tok, tok_tipo)
+            tipo = self._obtener_tipo_token(tok)
             if tipo:
                 operandos_tipos.append(tipo)
 
@@ -323,42 +403,31 @@ class AnalizadorSemantico:
 
         return operandos_tipos[0]
 
-    def _tipo_de_literal(self, token, tipo_token):
-        if tipo_token == "Número":
+    def _tipo_de_literal(self, token):
+        if token.clase == CLASE_NUMERO:
             return "Entero"
-        if tipo_token == "Decimal":
+        if token.clase == CLASE_DECIMAL:
             return "Real"
-        if tipo_token == "Cadena":
+        if token.clase == CLASE_CADENA:
             return "Caracter"
-        if token.lower() in ("verdadero", "falso"):
+        if token.palabra == PAL_VERDADERO or token.palabra == PAL_FALSO:
             return "Logico"
         return None
 
-    def _obtener_tipo_token(self, token, tipo_token):
-        tipo_lit = self._tipo_de_literal(token, tipo_token)
+    def _obtener_tipo_token(self, token):
+        tipo_lit = self._tipo_de_literal(token)
         if tipo_lit:
             return tipo_lit
-        if tipo_token == "Identificador" and token in self.tabla_simbolos:
-            return self._obtener_tipo_variable(token)
+        if token.clase == CLASE_IDENTIFICADOR:
+            return self._obtener_tipo_variable(token.simbolo)
         return None
 
-    def _obtener_tipo_variable(self, variable):
-        if variable in self.tabla_simbolos:
-            info = self.tabla_simbolos[variable]
-            if isinstance(info, dict):
-                return info['tipo']
-            return info
-        return None
+    def _obtener_tipo_variable(self, clave):
+        simbolo = self.tabla_simbolos.buscar(clave)
+        return simbolo.tipo if simbolo is not None else None
 
     def _es_palabra_reservada_pseint(self, token):
-        palabras = {
-            'algoritmo','finalgoritmo','proceso','finproceso','funcion','finfuncion',
-            'definir','como','entero','real','caracter','logico','escribir','leer',
-            'si','entonces','sino','finsi','para','hasta','con','paso','hacer','finpara',
-            'mientras','finmientras','repetir','segun','de','otro','finsegun',
-            'dimension','verdadero','falso','esperar','tecla','retornar'
-        }
-        return token.lower() in palabras
+        return token.palabra in RESERVADAS_SEMANTICO
 
     def _compatibles_pseint(self, tipo_decl, tipo_expr):
         if tipo_decl == tipo_expr:
@@ -374,31 +443,4 @@ class AnalizadorSemantico:
     # ------------------------------------------------------------
 
     def generar_reporte_semantico(self):
-        if not self.errores:
-            reporte = "✓ ANÁLISIS SEMÁNTICO: Correcto\n\n"
-        else:
-            reporte = "❌ ERRORES SEMÁNTICOS:\n"
-            reporte += "----------------------\n"
-            for error in self.errores:
-                reporte += f"• {error}\n"
-            reporte += f"\nTotal: {len(self.errores)} error(es)\n\n"
-
-        if self.tabla_simbolos:
-            reporte += "📊 TABLA DE SÍMBOLOS:\n"
-            reporte += "---------------------\n"
-            for var, info in sorted(self.tabla_simbolos.items()):
-                if isinstance(info, dict):
-                    estado = "✓" if info['usada'] else "⚠️"
-                    reporte += f"{estado} {var}: {info['tipo']}\n"
-                else:
-                    reporte += f"? {var}: {info}\n"
-            reporte += f"\nTotal variables: {len(self.tabla_simbolos)}\n"
-
-        if self.funciones:
-            reporte += "\n📘 FUNCIONES DETECTADAS:\n"
-            reporte += "------------------------\n"
-            for nombre, datos in self.funciones.items():
-                usadosim = "✓" if datos['usada'] else "⚠️"
-                reporte += f"{usadosim} {nombre}({', '.join(datos['parametros'])}) → {datos['tipo_retorno']}\n"
-
-        return reporte
+        return a_texto(escribir_reporte_semantico, self.errores, list(self.tabla_simbolos.simbolos()), self.funciones)
@@ -0,0 +1,456 @@
+"""
+Servidor del Language Server Protocol (LSP) sobre stdio.
+
+Lleva los diagnósticos de las tres etapas a cualquier editor con cliente
+LSP. Los mensajes son JSON-RPC 2.0 con la cabecera Content-Length, como
+pide el protocolo. Se atienden:
+
+  initialize, initialized, shutdown, exit
+  textDocument/didOpen, textDocument/didChange, textDocument/didClose
+
+y se publica textDocument/publishDiagnostics. La sincronización es
+incremental: cada didChange trae solo el rango editado, que se aplica a la
+SesionLexica del documento, así que solo se vuelven a tokenizar las líneas
+tocadas. Las etapas sintáctica y semántica dependen del documento completo
+y se corren sobre el índice por línea en un hilo aparte.
+
+Antirrebote: el análisis de un documento empieza ESPERA segundos después
+de su último cambio, así una ráfaga de teclas produce un solo análisis. Un
+cambio cancela el análisis en curso de ese documento (entre etapas, ver
+trabajo_segundo_plano) y un resultado que ya no corresponde a la última
+versión no se publica.
+
+Cada análisis publica dos veces. Apenas vence la espera salen los errores
+léxicos de la versión nueva junto con los sintácticos y semánticos del
+último análisis completo, movidos a la línea que ocupan ahora (los de las
+líneas que se partieron o se unieron se omiten). Cuando terminan las
+etapas sintáctica y semántica se publica el resultado completo.
+
+Las posiciones van en unidades UTF-16, como pide el protocolo. El código
+del diagnóstico es el de diagnosticos.CATALOGO.
+
+Uso:
+    python servidor_lsp.py [--espera S]
+"""
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+import traceback
+from itertools import chain
+
+from analizador import AnalizadorLexico
+from diagnosticos import SEVERIDAD_ADVERTENCIA, SEVERIDAD_ERROR, Diagnostico
+from semantico import AnalizadorSemantico
+from sesion_lexica import SesionLexica
+from sintactico import AnalizadorSintactico
+from trabajo_segundo_plano import Cancelado, Tarea
+
+# Segundos sin cambios antes de analizar un documento
+ESPERA = 0.03
+
+NOMBRE_SERVIDOR = "analizador-pseint"
+
+# TextDocumentSyncKind.Incremental
+SINCRONIZACION_INCREMENTAL = 2
+
+# DiagnosticSeverity del protocolo
+SEVERIDADES = {SEVERIDAD_ERROR: 1, SEVERIDAD_ADVERTENCIA: 2}
+
+# Códigos de error de JSON-RPC y del protocolo
+SOLICITUD_INVALIDA = -32600
+METODO_NO_ENCONTRADO = -32601
+ERROR_INTERNO = -32603
+SERVIDOR_NO_INICIADO = -32002
+
+
+def leer_mensaje(entrada):
+    """Lee un mensaje de 'entrada' (binaria); None al terminar la entrada"""
+    longitud = None
+    while True:
+        cabecera = entrada.readline()
+        if not cabecera:
+            return None
+        cabecera = cabecera.strip()
+        if not cabecera:
+            if longitud is None:
+                # Cabecera sin Content-Length: no hay forma de saber dónde termina
+                continue
+            break
+        nombre, _, valor = cabecera.decode('ascii').partition(':')
+        if nombre.strip().lower() == 'content-length':
+            longitud = int(valor)
+    cuerpo = entrada.read(longitud)
+    if len(cuerpo) < longitud:
+        return None
+    return json.loads(cuerpo.decode('utf-8'))
+
+
+def escribir_mensaje(salida, mensaje):
+    """Escribe un mensaje con su cabecera en 'salida' (binaria)"""
+    cuerpo = json.dumps(mensaje, ensure_ascii=False).encode('utf-8')
+    salida.write(b"Content-Length: %d\r\n\r\n" % len(cuerpo) + cuerpo)
+    salida.flush()
+
+
+def indice_utf16(linea, unidades):
+    """Posición en el str de la línea que corresponde a 'unidades' UTF-16"""
+    if linea.isascii():
+        return min(unidades, len(linea))
+    contadas = 0
+    for indice, caracter in enumerate(linea):
+        if contadas >= unidades:
+            return indice
+        contadas += 2 if ord(caracter) > 0xFFFF else 1
+    return len(linea)
+
+
+def unidades_utf16(linea, indice):
+    """Inverso de indice_utf16"""
+    if linea.isascii():
+        return indice
+    return indice + sum(1 for caracter in linea[:indice] if ord(caracter) > 0xFFFF)
+
+
+def _posicion(sesion, posicion):
+    """(número de línea desde 1, índice en la línea) de una Position, ajustada al documento"""
+    numero = posicion["line"] + 1
+    if numero > sesion.cantidad_lineas:
+        numero = sesion.cantidad_lineas
+        return numero, len(sesion.linea(numero))
+    return numero, indice_utf16(sesion.linea(numero), posicion["character"])
+
+
+def aplicar_cambio(sesion, cambio):
+    """
+    Aplica un TextDocumentContentChangeEvent a la sesión léxica. Devuelve
+    (inicio, fin, cantidad): las líneas inicio..fin se reemplazaron por
+    'cantidad' líneas; None si se reemplazó el documento entero.
+    """
+    rango = cambio.get("range")
+    if rango is None:
+        sesion.actualizar(cambio["text"])
+        return None
+    linea_inicio, inicio = _posicion(sesion, rango["start"])
+    linea_fin, fin = _posicion(sesion, rango["end"])
+    texto = sesion.linea(linea_inicio)[:inicio] + cambio["text"] + sesion.linea(linea_fin)[fin:]
+    nuevas = texto.split('\n')
+    sesion.editar(linea_inicio, linea_fin, nuevas)
+    return linea_inicio, linea_fin, len(nuevas)
+
+
+def trasladar_linea(linea, ediciones):
+    """Número que tiene ahora la línea después de las ediciones; None si se partió o se unió con otra"""
+    for inicio, fin, cantidad in ediciones:
+        if linea > fin:
+            linea += cantidad - (fin - inicio + 1)
+        elif linea >= inicio and cantidad != fin - inicio + 1:
+            return None
+    return linea
+
+
+def diagnosticos_lsp(errores, sesion):
+    """Diagnostic del protocolo para cada error, con el rango calculado sobre la sesión"""
+    diagnosticos = []
+    # Siguiente columna donde buscar cada texto no reconocido, por línea
+    buscados = {}
+    for error in errores:
+        linea = sesion.linea(error.linea)
+        texto = error.parametros.get("texto") if error.codigo == "LEX001" else None
+        if error.columna is not None and texto:
+            inicio = error.columna - 1
+            fin = inicio + len(texto)
+        elif texto:
+            inicio = linea.find(texto, buscados.get((error.linea, texto), 0))
+            if inicio < 0:
+                inicio = linea.find(texto)
+            fin = inicio + len(texto)
+            buscados[(error.linea, texto)] = fin
+        else:
+            # Las fases sintáctica y semántica no conocen la columna: toda la línea
+            inicio = len(linea) - len(linea.lstrip())
+            fin = len(linea.rstrip())
+        numero = error.linea - 1
+        diagnosticos.append({
+            "range": {
+                "start": {"line": numero, "character": unidades_utf16(linea, inicio)},
+                "end": {"line": numero, "character": unidades_utf16(linea, fin)},
+            },
+            "severity": SEVERIDADES[error.severidad],
+            "code": error.codigo,
+            "source": NOMBRE_SERVIDOR,
+            "message": error.descripcion,
+        })
+    return diagnosticos
+
+
+class Documento:
+    __slots__ = ('uri', 'version', 'sesion', 'plazo', 'tarea', 'anteriores', 'ediciones')
+
+    def __init__(self, uri, version, sesion):
+        self.uri = uri
+        self.version = version
+        self.sesion = sesion
+        # Momento (time.monotonic) en que toca analizarlo; None si no hay cambios
+        self.plazo = None
+        # Análisis en curso
+        self.tarea = None
+        # Errores sintácticos y semánticos del último análisis completo y las
+        # ediciones (inicio, fin, cantidad) hechas después; None si no sirven
+        self.anteriores = None
+        self.ediciones = []
+
+    def trasladados(self):
+        """Los errores anteriores en la línea que ocupan ahora; None si no hay"""
+        if self.anteriores is None or not self.ediciones:
+            return None
+        errores = []
+        for error in self.anteriores:
+            linea = trasladar_linea(error.linea, self.ediciones)
+            if linea == error.linea:
+                errores.append(error)
+            elif linea is not None:
+                errores.append(Diagnostico(error.codigo, linea, error.parametros, error.columna))
+        return errores
+
+
+class ServidorLsp:
+    def __init__(self, entrada, salida, espera=ESPERA):
+        self.entrada = entrada
+        self.salida = salida
+        self.espera = espera
+        # uri -> Documento
+        self.documentos = {}
+        self.lexico = AnalizadorLexico()
+        # Los usa solo el hilo de análisis
+        self.sintactico = AnalizadorSintactico()
+        self.semantico = AnalizadorSemantico()
+        self.iniciado = False
+        self.apagado = False
+        self._terminar = False
+        # Protege los documentos; el hilo de los plazos espera en ella
+        self._condicion = threading.Condition()
+        self._escritura = threading.Lock()
+        # (documento, tarea, índice) que el hilo de los plazos le pasa al de análisis
+        self._pendientes = queue.Queue()
+        # Uno vigila los plazos y publica lo rápido; el otro corre las etapas
+        # largas, así una tecla nunca espera a que termine una etapa
+        self._hilos = (
+            threading.Thread(target=self._atender_plazos, name="plazos-lsp", daemon=True),
+            threading.Thread(target=self._analizar_pendientes, name="analisis-lsp", daemon=True),
+        )
+
+    def ejecutar(self):
+        """Atiende mensajes hasta 'exit' o el fin de la entrada; devuelve el código de salida"""
+        for hilo in self._hilos:
+            hilo.start()
+        while True:
+            mensaje = leer_mensaje(self.entrada)
+            if mensaje is None or mensaje.get("method") == "exit":
+                break
+            self.atender(mensaje)
+        with self._condicion:
+            self._terminar = True
+            self._condicion.notify()
+        self._pendientes.put(None)
+        # Sin 'shutdown' antes de 'exit' el protocolo pide salir con 1
+        return 0 if self.apagado else 1
+
+    def atender(self, mensaje):
+        metodo = mensaje.get("method")
+        if metodo is None:
+            # Respuesta a una solicitud nuestra: el servidor no hace ninguna
+            return
+        identificador = mensaje.get("id")
+        manejador = self.METODOS.get(metodo)
+
+        error = None
+        if not self.iniciado and metodo != "initialize":
+            error = (SERVIDOR_NO_INICIADO, "El servidor todavía no recibió 'initialize'")
+        elif self.apagado:
+            error = (SOLICITUD_INVALIDA, "El servidor ya recibió 'shutdown'")
+        elif manejador is None:
+            error = (METODO_NO_ENCONTRADO, f"Método no soportado: {metodo}")
+        if error is not None:
+            # A las notificaciones no se les responde, ni siquiera con error
+            if identificador is not None:
+                self._responder_error(identificador, *error)
+            return
+
+        try:
+            resultado = manejador(self, mensaje.get("params") or {})
+        except Exception as excepcion:
+            sys.stderr.write(traceback.format_exc())
+            if identificador is not None:
+                self._responder_error(identificador, ERROR_INTERNO, f"{type(excepcion).__name__}: {excepcion}")
+            return
+        if identificador is not None:
+            self._enviar({"jsonrpc": "2.0", "id": identificador, "result": resultado})
+
+    # --- Ciclo de vida ---
+
+    def _initialize(self, parametros):
+        self.iniciado = True
+        return {
+            "capabilities": {
+                "positionEncoding": "utf-16",
+                "textDocumentSync": {"openClose": True, "change": SINCRONIZACION_INCREMENTAL},
+            },
+            "serverInfo": {"name": NOMBRE_SERVIDOR},
+        }
+
+    def _initialized(self, parametros):
+        return None
+
+    def _shutdown(self, parametros):
+        self.apagado = True
+        return None
+
+    # --- Documentos ---
+
+    def _did_open(self, parametros):
+        documento = parametros["textDocument"]
+        with self._condicion:
+            self._cancelar(documento["uri"])
+            sesion = SesionLexica(self.lexico, documento["text"])
+            self.documentos[documento["uri"]] = Documento(documento["uri"], documento.get("version"), sesion)
+            self._programar(self.documentos[documento["uri"]], inmediato=True)
+
+    def _did_change(self, parametros):
+        identificador = parametros["textDocument"]
+        with self._condicion:
+            documento = self.documentos.get(identificador["uri"])
+            if documento is None:
+                return
+            if documento.tarea is not None:
+                documento.tarea.cancelar()
+            for cambio in parametros["contentChanges"]:
+                edicion = aplicar_cambio(documento.sesion, cambio)
+                if edicion is None:
+                    documento.anteriores = None
+                else:
+                    documento.ediciones.append(edicion)
+            documento.version = identificador.get("version")
+            self._programar(documento)
+
+    def _did_close(self, parametros):
+        uri = parametros["textDocument"]["uri"]
+        with self._condicion:
+            self._cancelar(uri)
+            if self.documentos.pop(uri, None) is not None:
+                # Los diagnósticos de un documento cerrado se borran del editor
+                self._publicar(uri, None, [])
+
+    METODOS = {
+        "initialize": _initialize,
+        "initialized": _initialized,
+        "shutdown": _shutdown,
+        "textDocument/didOpen": _did_open,
+        "textDocument/didChange": _did_change,
+        "textDocument/didClose": _did_close,
+    }
+
+    def _cancelar(self, uri):
+        documento = self.documentos.get(uri)
+        if documento is not None and documento.tarea is not None:
+            documento.tarea.cancelar()
+
+    def _programar(self, documento, inmediato=False):
+        """Pone (o corre) el plazo del análisis del documento; se llama con la condición tomada"""
+        documento.plazo = time.monotonic() + (0 if inmediato else self.espera)
+        self._condicion.notify()
+
+    # --- Hilos de análisis ---
+
+    def _siguiente(self):
+        """Espera el próximo documento cuyo plazo venció; None al terminar. Con la condición tomada."""
+        while not self._terminar:
+            ahora = time.monotonic()
+            plazos = [documento for documento in self.documentos.values() if documento.plazo is not None]
+            if plazos:
+                documento = min(plazos, key=lambda documento: documento.plazo)
+                if documento.plazo <= ahora:
+                    return documento
+                self._condicion.wait(documento.plazo - ahora)
+            else:
+                self._condicion.wait()
+        return None
+
+    def _atender_plazos(self):
+        while True:
+            with self._condicion:
+                documento = self._siguiente()
+                if documento is None:
+                    return
+                documento.plazo = None
+                if documento.tarea is not None:
+                    documento.tarea.cancelar()
+                tarea = documento.tarea = Tarea(documento.version, None)
+                lexicos = documento.sesion.errores()
+                # Lo que ya se sabe, antes de armar el índice para las etapas largas
+                trasladados = documento.trasladados()
+                if trasladados is not None:
+                    self._publicar(documento.uri, documento.version,
+                                   diagnosticos_lsp(chain(lexicos, trasladados), documento.sesion))
+                indice = documento.sesion.indice()
+            self._pendientes.put((documento, tarea, indice, lexicos))
+
+    def _analizar_pendientes(self):
+        while True:
+            pendiente = self._pendientes.get()
+            if pendiente is None:
+                return
+            documento, tarea, indice, lexicos = pendiente
+            try:
+                tarea.verificar()
+                sintacticos = self.sintactico.analizar(indice)
+                tarea.verificar()
+                semanticos, _ = self.semantico.analizar(indice)
+                tarea.verificar()
+            except Cancelado:
+                continue
+            except Exception:
+                # Un documento que rompe un analizador no detiene el servidor
+                sys.stderr.write(traceback.format_exc())
+                continue
+
+            with self._condicion:
+                # Si hubo un cambio mientras tanto la tarea quedó cancelada y
+                # el resultado es de una versión vieja: se publica el próximo
+                if tarea.cancelada or self.documentos.get(documento.uri) is not documento:
+                    continue
+                documento.tarea = None
+                documento.anteriores = sintacticos + semanticos
+                documento.ediciones = []
+                errores = chain(lexicos, sintacticos, semanticos)
+                self._publicar(documento.uri, documento.version, diagnosticos_lsp(errores, documento.sesion))
+
+    # --- Salida ---
+
+    def _publicar(self, uri, version, diagnosticos):
+        parametros = {"uri": uri, "diagnostics": diagnosticos}
+        if version is not None:
+            parametros["version"] = version
+        self._enviar({"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics", "params": parametros})
+
+    def _responder_error(self, identificador, codigo, mensaje):
+        self._enviar({"jsonrpc": "2.0", "id": identificador, "error": {"code": codigo, "message": mensaje}})
+
+    def _enviar(self, mensaje):
+        with self._escritura:
+            escribir_mensaje(self.salida, mensaje)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Servidor LSP de diagnósticos PSeInt sobre stdio")
+    parser.add_argument("--espera", type=float, default=ESPERA,
+                        help="Segundos sin cambios antes de analizar un documento (antirrebote)")
+    parser.add_argument("--stdio", action="store_true", help="Se acepta por compatibilidad; stdio es el único transporte")
+    args = parser.parse_args(argumentos)
+    return ServidorLsp(sys.stdin.buffer, sys.stdout.buffer, args.espera).ejecutar()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
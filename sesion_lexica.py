@@ -0,0 +1,161 @@
+"""
+Análisis léxico incremental.
+
+Una cadena nunca continúa en la línea siguiente, así que cada línea se
+puede analizar por separado. La sesión guarda el resultado de cada línea
+y, ante una edición, vuelve a analizar solo las líneas que cambiaron y
+corre los números de línea de las que quedaron después.
+
+Los tokens ya entregados (en un IndiceLineas o en un resultado que la
+interfaz sigue mostrando) nunca se modifican: las líneas que se corren
+reciben copias de sus tokens con el número nuevo.
+
+Todas las líneas comparten el PoolSimbolos de la sesión, así que un nombre
+conserva su id de símbolo entre ediciones. El pool solo crece: se renueva
+al cargar otro documento, cuando una actualización reemplaza la mayor
+parte del contenido y cuando los nombres que ya no aparecen pasan a ser
+la mayoría (el semántico dimensiona sus arreglos por el largo del pool).
+"""
+from itertools import chain, compress, count
+from operator import ne
+
+from analizador import AnalizadorLexico
+from tokens_pseint import IndiceLineas, PoolSimbolos
+
+# Ids que puede tener el pool además del doble de los tokens vivos antes de renovarlo
+_HOLGURA_POOL = 256
+
+
+class SesionLexica:
+    def __init__(self, analizador=None, contenido=""):
+        self.analizador = analizador or AnalizadorLexico()
+        self._texto = None
+        self._lineas = []
+        self._tokens = []
+        self._errores = []
+        self.simbolos = PoolSimbolos()
+        self.lineas_reanalizadas = 0
+        self.cargar(contenido)
+
+    def cargar(self, contenido):
+        """Analiza el documento completo"""
+        self._texto = contenido
+        self._lineas = contenido.split('\n')
+        self._tokens = []
+        self._errores = []
+        self.simbolos = PoolSimbolos()
+        for num_linea, linea in enumerate(self._lineas, 1):
+            tokens, errores = self._analizar(linea, num_linea)
+            self._tokens.append(tokens)
+            self._errores.append(errores)
+        self.lineas_reanalizadas = len(self._lineas)
+
+    def editar(self, inicio, fin, nuevas_lineas):
+        """
+        Reemplaza las líneas inicio..fin (numeradas desde 1, ambas incluidas)
+        por nuevas_lineas. Para insertar sin borrar se usa fin = inicio - 1.
+        """
+        if not 1 <= inicio <= len(self._lineas) + 1 or not inicio - 1 <= fin <= len(self._lineas):
+            raise ValueError(f"Rango de líneas inválido: {inicio}..{fin}")
+
+        nuevas_lineas = list(nuevas_lineas)
+        ids_antes = len(self.simbolos)
+        tokens = []
+        errores = []
+        for desplazamiento, linea in enumerate(nuevas_lineas):
+            tokens_linea, errores_linea = self._analizar(linea, inicio + desplazamiento)
+            tokens.append(tokens_linea)
+            errores.append(errores_linea)
+
+        self._lineas[inicio - 1:fin] = nuevas_lineas
+        self._tokens[inicio - 1:fin] = tokens
+        self._errores[inicio - 1:fin] = errores
+        self._texto = None
+        self.lineas_reanalizadas = len(nuevas_lineas)
+
+        diferencia = len(nuevas_lineas) - (fin - inicio + 1)
+        if diferencia:
+            self._renumerar(inicio - 1 + len(nuevas_lineas))
+
+        if len(self.simbolos) > ids_antes:
+            self._acotar_pool()
+
+    def _acotar_pool(self):
+        """Vuelve a cargar el documento si el pool quedó lleno de nombres que ya no aparecen"""
+        # Cada token vivo aporta a lo sumo un id: el conteo de tokens es una cota de los ids en uso
+        vivos = sum(map(len, self._tokens))
+        if len(self.simbolos) > 2 * vivos + _HOLGURA_POOL:
+            lineas_reanalizadas = self.lineas_reanalizadas
+            self.cargar(self.contenido)
+            self.lineas_reanalizadas += lineas_reanalizadas
+
+    def actualizar(self, contenido):
+        """
+        Compara el contenido nuevo con el actual y vuelve a analizar solo el
+        bloque de líneas que cambió.
+        """
+        if contenido is self._texto or contenido == self._texto:
+            self.lineas_reanalizadas = 0
+            return
+
+        nuevas = contenido.split('\n')
+        viejas = self._lineas
+
+        # Prefijo y sufijo comunes; compress/map recorren las listas en C
+        limite = min(len(viejas), len(nuevas))
+        prefijo = next(compress(count(), map(ne, viejas, nuevas)), limite)
+        sufijo = next(compress(count(), map(ne, reversed(viejas), reversed(nuevas))), limite)
+        sufijo = min(sufijo, limite - prefijo)
+
+        # Si cambió la mayor parte (otro documento), se carga de cero con un pool nuevo
+        if 2 * (len(viejas) - prefijo - sufijo) > len(viejas):
+            self.cargar(contenido)
+            return
+
+        self.editar(prefijo + 1, len(viejas) - sufijo, nuevas[prefijo:len(nuevas) - sufijo])
+        self._texto = contenido
+
+    def _renumerar(self, desde):
+        """Corre el número de línea de los tokens a partir del índice 'desde', con tokens nuevos"""
+        tokens = self._tokens
+        for indice in range(desde, len(tokens)):
+            num_linea = indice + 1
+            if self._errores[indice]:
+                # Los mensajes de error llevan el número de línea: se rehace la línea
+                tokens[indice], self._errores[indice] = self._analizar(self._lineas[indice], num_linea)
+            elif tokens[indice]:
+                tokens[indice] = [tok.copiar(num_linea) for tok in tokens[indice]]
+
+    def _analizar(self, linea, num_linea):
+        linea = linea.strip()
+        if not linea:
+            return [], []
+        return self.analizador.analizar_linea(linea, num_linea, self.simbolos)
+
+    def linea(self, num_linea):
+        """Texto de la línea num_linea (desde 1)"""
+        return self._lineas[num_linea - 1]
+
+    @property
+    def cantidad_lineas(self):
+        return len(self._lineas)
+
+    @property
+    def contenido(self):
+        if self._texto is None:
+            self._texto = '\n'.join(self._lineas)
+        return self._texto
+
+    def tokens(self):
+        return list(chain.from_iterable(self._tokens))
+
+    def errores(self):
+        return list(chain.from_iterable(self._errores))
+
+    def indice(self):
+        """Tokens agrupados por línea para las etapas siguientes"""
+        return IndiceLineas.desde_lineas(self._tokens, self.simbolos)
+
+    def analizar(self):
+        """Mismo resultado que AnalizadorLexico.analizar_archivo sobre el contenido actual"""
+        return self.tokens(), self.errores()
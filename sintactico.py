@@ -1,240 +1,257 @@
-import re
+from arbol_sintactico import Bloque, Definicion, Dimension, Instruccion, Programa
+from diagnosticos import diagnostico
+from reportes import a_texto, escribir_reporte_sintactico
+from tokens_pseint import (
+    CLASE_IDENTIFICADOR, NOMBRES_PALABRA, PALABRAS_RESERVADAS, TIPOS_DATO,
+    PAL_ALGORITMO, PAL_COMO, PAL_DEFINIR, PAL_DIMENSION, PAL_FINALGORITMO,
+    PAL_FINFUNCION, PAL_FINMIENTRAS, PAL_FINPARA, PAL_FINPROCESO, PAL_FINSEGUN,
+    PAL_FINSI, PAL_FINSUBPROCESO, PAL_FUNCION, PAL_HACER, PAL_HASTA,
+    PAL_MIENTRAS, PAL_NINGUNA, PAL_PARA, PAL_PROCESO, PAL_REPETIR, PAL_SEGUN,
+    PAL_SI, PAL_SINO, PAL_SUBPROCESO,
+    asegurar_indice,
+)
+
+# Estructuras de control que abren bloque y el cierre que corresponde a cada una
+APERTURAS = frozenset({PAL_ALGORITMO, PAL_PROCESO, PAL_SUBPROCESO, PAL_FUNCION,
+                       PAL_SI, PAL_MIENTRAS, PAL_SEGUN, PAL_REPETIR, PAL_PARA})
+CIERRES = frozenset({PAL_FINALGORITMO, PAL_FINPROCESO, PAL_FINSUBPROCESO, PAL_FINFUNCION,
+                     PAL_FINSI, PAL_FINPARA, PAL_FINMIENTRAS, PAL_FINSEGUN})
+CORRESPONDENCIAS = {
+    PAL_ALGORITMO: PAL_FINALGORITMO,
+    PAL_PROCESO: PAL_FINPROCESO,
+    PAL_SUBPROCESO: PAL_FINSUBPROCESO,
+    PAL_FUNCION: PAL_FINFUNCION,
+    PAL_SI: PAL_FINSI,
+    PAL_PARA: PAL_FINPARA,
+    PAL_MIENTRAS: PAL_FINMIENTRAS,
+    PAL_SEGUN: PAL_FINSEGUN,
+    PAL_REPETIR: PAL_HASTA,
+}
 
 class AnalizadorSintactico:
+    """
+    Analizador descendente de una sola pasada. Recorre las líneas en orden,
+    abre un Bloque con cada estructura y lo cierra con su Fin (o Hasta, en
+    Repetir). La pila de bloques abiertos reemplaza a la recursión para que
+    un anidamiento muy profundo no agote la pila de Python. Cada token se
+    mira una sola vez y Definir se revisa solo dentro de su línea, así que
+    el tiempo es lineal en la cantidad de tokens.
+    """
     def __init__(self):
-        self.variables = set()
+        # variables[simbolo] es 1 si la variable con ese id de símbolo aparece en un Definir
+        self.variables = bytearray()
         self.errores = []
-        self.palabras_reservadas_pseint = {
-            'algoritmo', 'finalgoritmo', 'proceso', 'finproceso',
-            'definir', 'como', 'entero', 'real', 'caracter', 'logico',
-            'escribir', 'leer', 'si', 'entonces', 'sino', 'finsi',
-            'para', 'hasta', 'con', 'paso', 'hacer', 'finpara',
-            'mientras', 'finmientras', 'repetir',
-            'segun', 'de', 'otro', 'finsegun',
-            'dimension', 'verdadero', 'falso'
-        }
+        self.palabras_reservadas_pseint = PALABRAS_RESERVADAS
         self.tokens_completos = []
+        self.arbol = None
+        # Perfil opcional (ver perfil.py) donde se miden las pasadas
+        self.perfil = None
 
     def analizar(self, tokens):
+        """Recibe el IndiceLineas del léxico (o una lista plana de tokens)"""
+        indice = asegurar_indice(tokens)
+        tokens = indice.agrupados
         self.errores = []
-        self.variables = set()
-        self.tokens_completos = tokens
+        self.variables = bytearray(len(indice.simbolos))
+        self.tokens_completos = indice.tokens
+        self.arbol = programa = Programa(tokens)
         pila_parentesis = []
         pila_corchetes = []
         pila_cadenas = []
-        estructuras_abiertas = []
-
-        # Agrupar tokens por línea
-        lineas_tokens = {}
-        for token, tipo, linea in tokens:
-            if linea not in lineas_tokens:
-                lineas_tokens[linea] = []
-            lineas_tokens[linea].append((token, tipo, linea))
-
-        # Verificar tokens individuales
-        for i, (token, tipo, linea) in enumerate(tokens):
-            token_lower = token.lower()
-
-            # --- Verificar signos de apertura/cierre ---
-            if token == "(":
-                pila_parentesis.append((linea, i))
-            elif token == ")":
-                if not pila_parentesis:
-                    self.errores.append(f"Línea {linea}: ')' sin apertura previa")
-                else:
-                    pila_parentesis.pop()
+        abiertos = []
+        cuerpo = programa.cuerpo
+        perfil = self.perfil
+        marca = perfil.reloj() if perfil is not None else 0.0
 
-            elif token == "[":
-                pila_corchetes.append((linea, i))
-            elif token == "]":
-                if not pila_corchetes:
-                    self.errores.append(f"Línea {linea}: ']' sin apertura previa")
-                else:
-                    pila_corchetes.pop()
-
-            # --- Verificar cadenas ---
-            elif token.startswith('"') and token.endswith('"'):
-                continue  # Cadena completa
-            elif token.startswith('"') and not token.endswith('"'):
-                pila_cadenas.append(linea)
-            elif token.endswith('"') and not token.startswith('"'):
-                if not pila_cadenas:
-                    self.errores.append(f"Línea {linea}: cierre de cadena sin apertura previa")
-                else:
-                    pila_cadenas.pop()
+        for numero_linea, inicio, fin in indice.rangos():
+            definiciones = []
 
-            # --- Reservadas usadas como variables ---
-            if tipo == "Identificador" and token_lower in self.palabras_reservadas_pseint:
-                self.errores.append(f"Línea {linea}: '{token}' es palabra reservada, no puede usarse como identificador")
+            # Verificar tokens individuales
+            for i in range(inicio, fin):
+                tok = tokens[i]
+                token = tok.texto
 
-            # --- Verificar declaraciones ---
-            if token_lower == "definir":
-                self._verificar_definicion_pseint(tokens, i, linea)
+                # --- Verificar signos de apertura/cierre ---
+                if token == "(":
+                    pila_parentesis.append((numero_linea, i))
+                elif token == ")":
+                    if not pila_parentesis:
+                        self.errores.append(diagnostico("SIN001", numero_linea, simbolo=")"))
+                    else:
+                        pila_parentesis.pop()
 
-        # Analizar estructuras por líneas
-        self._verificar_estructuras_pseint(lineas_tokens, estructuras_abiertas)
+                elif token == "[":
+                    pila_corchetes.append((numero_linea, i))
+                elif token == "]":
+                    if not pila_corchetes:
+                        self.errores.append(diagnostico("SIN001", numero_linea, simbolo="]"))
+                    else:
+                        pila_corchetes.pop()
 
-        # --- Validar cierres finales ---
-        self._validar_cierres_finales(pila_parentesis, pila_corchetes, pila_cadenas, estructuras_abiertas)
-        return self.errores
+                # --- Verificar cadenas ---
+                elif token.startswith('"') and token.endswith('"'):
+                    continue  # Cadena completa
+                elif token.startswith('"') and not token.endswith('"'):
+                    pila_cadenas.append(numero_linea)
+                elif token.endswith('"') and not token.startswith('"'):
+                    if not pila_cadenas:
+                        self.errores.append(diagnostico("SIN002", numero_linea))
+                    else:
+                        pila_cadenas.pop()
+
+                # --- Reservadas usadas como variables ---
+                if tok.clase == CLASE_IDENTIFICADOR and tok.palabra in PALABRAS_RESERVADAS:
+                    self.errores.append(diagnostico("SIN003", numero_linea, texto=token))
+
+                # --- Verificar declaraciones ---
+                if tok.palabra == PAL_DEFINIR:
+                    definiciones.append(self._verificar_definicion_pseint(tokens, i, fin, numero_linea))
+
+            # Estructura de la línea según su primera palabra
+            primero = tokens[inicio].palabra
 
-    def _verificar_estructuras_pseint(self, lineas_tokens, estructuras_abiertas):
-        """Analiza estructuras de control agrupadas por líneas"""
-        
-        for numero_linea in sorted(lineas_tokens.keys()):
-            tokens_linea = lineas_tokens[numero_linea]
-            if not tokens_linea:
-                continue
-                
-            token_primero = tokens_linea[0][0].lower()
-            
             # === ESTRUCTURAS DE APERTURA ===
-            if token_primero in ["algoritmo", "proceso", "si", "mientras", "segun", "repetir", "para"]:
-                estructuras_abiertas.append((token_primero, numero_linea))
-
-                # Validación específica para PARA - CORREGIDA
-                if token_primero == "para":
-                    # Convertir toda la línea a minúsculas para búsqueda
-                    tokens_texto = [tok[0].lower() for tok in tokens_linea]
-                    
-                    # Buscar '<' seguido de '-' como asignación (para tokenización separada)
-                    tiene_asignacion = False
-                    for i in range(len(tokens_texto) - 1):
-                        if tokens_texto[i] == '<' and tokens_texto[i + 1] == '-':
-                            tiene_asignacion = True
-                            break
-                    
-                    # También buscar si está unido en algún token
-                    if not tiene_asignacion:
-                        tiene_asignacion = any("<-" in token for token in tokens_texto)
-                    
-                    tiene_hasta = "hasta" in tokens_texto
-                    tiene_hacer = "hacer" in tokens_texto
-
-                    if not tiene_asignacion:
-                        self.errores.append(f"Línea {numero_linea}: estructura 'Para' incompleta, falta asignación (<-)")
-                    if not tiene_hasta:
-                        self.errores.append(f"Línea {numero_linea}: estructura 'Para' incompleta, falta 'Hasta'")
-                    if not tiene_hacer:
-                        self.errores.append(f"Línea {numero_linea}: estructura 'Para' incompleta, falta 'Hacer'")
-
-            # === ESTRUCTURAS DE CIERRE ===
-            elif token_primero in ["finalgoritmo", "finproceso", "finsi", "finpara", "finmientras", "finsegun"]:
-                if not estructuras_abiertas:
-                    self.errores.append(f"Línea {numero_linea}: '{token_primero}' sin estructura de apertura")
+            if primero in APERTURAS:
+                if primero == PAL_PARA:
+                    self._verificar_para_pseint(tokens, inicio, fin, numero_linea)
+                bloque = Bloque(primero, numero_linea, inicio, fin)
+                cuerpo.append(bloque)
+                abiertos.append(bloque)
+                cuerpo = bloque.cuerpo
+
+            # === ESTRUCTURAS DE CIERRE (Hasta cierra Repetir) ===
+            elif primero in CIERRES or (primero == PAL_HASTA and abiertos and abiertos[-1].palabra == PAL_REPETIR):
+                if not abiertos:
+                    self.errores.append(diagnostico("SIN004", numero_linea, palabra=NOMBRES_PALABRA[primero]))
                 else:
-                    ultima, linea_apertura = estructuras_abiertas[-1]
-                    correspondencias = {
-                        "algoritmo": "finalgoritmo",
-                        "proceso": "finproceso", 
-                        "si": "finsi",
-                        "para": "finpara",
-                        "mientras": "finmientras",
-                        "segun": "finsegun",
-                        "repetir": "hasta"
-                    }
-                    
-                    cierre_esperado = correspondencias.get(ultima)
-                    if cierre_esperado == token_primero:
-                        estructuras_abiertas.pop()
+                    ultimo = abiertos[-1]
+                    if CORRESPONDENCIAS[ultimo.palabra] == primero:
+                        ultimo.linea_cierre = numero_linea
+                        abiertos.pop()
+                        cuerpo = self._cuerpo_actual(programa, abiertos)
                     else:
-                        self.errores.append(f"Línea {numero_linea}: '{token_primero}' no corresponde con '{ultima}' de línea {linea_apertura}")
-
-            # === CASO ESPECIAL: HASTA (para REPETIR) ===
-            elif token_primero == "hasta":
-                # Buscar si hay una estructura repetir abierta
-                estructura_repetir = None
-                for i, (estruct, linea) in enumerate(estructuras_abiertas):
-                    if estruct == "repetir":
-                        estructura_repetir = (estruct, linea, i)
-                        break
-                
-                if estructura_repetir:
-                    estruct, linea_apertura, indice = estructura_repetir
-                    estructuras_abiertas.pop(indice)
-                else:
-                    # Verificar si este 'hasta' pertenece a un 'para'
-                    estructura_para = None
-                    for i, (estruct, linea) in enumerate(estructuras_abiertas):
-                        if estruct == "para":
-                            estructura_para = (estruct, linea, i)
-                            break
-                    
-                    if not estructura_para:
-                        self.errores.append(f"Línea {numero_linea}: 'Hasta' sin estructura 'Repetir' o 'Para' correspondiente")
-
-    def _verificar_definicion_pseint(self, tokens, i, linea):
-        """Verifica definición de variables en PSeInt"""
-        if i + 3 >= len(tokens):
-            self.errores.append(f"Línea {linea}: definición incompleta")
-            return
+                        self.errores.append(diagnostico("SIN005", numero_linea, palabra=NOMBRES_PALABRA[primero],
+                                                            apertura=NOMBRES_PALABRA[ultimo.palabra], linea_apertura=ultimo.linea))
+
+            # === HASTA fuera de Repetir (se acepta dentro de un Para) ===
+            elif primero == PAL_HASTA:
+                if not abiertos or abiertos[-1].palabra != PAL_PARA:
+                    self.errores.append(diagnostico("SIN006", numero_linea))
+                cuerpo.append(Instruccion(numero_linea, inicio, fin))
+
+            # === SINO: el resto del Si va a la rama alternativa ===
+            elif primero == PAL_SINO and abiertos and abiertos[-1].palabra == PAL_SI and abiertos[-1].sino is None:
+                abiertos[-1].sino = cuerpo = []
+
+            elif primero == PAL_DEFINIR:
+                pass  # la definición ya se agregó abajo
+            elif primero == PAL_DIMENSION:
+                cuerpo.append(Dimension(numero_linea, inicio, fin))
+            else:
+                cuerpo.append(Instruccion(numero_linea, inicio, fin))
+
+            cuerpo.extend(definiciones)
+
+        if perfil is not None:
+            marca = perfil.registrar("sintactico.lineas", marca)
+
+        # --- Validar cierres finales ---
+        self._validar_cierres_finales(pila_parentesis, pila_corchetes, pila_cadenas,
+                                      [(bloque.palabra, bloque.linea) for bloque in abiertos])
+        if perfil is not None:
+            perfil.registrar("sintactico.cierres", marca)
+        return self.errores
+
+    def _cuerpo_actual(self, programa, abiertos):
+        """Lista donde van las instrucciones según el bloque abierto más interno"""
+        if not abiertos:
+            return programa.cuerpo
+        bloque = abiertos[-1]
+        return bloque.cuerpo if bloque.sino is None else bloque.sino
+
+    def _verificar_para_pseint(self, tokens, inicio, fin, numero_linea):
+        """Valida que la línea de un Para tenga asignación, Hasta y Hacer"""
+        tokens_texto = [tok.texto for tok in tokens[inicio:fin]]
+
+        # Buscar '<' seguido de '-' como asignación (para tokenización separada)
+        tiene_asignacion = False
+        for i in range(len(tokens_texto) - 1):
+            if tokens_texto[i] == '<' and tokens_texto[i + 1] == '-':
+                tiene_asignacion = True
+                break
+
+        # También buscar si está unido en algún token
+        if not tiene_asignacion:
+            tiene_asignacion = any("<-" in token for token in tokens_texto)
+
+        palabras_linea = {tok.palabra for tok in tokens[inicio:fin]}
+        tiene_hasta = PAL_HASTA in palabras_linea
+        tiene_hacer = PAL_HACER in palabras_linea
+
+        if not tiene_asignacion:
+            self.errores.append(diagnostico("SIN007", numero_linea))
+        if not tiene_hasta:
+            self.errores.append(diagnostico("SIN008", numero_linea))
+        if not tiene_hacer:
+            self.errores.append(diagnostico("SIN009", numero_linea))
+
+    def _verificar_definicion_pseint(self, tokens, i, fin, linea):
+        """
+        Verifica definición de variables en PSeInt. La búsqueda de 'Como'
+        termina en 'fin', el final de la línea del Definir.
+        """
+        nodo = Definicion(linea, i, fin, [], PAL_NINGUNA)
+        if i + 3 >= fin:
+            self.errores.append(diagnostico("SIN010", linea))
+            return nodo
 
         i_var = i + 1
-        variables_encontradas = False
         
         # Buscar variables hasta encontrar "como"
-        while i_var < len(tokens) and tokens[i_var][0].lower() != "como":
-            if tokens[i_var][1] == "Identificador":
-                nombre_var = tokens[i_var][0]
+        while i_var < fin and tokens[i_var].palabra != PAL_COMO:
+            if tokens[i_var].clase == CLASE_IDENTIFICADOR:
+                nombre_var = tokens[i_var].texto
                 # Verificar que no sea palabra reservada
-                if nombre_var.lower() in self.palabras_reservadas_pseint:
-                    self.errores.append(f"Línea {linea}: '{nombre_var}' es palabra reservada, no puede usarse como nombre de variable")
+                if tokens[i_var].palabra in PALABRAS_RESERVADAS:
+                    self.errores.append(diagnostico("SIN011", linea, nombre=nombre_var))
                 else:
-                    self.variables.add(nombre_var)
-                    variables_encontradas = True
+                    self.variables[tokens[i_var].simbolo] = 1
+                    nodo.variables.append(nombre_var)
             i_var += 1
 
-        if not variables_encontradas:
-            self.errores.append(f"Línea {linea}: no se especificaron variables en definición")
-            return
+        if not nodo.variables:
+            self.errores.append(diagnostico("SIN012", linea))
+            return nodo
 
-        if i_var >= len(tokens) or tokens[i_var][0].lower() != "como":
-            self.errores.append(f"Línea {linea}: se esperaba 'Como' en definición")
-            return
+        if i_var >= fin:
+            self.errores.append(diagnostico("SIN013", linea))
+            return nodo
 
-        if i_var + 1 >= len(tokens):
-            self.errores.append(f"Línea {linea}: se esperaba tipo después de 'Como'")
-            return
+        if i_var + 1 >= fin:
+            self.errores.append(diagnostico("SIN014", linea))
+            return nodo
 
-        tipo = tokens[i_var + 1][0].capitalize()
-        tipos_validos = {"Entero", "Real", "Caracter", "Logico"}
-        if tipo not in tipos_validos:
-            self.errores.append(f"Línea {linea}: tipo no válido '{tipo}'")
+        nodo.tipo = tokens[i_var + 1].palabra
+        if nodo.tipo not in TIPOS_DATO:
+            tipo = tokens[i_var + 1].texto.capitalize()
+            self.errores.append(diagnostico("SIN015", linea, tipo=tipo))
+        return nodo
 
     def _validar_cierres_finales(self, pila_parentesis, pila_corchetes, pila_cadenas, estructuras_abiertas):
         """Valida cierres pendientes al final del análisis"""
         if pila_parentesis:
             for linea, _ in pila_parentesis:
-                self.errores.append(f"Línea {linea}: paréntesis '(' sin cerrar")
+                self.errores.append(diagnostico("SIN016", linea))
         if pila_corchetes:
             for linea, _ in pila_corchetes:
-                self.errores.append(f"Línea {linea}: corchete '[' sin cerrar")
+                self.errores.append(diagnostico("SIN017", linea))
         if pila_cadenas:
             for linea in pila_cadenas:
-                self.errores.append(f"Línea {linea}: cadena sin cerrar")
+                self.errores.append(diagnostico("SIN018", linea))
         if estructuras_abiertas:
             for estructura, linea in estructuras_abiertas:
-                self.errores.append(f"Línea {linea}: estructura '{estructura}' sin cerrar")
+                self.errores.append(diagnostico("SIN019", linea, palabra=NOMBRES_PALABRA[estructura]))
 
     def generar_reporte_sintactico(self):
         """Genera un reporte completo del análisis sintáctico"""
-        if not self.errores:
-            return "✓ ANÁLISIS SINTÁCTICO: Correcto - No se encontraron errores sintácticos"
-        
-        reporte = "❌ ERRORES SINTÁCTICOS:\n"
-        reporte += "----------------------\n"
-        for error in self.errores:
-            reporte += f"• {error}\n"
-        
-        reporte += f"\nTotal de errores sintácticos: {len(self.errores)}"
-        
-        # Resumen de verificaciones
-        reporte += "\n\nVERIFICACIONES REALIZADAS:\n"
-        reporte += "-------------------------\n"
-        reporte += "✓ Balanceo de paréntesis y corchetes\n"
-        reporte += "✓ Cierre de cadenas\n"
-        reporte += "✓ Estructuras de control (Si, Mientras, Para, Segun)\n"
-        reporte += "✓ Declaraciones de variables\n"
-        reporte += "✓ Uso de palabras reservadas\n"
-        
-        return reporte
\ No newline at end of file
+        return a_texto(escribir_reporte_sintactico, self.errores)
@@ -0,0 +1,133 @@
+"""
+Tabla de símbolos con ámbitos para el analizador semántico.
+
+Cada Algoritmo, Proceso, Funcion y SubProceso abre un ámbito hijo del
+ámbito en el que aparece. Además de los ámbitos, la tabla mantiene la pila
+de símbolos visibles de cada nombre: al entrar a un ámbito se apilan sus
+símbolos y al salir se desapilan. Así buscar un nombre es una sola
+consulta, sin recorrer la cadena de ámbitos.
+
+Los nombres se identifican por su clave, el id de símbolo que el léxico
+le dio en el PoolSimbolos del documento (token.simbolo). Las pilas están
+en una lista indexada por esa clave, del largo del pool: buscar no
+calcula ningún hash.
+"""
+from tokens_pseint import PAL_FUNCION, PAL_NINGUNA, PAL_SUBPROCESO
+
+# Ámbitos cuyas variables se muestran con el nombre calificado (funcion.variable)
+_AMBITOS_CALIFICADOS = frozenset({PAL_FUNCION, PAL_SUBPROCESO})
+
+
+class Simbolo:
+    __slots__ = ('clave', 'nombre', 'tipo', 'linea', 'usada', 'inicializada', 'es_arreglo', 'es_parametro', 'ambito')
+
+    def __init__(self, clave, nombre, tipo, linea, ambito, inicializada=False, es_arreglo=False, es_parametro=False):
+        self.clave = clave
+        self.nombre = nombre
+        self.tipo = tipo
+        self.linea = linea
+        self.usada = False
+        self.inicializada = inicializada
+        self.es_arreglo = es_arreglo
+        self.es_parametro = es_parametro
+        self.ambito = ambito
+
+    @property
+    def nombre_visible(self):
+        if self.ambito.palabra in _AMBITOS_CALIFICADOS:
+            return f"{self.ambito.nombre}.{self.nombre}"
+        return self.nombre
+
+    def __repr__(self):
+        return f"Simbolo({self.nombre_visible!r}, {self.tipo!r}, linea={self.linea})"
+
+
+class Ambito:
+    __slots__ = ('nombre', 'palabra', 'linea', 'padre', 'simbolos')
+
+    def __init__(self, nombre, palabra, linea, padre):
+        self.nombre = nombre
+        self.palabra = palabra
+        self.linea = linea
+        self.padre = padre
+        # clave -> Simbolo, en orden de declaración
+        self.simbolos = {}
+
+    def __repr__(self):
+        return f"Ambito({self.nombre!r}, linea={self.linea}, simbolos={len(self.simbolos)})"
+
+
+class TablaSimbolos:
+    def __init__(self, cantidad_claves=0):
+        """'cantidad_claves' es el largo del PoolSimbolos del documento"""
+        self.global_ = Ambito("global", PAL_NINGUNA, 0, None)
+        self.ambitos = [self.global_]
+        self._activos = [self.global_]
+        # _visibles[clave] es la pila de símbolos visibles con ese nombre, o None
+        self._visibles = [None] * cantidad_claves
+
+    @property
+    def actual(self):
+        return self._activos[-1]
+
+    def abrir(self, nombre, palabra, linea):
+        """Crea un ámbito hijo del actual y entra en él"""
+        ambito = Ambito(nombre, palabra, linea, self.actual)
+        self.ambitos.append(ambito)
+        self._activos.append(ambito)
+        return ambito
+
+    def entrar(self, ambito):
+        """Vuelve a entrar a un ámbito ya creado (en una pasada posterior)"""
+        self._activos.append(ambito)
+        visibles = self._visibles
+        for clave, simbolo in ambito.simbolos.items():
+            pila = visibles[clave]
+            if pila is None:
+                visibles[clave] = [simbolo]
+            else:
+                pila.append(simbolo)
+
+    def salir(self):
+        """Sale del ámbito actual; el global nunca se cierra"""
+        if len(self._activos) == 1:
+            return
+        ambito = self._activos.pop()
+        visibles = self._visibles
+        for clave in ambito.simbolos:
+            visibles[clave].pop()
+
+    def volver_al_global(self):
+        while len(self._activos) > 1:
+            self.salir()
+
+    def declarar(self, simbolo):
+        """Agrega el símbolo al ámbito actual (quien llama ya verificó que no exista ahí)"""
+        clave = simbolo.clave
+        self.actual.simbolos[clave] = simbolo
+        pila = self._visibles[clave]
+        if pila is None:
+            self._visibles[clave] = [simbolo]
+        else:
+            pila.append(simbolo)
+        return simbolo
+
+    def buscar(self, clave):
+        """Símbolo visible con esa clave desde el ámbito actual, o None"""
+        pila = self._visibles[clave]
+        return pila[-1] if pila else None
+
+    def buscar_local(self, clave):
+        """Símbolo con esa clave declarado en el ámbito actual, o None"""
+        return self.actual.simbolos.get(clave)
+
+    def simbolos(self):
+        """Todos los símbolos, ámbito por ámbito y en orden de declaración"""
+        for ambito in self.ambitos:
+            yield from ambito.simbolos.values()
+
+    def __len__(self):
+        return sum(len(ambito.simbolos) for ambito in self.ambitos)
+
+    def __bool__(self):
+        return any(ambito.simbolos for ambito in self.ambitos)
@@ -0,0 +1,100 @@
+"""
+Almacenamiento columnar de tokens.
+
+En lugar de una lista de objetos, cada atributo de los tokens vive en un
+array compacto. El texto se guarda una sola vez por valor distinto y cada
+token solo apunta a su índice.
+"""
+from array import array
+
+from tokens_pseint import Token
+
+
+class TablaTokens:
+    def __init__(self):
+        # Columnas paralelas: la posición i de cada array describe el token i
+        self.clases = array('B')
+        self.palabras = array('B')
+        self.lineas = array('I')
+        self.columnas = array('I')
+        self.inicios = array('Q')
+        self.fines = array('Q')
+        self.indices_texto = array('I')
+
+        # Textos internados
+        self.textos = []
+        self._indice_de_texto = {}
+
+        # _primer_token[n] es el índice del primer token de la línea n o posterior
+        self._primer_token = array('I', [0])
+
+    def agregar(self, texto, clase, linea, columna, inicio, fin, palabra):
+        """Agrega un token al final; las líneas deben llegar en orden"""
+        primer_token = self._primer_token
+        if linea >= len(primer_token):
+            total = len(self.clases)
+            primer_token.extend([total] * (linea + 1 - len(primer_token)))
+        elif linea < len(primer_token) - 1:
+            raise ValueError(f"Línea {linea} fuera de orden en la tabla de tokens")
+
+        indice = self._indice_de_texto.get(texto)
+        if indice is None:
+            indice = len(self.textos)
+            self.textos.append(texto)
+            self._indice_de_texto[texto] = indice
+
+        self.clases.append(clase)
+        self.palabras.append(palabra)
+        self.lineas.append(linea)
+        self.columnas.append(columna)
+        self.inicios.append(inicio)
+        self.fines.append(fin)
+        self.indices_texto.append(indice)
+
+    def __len__(self):
+        return len(self.clases)
+
+    def token(self, i):
+        """Token (compatible con la tupla (texto, tipo, linea)) de la posición i"""
+        return Token(self.textos[self.indices_texto[i]], self.clases[i], self.lineas[i], self.palabras[i])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.token(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("índice de token fuera de rango")
+        return self.token(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.token(i)
+
+    def rango_linea(self, num_linea):
+        """Índices [inicio, fin) de los tokens de una línea"""
+        primer_token = self._primer_token
+        total = len(self.clases)
+        if num_linea >= len(primer_token):
+            return total, total
+        fin = primer_token[num_linea + 1] if num_linea + 1 < len(primer_token) else total
+        return primer_token[num_linea], fin
+
+    def tokens_de_linea(self, num_linea):
+        inicio, fin = self.rango_linea(num_linea)
+        return [self.token(i) for i in range(inicio, fin)]
+
+    def numeros_de_linea(self):
+        """Números de las líneas que tienen tokens, en orden"""
+        primer_token = self._primer_token
+        total = len(self.clases)
+        for num_linea in range(1, len(primer_token)):
+            fin = primer_token[num_linea + 1] if num_linea + 1 < len(primer_token) else total
+            if fin > primer_token[num_linea]:
+                yield num_linea
+
+    def bytes_usados(self):
+        """Memoria de las columnas y del índice por línea (sin los textos internados)"""
+        columnas = (self.clases, self.palabras, self.lineas, self.columnas,
+                    self.inicios, self.fines, self.indices_texto, self._primer_token)
+        return sum(col.buffer_info()[1] * col.itemsize for col in columnas)
@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from analizador import AnalizadorLexico
+from main import DocumentoMapeado
+from tokens_pseint import PoolSimbolos, asegurar_indice
+
+# La línea con 'año' pasa por el camino de texto; las demás, por el de bytes
+PROGRAMA = """Algoritmo Prueba
+    Definir total, mi_valor Como Entero
+    Escribir "año ", total
+    total <- mi_valor + 1
+    Escribir total
+FinAlgoritmo
+"""
+
+
+class PruebaAnalizarMapeado(unittest.TestCase):
+    def setUp(self):
+        carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, carpeta, True)
+        ruta = os.path.join(carpeta, "programa.txt")
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(PROGRAMA)
+        self.documento = DocumentoMapeado(ruta)
+        self.addCleanup(self.documento.cerrar)
+
+    def test_ids_iguales_al_analisis_de_texto(self):
+        analizador = AnalizadorLexico()
+        mapeados, _ = analizador.analizar_mapeado(self.documento)
+        de_texto, _ = analizador.analizar_archivo(PROGRAMA)
+        self.assertEqual([(tok.texto, tok.simbolo) for tok in mapeados],
+                         [(tok.texto, tok.simbolo) for tok in de_texto])
+
+    def test_interna_en_el_pool(self):
+        simbolos = PoolSimbolos()
+        tokens, _ = AnalizadorLexico().analizar_mapeado(self.documento, simbolos)
+        for tok in tokens:
+            with self.subTest(texto=tok.texto, linea=tok.linea):
+                self.assertEqual(tok.simbolo, simbolos.id_de(tok.texto))
+        # El índice reutiliza los tokens: ya tienen sus ids
+        indice = asegurar_indice(tokens)
+        self.assertTrue(all(a is b for a, b in zip(indice.tokens, tokens)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from analizador import AnalizadorLexico
+from cache_resultados import ANTIGUEDAD_TEMPORALES, CacheResultados, analizar_contenido
+from semantico import AnalizadorSemantico
+from sintactico import AnalizadorSintactico
+
+PROGRAMA = """Algoritmo Prueba
+    Definir n Como Entero
+    n <- Doble(3)
+    Escribir n
+FinAlgoritmo
+
+Funcion r <- Doble(x)
+    Definir r Como Entero
+    r <- x * 2
+FinFuncion
+"""
+
+
+def analizar(contenido, cache):
+    return analizar_contenido(contenido, AnalizadorLexico(), AnalizadorSintactico(), AnalizadorSemantico(), cache)
+
+
+class PruebaCacheResultados(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.carpeta, True)
+
+    def _temporal(self, nombre, tamano, antiguedad):
+        ruta = os.path.join(self.carpeta, nombre)
+        with open(ruta, 'wb') as archivo:
+            archivo.write(b'x' * tamano)
+        momento = time.time() - antiguedad
+        os.utime(ruta, (momento, momento))
+        return ruta
+
+    def test_funciones_sale_de_la_cache(self):
+        cache = CacheResultados(self.carpeta)
+        analizado = analizar(PROGRAMA, cache)
+        guardado = analizar(PROGRAMA, cache)
+        self.assertTrue(guardado.desde_cache)
+        self.assertTrue(guardado.funciones)
+        self.assertEqual(guardado.funciones, analizado.funciones)
+
+    def test_desalojo_borra_temporales_viejos(self):
+        viejo = self._temporal("muerto.tmp", 10, ANTIGUEDAD_TEMPORALES + 60)
+        en_curso = self._temporal("en_curso.tmp", 10, 0)
+        cache = CacheResultados(self.carpeta, limite_bytes=1)
+        analizar(PROGRAMA, cache)
+        self.assertFalse(os.path.exists(viejo))
+        self.assertTrue(os.path.exists(en_curso))
+        self.assertEqual(cache.temporales_borrados, 1)
+
+    def test_desalojo_mide_lo_que_escriben_otros(self):
+        grande = "\n".join(f"Escribir {i}" for i in range(2000))
+        otro = CacheResultados(self.carpeta)
+        analizar(grande, otro)
+        tamano = sum(os.path.getsize(os.path.join(self.carpeta, nombre)) for nombre in os.listdir(self.carpeta))
+
+        # Este proceso no escribió lo del otro, pero el límite lo cuenta
+        cache = CacheResultados(self.carpeta, limite_bytes=tamano)
+        analizar(PROGRAMA, cache)
+        self.assertEqual(cache.desalojos, 1)
+        self.assertIsNone(CacheResultados(self.carpeta).obtener(grande))
+
+
+    def test_escritura_fallida_no_corta_el_analisis(self):
+        cache = CacheResultados(self.carpeta)
+        # La carpeta desaparece: mkstemp falla como en una de solo lectura
+        shutil.rmtree(self.carpeta)
+        resultado = analizar(PROGRAMA, cache)
+        self.assertFalse(resultado.desde_cache)
+        self.assertEqual(cache.escrituras, 0)
+        self.assertIsNone(cache.obtener(PROGRAMA))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+El núcleo del análisis no carga la interfaz y se importa dentro del
+presupuesto. Cada medición corre en un intérprete nuevo con -X importtime.
+"""
+import importlib.util
+import unittest
+
+from benchmark import MODULOS_INTERFAZ, MODULOS_NUCLEO, PRESUPUESTO_IMPORTACION, medir_importacion
+
+MODULOS_SIN_INTERFAZ = ("analizador", "sintactico", "semantico", "reportes")
+
+
+class PruebaImportacion(unittest.TestCase):
+    def test_sin_tkinter(self):
+        for modulo in MODULOS_SIN_INTERFAZ:
+            with self.subTest(modulo=modulo):
+                segundos, cargados = medir_importacion((modulo,))
+                self.assertIn(modulo, segundos)
+                for interfaz in MODULOS_INTERFAZ:
+                    self.assertNotIn(interfaz, cargados)
+
+    def test_nucleo_dentro_del_presupuesto(self):
+        # La menor de varias corridas: la primera puede pagar el disco frío
+        total = min(sum(medir_importacion(MODULOS_NUCLEO)[0].values()) for _ in range(3))
+        self.assertLessEqual(total, PRESUPUESTO_IMPORTACION,
+                             f"importar el núcleo tardó {total * 1000:.1f}ms")
+
+    @unittest.skipIf(importlib.util.find_spec("tkinter") is None, "tkinter no está instalado")
+    def test_detecta_tkinter(self):
+        # Comprueba que la medición ve lo que importa el módulo pedido
+        _, cargados = medir_importacion(("tkinter",))
+        self.assertIn("_tkinter", cargados)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import contextlib
+import io
+import os
+import unittest
+
+from lote import cantidad_trabajadores, main
+
+CARPETA_CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "txt de prueba")
+
+
+class PruebaTrabajadores(unittest.TestCase):
+    def test_rechaza_menos_de_uno(self):
+        for valor in ("-1", "0", "dos"):
+            with self.subTest(valor=valor):
+                with contextlib.redirect_stderr(io.StringIO()) as errores, self.assertRaises(SystemExit) as salida:
+                    main([CARPETA_CORPUS, "-j", valor])
+                self.assertEqual(salida.exception.code, 2)
+                self.assertIn("--trabajadores", errores.getvalue())
+
+    def test_resumen_con_los_trabajadores_usados(self):
+        ruta = os.path.join(CARPETA_CORPUS, "errores en semantico.txt")
+        with contextlib.redirect_stdout(io.StringIO()) as salida:
+            main([ruta, "-j", "4"])
+        self.assertIn("1 trabajador(es)", salida.getvalue())
+
+    def test_cantidad_trabajadores(self):
+        self.assertEqual(cantidad_trabajadores(3, 10), 3)
+        self.assertEqual(cantidad_trabajadores(3, 1), 1)
+        self.assertEqual(cantidad_trabajadores(None, 10), os.cpu_count() or 1)
+        with self.assertRaises(ValueError):
+            cantidad_trabajadores(-1, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
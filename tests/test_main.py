@@ -0,0 +1,28 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from main import manejo_de_archivos
+
+
+class PruebaLeerArchivo(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.carpeta, True)
+
+    def test_latin1_como_el_analisis(self):
+        ruta = os.path.join(self.carpeta, "latin1.txt")
+        with open(ruta, 'wb') as archivo:
+            archivo.write('Escribir "año"\n'.encode('latin-1'))
+        archivos = manejo_de_archivos()
+        self.assertEqual(archivos.leer_archivo(ruta), 'Escribir "año"\n')
+        self.assertEqual(archivos.contenido, 'Escribir "año"\n')
+
+    def test_error_de_lectura(self):
+        contenido = manejo_de_archivos().leer_archivo(os.path.join(self.carpeta, "no_existe.txt"))
+        self.assertTrue(contenido.startswith("Error al leer archivo: "))
+
+
+if __name__ == "__main__":
+    unittest.main()
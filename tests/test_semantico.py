@@ -0,0 +1,73 @@
+"""
+Resultados esperados del semántico sobre el corpus de 'txt de prueba'.
+
+Cada archivo del corpus tiene en tests/esperados/ un JSON con los
+diagnósticos (como eventos) y la tabla de símbolos. Si un cambio en el
+semántico cambia un resultado a propósito, se regeneran con:
+
+    python -m tests.test_semantico --regenerar
+"""
+import glob
+import json
+import os
+import sys
+import unittest
+
+from analizador import AnalizadorLexico
+from semantico import AnalizadorSemantico
+
+CARPETA_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CARPETA_CORPUS = os.path.join(CARPETA_RAIZ, "txt de prueba")
+CARPETA_ESPERADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "esperados")
+
+
+def rutas_corpus():
+    return sorted(glob.glob(os.path.join(CARPETA_CORPUS, "*.txt")))
+
+
+def ruta_esperado(ruta):
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    return os.path.join(CARPETA_ESPERADOS, f"semantico - {nombre}.json")
+
+
+def resultado_semantico(ruta):
+    """Diagnósticos y tabla de símbolos del archivo, en la forma en que se guardan"""
+    with open(ruta, 'r', encoding='utf-8') as archivo:
+        indice, _ = AnalizadorLexico().analizar_por_lineas(archivo.read())
+    errores, tabla_simbolos = AnalizadorSemantico().analizar(indice)
+    return {
+        "diagnosticos": [error.como_evento() for error in errores],
+        "tabla_simbolos": tabla_simbolos,
+    }
+
+
+def regenerar():
+    os.makedirs(CARPETA_ESPERADOS, exist_ok=True)
+    for ruta in rutas_corpus():
+        with open(ruta_esperado(ruta), 'w', encoding='utf-8') as archivo:
+            json.dump(resultado_semantico(ruta), archivo, ensure_ascii=False, indent=1)
+            archivo.write('\n')
+
+
+class PruebaSemantico(unittest.TestCase):
+    def test_corpus_igual_a_lo_esperado(self):
+        rutas = rutas_corpus()
+        self.assertTrue(rutas, "no se encontró el corpus de 'txt de prueba'")
+        for ruta in rutas:
+            with self.subTest(archivo=os.path.basename(ruta)):
+                with open(ruta_esperado(ruta), 'r', encoding='utf-8') as archivo:
+                    esperado = json.load(archivo)
+                self.assertEqual(resultado_semantico(ruta), esperado)
+
+    def test_analizar_dos_veces_da_lo_mismo(self):
+        with open(rutas_corpus()[0], 'r', encoding='utf-8') as archivo:
+            indice, _ = AnalizadorLexico().analizar_por_lineas(archivo.read())
+        semantico = AnalizadorSemantico()
+        self.assertEqual(semantico.analizar(indice), semantico.analizar(indice))
+
+
+if __name__ == "__main__":
+    if "--regenerar" in sys.argv:
+        regenerar()
+    else:
+        unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from sesion_lexica import SesionLexica
+
+PROGRAMA = """Algoritmo Prueba
+    Definir a, b Como Entero
+    a <- 1
+    b <- a + 2
+    Escribir a, b
+FinAlgoritmo"""
+
+
+def foto(indice):
+    """Lo que describe un índice: líneas, posiciones y (texto, clase, línea) de cada token"""
+    return (list(indice.numeros), list(indice.inicios),
+            [(tok.texto, tok.clase, tok.linea) for tok in indice.tokens])
+
+
+class PruebaSesionLexica(unittest.TestCase):
+    def test_indice_anterior_no_cambia_al_insertar_lineas(self):
+        sesion = SesionLexica(contenido=PROGRAMA)
+        indice = sesion.indice()
+        antes = foto(indice)
+
+        sesion.editar(2, 1, ["    // comentario", ""])
+
+        self.assertEqual(foto(indice), antes)
+        self.assertEqual([tok.linea for tok in sesion.indice().tokens if tok.texto == "FinAlgoritmo"], [8])
+
+    def test_indice_anterior_no_cambia_al_borrar_lineas(self):
+        sesion = SesionLexica(contenido=PROGRAMA)
+        indice = sesion.indice()
+        antes = foto(indice)
+
+        sesion.actualizar(PROGRAMA.replace("    a <- 1\n", ""))
+
+        self.assertEqual(foto(indice), antes)
+        self.assertEqual([tok.linea for tok in sesion.indice().tokens if tok.texto == "FinAlgoritmo"], [5])
+
+    def test_igual_que_analizar_de_nuevo(self):
+        sesion = SesionLexica(contenido=PROGRAMA)
+        sesion.editar(3, 3, ["    a <- 1", "    Leer b"])
+        nueva = SesionLexica(contenido=sesion.contenido)
+        self.assertEqual(foto(sesion.indice()), foto(nueva.indice()))
+        self.assertEqual(sesion.errores(), nueva.errores())
+
+
+    def test_pool_acotado_entre_documentos(self):
+        grande = "\n".join(f"nombre{n} <- {n}" for n in range(50000))
+        sesion = SesionLexica(contenido=grande)
+        self.assertGreater(len(sesion.simbolos), 50000)
+
+        sesion.actualizar(PROGRAMA)
+        self.assertLess(len(sesion.simbolos), 20)
+        self.assertEqual(foto(sesion.indice()), foto(SesionLexica(contenido=PROGRAMA).indice()))
+
+    def test_pool_acotado_con_ediciones(self):
+        # Una línea que cambia de nombre en cada edición deja ids muertos en el pool
+        sesion = SesionLexica(contenido=PROGRAMA)
+        for n in range(2000):
+            sesion.editar(3, 3, [f"    temporal{n} <- 1"])
+        vivos = len(sesion.tokens())
+        self.assertLessEqual(len(sesion.simbolos), 2 * vivos + 256 + 1)
+        nueva = SesionLexica(contenido=sesion.contenido)
+        self.assertEqual(foto(sesion.indice()), foto(nueva.indice()))
+
+
+if __name__ == "__main__":
+    unittest.main()
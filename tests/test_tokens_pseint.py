@@ -0,0 +1,56 @@
+import unittest
+
+from analizador import AnalizadorLexico
+from tokens_pseint import IndiceLineas, SIN_SIMBOLO, asegurar_indice
+
+PROGRAMA = """Algoritmo Prueba
+    Definir a, b Como Entero
+    a <- 1
+    b <- a + 2
+    Escribir b
+FinAlgoritmo
+"""
+
+
+def foto(tokens):
+    return [(tok.texto, tok.clase, tok.linea, tok.palabra, tok.simbolo) for tok in tokens]
+
+
+class PruebaIndiceSinPool(unittest.TestCase):
+    def test_no_modifica_los_tokens_recibidos(self):
+        tokens, _ = AnalizadorLexico().analizar_archivo(PROGRAMA)
+        # Tokens de otro documento: ids que no son los de este
+        for tok in tokens:
+            tok.simbolo = SIN_SIMBOLO
+        antes = foto(tokens)
+
+        indice = asegurar_indice(tokens)
+        self.assertEqual(foto(tokens), antes)
+        self.assertTrue(any(tok.simbolo != SIN_SIMBOLO for tok in indice.tokens))
+        for tok in indice.tokens:
+            if tok.simbolo != SIN_SIMBOLO:
+                self.assertEqual(indice.simbolos.textos[tok.simbolo], tok.texto)
+
+    def test_mismos_tokens_en_dos_documentos(self):
+        tokens, _ = AnalizadorLexico().analizar_archivo(PROGRAMA)
+        antes = foto(tokens)
+        # El segundo documento empieza con otro nombre: los ids cambian
+        otro = asegurar_indice(tokens[3:] + tokens[:3])
+        primero = asegurar_indice(tokens)
+        self.assertEqual(foto(tokens), antes)
+        self.assertEqual(foto(primero.tokens), antes)
+        self.assertNotEqual(foto(otro.tokens), foto(tokens[3:] + tokens[:3]))
+
+    def test_reutiliza_los_tokens_del_lexico(self):
+        tokens, _ = AnalizadorLexico().analizar_archivo(PROGRAMA)
+        indice = asegurar_indice(tokens)
+        self.assertTrue(all(a is b for a, b in zip(indice.tokens, tokens)))
+
+    def test_agrupados_sin_pool(self):
+        tokens, _ = AnalizadorLexico().analizar_archivo(PROGRAMA)
+        with self.assertRaises(ValueError):
+            IndiceLineas(tokens, [], [0], agrupados=tokens)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import vigilancia
+from vigilancia import SalidaTexto, Vigilante, vigilar
+
+
+class PruebaVigilancia(unittest.TestCase):
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.carpeta, True)
+        self.ruta = os.path.join(self.carpeta, "programa.txt")
+        with open(self.ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write("Algoritmo A\nFinAlgoritmo\n")
+
+    def test_reintentar_vuelve_a_dar_listo(self):
+        vigilante = Vigilante([self.carpeta], espera=1)
+        self.assertEqual(vigilante.revisar(ahora=0), ([], []))
+        self.assertEqual(vigilante.revisar(ahora=1)[0], [self.ruta])
+        # Ya se informó y la firma no cambió
+        self.assertEqual(vigilante.revisar(ahora=5)[0], [])
+
+        vigilante.reintentar(self.ruta, ahora=5)
+        self.assertEqual(vigilante.revisar(ahora=5.5)[0], [])
+        self.assertEqual(vigilante.revisar(ahora=6)[0], [self.ruta])
+
+    def test_lectura_fallida_no_pierde_el_cambio(self):
+        leer_texto = vigilancia.leer_texto
+        intentos = []
+
+        def leer_con_un_fallo(ruta):
+            intentos.append(ruta)
+            if len(intentos) == 1:
+                raise PermissionError(ruta)
+            return leer_texto(ruta)
+
+        revisiones = iter(range(200))
+        salida = io.StringIO()
+        with mock.patch.object(vigilancia, "leer_texto", leer_con_un_fallo):
+            vigilar([self.ruta], SalidaTexto(salida), intervalo=0.001, espera=0.005,
+                    continuar=lambda: next(revisiones, None) is not None and len(intentos) < 2)
+        self.assertEqual(len(intentos), 2)
+        self.assertIn(self.ruta, salida.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
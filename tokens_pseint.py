@@ -0,0 +1,428 @@
+"""
+Tabla compartida de clases de token y palabras clave de PSeInt.
+
+El analizador léxico asigna a cada token una clase entera y, si su texto
+es una palabra conocida, un identificador de palabra. Los analizadores
+sintáctico y semántico comparan esos enteros en lugar de llamar a
+.lower() y comparar cadenas.
+
+Además, cada palabra del documento (reservada o identificador) se interna
+en un PoolSimbolos: todas sus apariciones comparten una sola cadena y
+llevan el mismo id de símbolo, un entero denso que el semántico usa como
+posición en sus arreglos en lugar de buscar el nombre en diccionarios.
+"""
+import sys
+from array import array
+
+# ------------------------------------------------------------
+# CLASES DE TOKEN
+# ------------------------------------------------------------
+
+CLASE_COMENTARIO = 0
+CLASE_PALABRA_RESERVADA = 1
+CLASE_OPERADOR = 2
+CLASE_SIGNO = 3
+CLASE_NUMERO = 4
+CLASE_DECIMAL = 5
+CLASE_CADENA = 6
+CLASE_IDENTIFICADOR = 7
+CLASE_IDENTIFICADOR_SNAKE = 8
+CLASE_DESCONOCIDO = 9
+
+# Nombre visible de cada clase (el índice es la clase)
+NOMBRES_CLASE = (
+    "Comentario",
+    "Palabra Reservada",
+    "Operador",
+    "Signo",
+    "Número",
+    "Decimal",
+    "Cadena",
+    "Identificador",
+    "Identificador (snake_case)",
+    "DESCONOCIDO",
+)
+
+CLASE_POR_NOMBRE = {nombre: clase for clase, nombre in enumerate(NOMBRES_CLASE)}
+
+# ------------------------------------------------------------
+# PALABRAS CLAVE
+# ------------------------------------------------------------
+
+PAL_NINGUNA = 0
+
+# Palabras reservadas reconocidas por el analizador léxico
+PAL_ALGORITMO = 1
+PAL_FINALGORITMO = 2
+PAL_PROCESO = 3
+PAL_FINPROCESO = 4
+PAL_SUBPROCESO = 5
+PAL_FINSUBPROCESO = 6
+PAL_FUNCION = 7
+PAL_FINFUNCION = 8
+PAL_DEFINIR = 9
+PAL_COMO = 10
+PAL_ENTERO = 11
+PAL_REAL = 12
+PAL_CARACTER = 13
+PAL_LOGICO = 14
+PAL_ESCRIBIR = 15
+PAL_LEER = 16
+PAL_SI = 17
+PAL_ENTONCES = 18
+PAL_SINO = 19
+PAL_FINSI = 20
+PAL_PARA = 21
+PAL_HASTA = 22
+PAL_CON = 23
+PAL_PASO = 24
+PAL_HACER = 25
+PAL_FINPARA = 26
+PAL_MIENTRAS = 27
+PAL_FINMIENTRAS = 28
+PAL_REPETIR = 29
+PAL_SEGUN = 30
+PAL_DE = 31
+PAL_OTRO = 32
+PAL_FINSEGUN = 33
+PAL_DIMENSION = 34
+PAL_VERDADERO = 35
+PAL_FALSO = 36
+
+# Instrucciones que el léxico trata como identificadores
+PAL_ESPERAR = 37
+PAL_TECLA = 38
+PAL_RETORNAR = 39
+
+# Palabras de contexto y operadores lógicos escritos con letras
+PAL_MOSTRAR = 40
+PAL_MODO = 41
+PAL_Y = 42
+PAL_O = 43
+PAL_NO = 44
+
+# Escritura canónica de cada palabra (el índice es el identificador)
+ESCRITURAS = (
+    None,
+    'Algoritmo', 'FinAlgoritmo', 'Proceso', 'FinProceso',
+    'SubProceso', 'FinSubProceso', 'Funcion', 'FinFuncion',
+    'Definir', 'Como', 'Entero', 'Real', 'Caracter', 'Logico',
+    'Escribir', 'Leer', 'Si', 'Entonces', 'Sino', 'FinSi',
+    'Para', 'Hasta', 'Con', 'Paso', 'Hacer', 'FinPara',
+    'Mientras', 'FinMientras', 'Repetir',
+    'Segun', 'De', 'Otro', 'FinSegun',
+    'Dimension', 'Verdadero', 'Falso',
+    'Esperar', 'Tecla', 'Retornar',
+    'Mostrar', 'Modo', 'Y', 'O', 'NO',
+)
+
+# Búsqueda sin distinguir mayúsculas: texto en minúsculas -> identificador
+PALABRAS = {sys.intern(escritura.lower()): id_palabra
+            for id_palabra, escritura in enumerate(ESCRITURAS) if escritura}
+
+# Nombre en minúsculas de cada palabra, usado en los mensajes
+NOMBRES_PALABRA = tuple(escritura.lower() if escritura else '' for escritura in ESCRITURAS)
+
+PALABRAS_RESERVADAS = frozenset(range(PAL_ALGORITMO, PAL_FALSO + 1))
+INSTRUCCIONES_EXTRA = frozenset({PAL_ESPERAR, PAL_TECLA, PAL_RETORNAR})
+TIPOS_DATO = frozenset({PAL_ENTERO, PAL_REAL, PAL_CARACTER, PAL_LOGICO})
+OPERADORES_PALABRA = frozenset({PAL_Y, PAL_O, PAL_NO})
+
+# La misma tabla con claves en bytes, para analizar archivos mapeados
+PALABRAS_BYTES = {clave.encode('ascii'): id_palabra for clave, id_palabra in PALABRAS.items()}
+
+
+# ------------------------------------------------------------
+# SÍMBOLOS
+# ------------------------------------------------------------
+
+# Id de símbolo de los tokens que no son palabras
+SIN_SIMBOLO = 0
+
+# Clases cuyo texto se interna en el PoolSimbolos
+CLASES_CON_SIMBOLO = frozenset({CLASE_PALABRA_RESERVADA, CLASE_IDENTIFICADOR, CLASE_IDENTIFICADOR_SNAKE})
+
+
+def buscar_palabra(texto):
+    """Devuelve el identificador de la palabra (o PAL_NINGUNA) sin distinguir mayúsculas"""
+    return PALABRAS.get(texto.lower(), PAL_NINGUNA)
+
+
+# ------------------------------------------------------------
+# TOKEN
+# ------------------------------------------------------------
+
+class TokenBase:
+    """
+    Parte común de los tokens léxicos. Se comportan como la tupla
+    (texto, tipo, linea) que devolvía el analizador, y además llevan su
+    clase y su palabra.
+    """
+    __slots__ = ('clase', 'linea', 'palabra', 'simbolo')
+
+    @property
+    def tipo(self):
+        return NOMBRES_CLASE[self.clase]
+
+    def __iter__(self):
+        return iter((self.texto, NOMBRES_CLASE[self.clase], self.linea))
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, indice):
+        return (self.texto, NOMBRES_CLASE[self.clase], self.linea)[indice]
+
+    def __eq__(self, otro):
+        if isinstance(otro, TokenBase):
+            return (self.texto, self.clase, self.linea, self.palabra) == \
+                   (otro.texto, otro.clase, otro.linea, otro.palabra)
+        if isinstance(otro, tuple):
+            return tuple(self) == otro
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.texto!r}, {NOMBRES_CLASE[self.clase]!r}, {self.linea})"
+
+
+class Token(TokenBase):
+    """Token con su texto ya extraído de la línea"""
+    __slots__ = ('texto',)
+
+    def __init__(self, texto, clase, linea, palabra=PAL_NINGUNA, simbolo=SIN_SIMBOLO):
+        self.texto = texto
+        self.clase = clase
+        self.linea = linea
+        self.palabra = palabra
+        self.simbolo = simbolo
+
+    def copiar(self, linea=None, simbolo=None):
+        """Token igual a este con otra línea y otro id de símbolo, si se indican"""
+        return Token(self.texto, self.clase, self.linea if linea is None else linea, self.palabra,
+                     self.simbolo if simbolo is None else simbolo)
+
+
+class TokenMapeado(TokenBase):
+    """
+    Token de un archivo mapeado. Guarda columna y largo en bytes dentro de
+    su línea (enteros pequeños que Python comparte) y decodifica el texto
+    solo cuando se pide.
+    """
+    __slots__ = ('documento', 'columna', 'largo')
+
+    def __init__(self, documento, columna, largo, clase, linea, palabra=PAL_NINGUNA, simbolo=SIN_SIMBOLO):
+        self.documento = documento
+        self.columna = columna
+        self.largo = largo
+        self.clase = clase
+        self.linea = linea
+        self.palabra = palabra
+        self.simbolo = simbolo
+
+    def copiar(self, linea=None, simbolo=None):
+        """Token igual a este con otra línea y otro id de símbolo, si se indican"""
+        return TokenMapeado(self.documento, self.columna, self.largo, self.clase,
+                            self.linea if linea is None else linea, self.palabra,
+                            self.simbolo if simbolo is None else simbolo)
+
+    @property
+    def inicio(self):
+        return self.documento.inicio_linea(self.linea) + self.columna
+
+    @property
+    def fin(self):
+        return self.inicio + self.largo
+
+    @property
+    def texto(self):
+        inicio = self.inicio
+        return self.documento.decodificar(inicio, inicio + self.largo)
+
+
+def desde_tupla(token):
+    """Convierte una tupla (texto, tipo, linea) en Token"""
+    texto, tipo, linea = token
+    return Token(texto, CLASE_POR_NOMBRE.get(tipo, CLASE_DESCONOCIDO), linea, buscar_palabra(texto))
+
+
+def asegurar_tokens(tokens):
+    """Acepta tokens del analizador o tuplas (texto, tipo, linea) y devuelve Tokens"""
+    if isinstance(tokens, list) and (not tokens or isinstance(tokens[0], TokenBase)):
+        return tokens
+    return [t if isinstance(t, TokenBase) else desde_tupla(t) for t in tokens]
+
+
+# ------------------------------------------------------------
+# POOL DE SÍMBOLOS
+# ------------------------------------------------------------
+
+class PoolSimbolos:
+    """
+    Palabras de un documento internadas, con un id denso por texto
+    distinto (el 0 es SIN_SIMBOLO). Guarda también la clase y la palabra
+    de cada texto: el léxico clasifica cada nombre una sola vez y en las
+    apariciones siguientes solo hace una consulta al diccionario.
+
+    Los ids valen dentro del documento; el pool solo crece, así que una
+    sesión que se edita conserva los ids de las líneas que no cambiaron.
+    """
+    __slots__ = ('textos', 'clases', 'palabras', 'ids')
+
+    def __init__(self):
+        self.textos = [None]
+        self.clases = array('B', [CLASE_DESCONOCIDO])
+        self.palabras = array('B', [PAL_NINGUNA])
+        # texto -> id
+        self.ids = {}
+
+    @classmethod
+    def desde_columnas(cls, textos, clases, palabras):
+        """Rearma un pool guardado como sus tres columnas (con la posición 0 incluida)"""
+        pool = cls()
+        pool.textos = list(textos)
+        pool.clases = array('B', clases)
+        pool.palabras = array('B', palabras)
+        pool.ids = {texto: simbolo for simbolo, texto in enumerate(pool.textos) if simbolo}
+        return pool
+
+    def agregar(self, texto, clase, palabra):
+        """Id del texto; si es nuevo lo guarda con su clase y su palabra"""
+        simbolo = self.ids.get(texto)
+        if simbolo is None:
+            simbolo = self.ids[texto] = len(self.textos)
+            self.textos.append(texto)
+            self.clases.append(clase)
+            self.palabras.append(palabra)
+        return simbolo
+
+    def id_de(self, texto):
+        return self.ids.get(texto, SIN_SIMBOLO)
+
+    def numerados(self, tokens):
+        """
+        Tokens armados sin este pool, con los ids de este. No modifica los
+        recibidos (pueden estar en otro índice): copia los que tienen otro
+        id y reutiliza los que ya tienen el correcto, como los del léxico.
+        """
+        resultado = []
+        agregar = resultado.append
+        for tok in tokens:
+            if tok.clase in CLASES_CON_SIMBOLO:
+                simbolo = self.agregar(tok.texto, tok.clase, tok.palabra)
+            else:
+                simbolo = SIN_SIMBOLO
+            agregar(tok if tok.simbolo == simbolo else tok.copiar(simbolo=simbolo))
+        return resultado
+
+    def fusionar(self, otro):
+        """Agrega los símbolos de otro pool y devuelve la traducción de sus ids a los de este"""
+        traduccion = array('I', [SIN_SIMBOLO])
+        for simbolo in range(1, len(otro.textos)):
+            traduccion.append(self.agregar(otro.textos[simbolo], otro.clases[simbolo], otro.palabras[simbolo]))
+        return traduccion
+
+    def __len__(self):
+        """Cantidad de ids, contando SIN_SIMBOLO: el largo de un arreglo indexado por símbolo"""
+        return len(self.textos)
+
+
+# ------------------------------------------------------------
+# ÍNDICE POR LÍNEA
+# ------------------------------------------------------------
+
+class IndiceLineas:
+    """
+    Tokens agrupados por línea, en orden. Lo arma el analizador léxico una
+    sola vez y lo reciben las etapas siguientes en lugar de reagrupar la
+    lista plana. Al recorrerlo da (num_linea, tokens) por cada línea con
+    tokens.
+
+    Guarda la lista plana y dos arreglos (número de línea y posición donde
+    empieza cada línea) en vez de una lista por línea: con cientos de miles
+    de listas vivas el recolector de basura llegaba a duplicar el tiempo
+    del análisis léxico.
+
+    'simbolos' es el PoolSimbolos de los tokens. Si no se pasa, se arma uno
+    y el índice guarda copias numeradas de los tokens (los recibidos no se
+    tocan), así que siempre tiene sus ids. Con 'agrupados' el pool es
+    obligatorio: son los mismos tokens en otro orden.
+    """
+    __slots__ = ('tokens', 'numeros', 'inicios', 'agrupados', 'simbolos')
+
+    def __init__(self, tokens, numeros, inicios, agrupados=None, simbolos=None):
+        if simbolos is None:
+            if agrupados is not None:
+                raise ValueError("Un índice con 'agrupados' necesita el pool con que se numeraron sus tokens")
+            simbolos = PoolSimbolos()
+            tokens = simbolos.numerados(tokens)
+        # 'inicios' lleva un elemento más que 'numeros': el final de la última línea
+        self.tokens = tokens
+        self.numeros = numeros
+        self.inicios = inicios
+        # Tokens en orden de línea (la misma lista que 'tokens' si ya venían ordenados)
+        self.agrupados = tokens if agrupados is None else agrupados
+        self.simbolos = simbolos
+
+    @classmethod
+    def desde_lineas(cls, lineas, simbolos=None):
+        """
+        Arma el índice a partir de las listas de tokens de cada línea
+        (numeradas desde 1) y el pool con que se analizaron, si lo hay.
+        """
+        tokens = []
+        numeros = array('I')
+        inicios = array('I')
+        for num_linea, tokens_linea in enumerate(lineas, 1):
+            if tokens_linea:
+                numeros.append(num_linea)
+                inicios.append(len(tokens))
+                tokens.extend(tokens_linea)
+        inicios.append(len(tokens))
+        return cls(tokens, numeros, inicios, simbolos=simbolos)
+
+    @classmethod
+    def desde_tokens(cls, tokens, simbolos=None):
+        """
+        Agrupa una lista plana de tokens; no hace falta que vengan ordenados.
+        Sin el pool con que se analizaron, se numeran copias en orden de aparición.
+        """
+        if simbolos is None:
+            simbolos = PoolSimbolos()
+            tokens = simbolos.numerados(tokens)
+        agrupados = tokens
+        if any(a.linea > b.linea for a, b in zip(tokens, tokens[1:])):
+            agrupados = sorted(tokens, key=lambda tok: tok.linea)
+
+        numeros = array('I')
+        inicios = array('I')
+        anterior = None
+        for posicion, tok in enumerate(agrupados):
+            if tok.linea != anterior:
+                anterior = tok.linea
+                numeros.append(anterior)
+                inicios.append(posicion)
+        inicios.append(len(agrupados))
+        return cls(tokens, numeros, inicios, agrupados, simbolos)
+
+    def __iter__(self):
+        agrupados = self.agrupados
+        for num_linea, inicio, fin in self.rangos():
+            yield num_linea, agrupados[inicio:fin]
+
+    def rangos(self):
+        """Genera (num_linea, inicio, fin) con la posición de cada línea en 'agrupados'"""
+        inicios = self.inicios
+        return zip(self.numeros, inicios, inicios[1:])
+
+    def __len__(self):
+        return len(self.numeros)
+
+
+def asegurar_indice(tokens):
+    """Acepta un IndiceLineas o una lista de tokens/tuplas y devuelve el índice"""
+    if isinstance(tokens, IndiceLineas):
+        return tokens
+    return IndiceLineas.desde_tokens(asegurar_tokens(tokens))
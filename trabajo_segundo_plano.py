@@ -0,0 +1,103 @@
+"""
+Trabajos en un hilo aparte para que la interfaz no se congele.
+
+Un solo hilo atiende las tareas de una en una, así los analizadores y la
+sesión léxica que usa la función nunca se tocan desde dos hilos a la vez.
+Iniciar una tarea cancela la que esté en curso. La cancelación es
+cooperativa: la función llama a tarea.verificar() entre fases.
+
+El hilo no llama a tkinter: deja eventos (numero, tipo, dato) en una cola
+que la ventana vacía desde un after() con eventos().
+"""
+import queue
+import threading
+
+# Tipos de evento
+FASE = "fase"
+TERMINADO = "terminado"
+CANCELADO = "cancelado"
+ERROR = "error"
+
+
+class Cancelado(Exception):
+    """La tarea se canceló antes de terminar"""
+
+
+class Tarea:
+    __slots__ = ('numero', '_cancelada', '_eventos')
+
+    def __init__(self, numero, eventos):
+        self.numero = numero
+        self._cancelada = threading.Event()
+        self._eventos = eventos
+
+    def cancelar(self):
+        self._cancelada.set()
+
+    @property
+    def cancelada(self):
+        return self._cancelada.is_set()
+
+    def verificar(self):
+        """Corta la tarea con Cancelado si se pidió cancelarla"""
+        if self._cancelada.is_set():
+            raise Cancelado()
+
+    def avisar(self, fase):
+        """Informa a la ventana la fase que empieza"""
+        self._eventos.put((self.numero, FASE, fase))
+
+
+class TrabajadorSegundoPlano:
+    def __init__(self, funcion):
+        # funcion(dato, tarea) corre en el hilo y devuelve el resultado
+        self._funcion = funcion
+        self._pendientes = queue.Queue()
+        self._eventos = queue.Queue()
+        self._actual = None
+        self._numero = 0
+        self._hilo = threading.Thread(target=self._atender, name="trabajo-segundo-plano", daemon=True)
+        self._hilo.start()
+
+    def iniciar(self, dato):
+        """Encola una tarea nueva (cancelando la anterior) y devuelve su número"""
+        self.cancelar()
+        self._numero += 1
+        self._actual = Tarea(self._numero, self._eventos)
+        self._pendientes.put((self._actual, dato))
+        return self._numero
+
+    def cancelar(self):
+        if self._actual is not None:
+            self._actual.cancelar()
+
+    @property
+    def ocupado(self):
+        return self._actual is not None and not self._actual.cancelada
+
+    def eventos(self):
+        """Eventos acumulados desde la última llamada; no bloquea"""
+        eventos = []
+        while True:
+            try:
+                evento = self._eventos.get_nowait()
+            except queue.Empty:
+                break
+            numero, tipo, _ = evento
+            if tipo != FASE and self._actual is not None and numero == self._actual.numero:
+                self._actual = None
+            eventos.append(evento)
+        return eventos
+
+    def _atender(self):
+        while True:
+            tarea, dato = self._pendientes.get()
+            try:
+                tarea.verificar()
+                resultado = self._funcion(dato, tarea)
+            except Cancelado:
+                self._eventos.put((tarea.numero, CANCELADO, None))
+            except Exception as error:
+                self._eventos.put((tarea.numero, ERROR, f"{type(error).__name__}: {error}"))
+            else:
+                self._eventos.put((tarea.numero, TERMINADO, resultado))
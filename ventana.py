@@ -1,9 +1,32 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, messagebox, ttk
 from analizador import AnalizadorLexico
-from main import manejo_de_archivos
+from main import leer_texto, manejo_de_archivos
 from sintactico import AnalizadorSintactico
 from semantico import AnalizadorSemantico
+from sesion_lexica import SesionLexica
+from cache_resultados import CacheResultados, ResultadoAnalisis
+from trabajo_segundo_plano import CANCELADO, ERROR, FASE, TERMINADO, TrabajadorSegundoPlano
+from lista_virtual import ListaVirtual
+from vista_filas import FilasErrores, FilasTokens, VistaFilas
+from visor_fuente import VisorFuente
+from tokens_pseint import CLASE_DESCONOCIDO, NOMBRES_CLASE
+from reportes import a_texto, escribir_reporte, escribir_reporte_texto, formato_por_extension
+from perfil import Perfil
+from vigilancia import INTERVALO, Vigilante
+
+# Fases que informa el análisis en segundo plano, en orden
+FASES_ANALISIS = ("léxico", "sintáctico", "semántico", "resultados")
+
+TODOS_LOS_TIPOS = "Todos"
+
+VERIFICACIONES_SINTACTICAS = (
+    "VERIFICACIONES REALIZADAS:\n"
+    "• Llaves {}, paréntesis (), comillas \"\"\n"
+    "• Estructuras si, mientras, para\n"
+    "• Declaraciones de variables\n"
+    "• Puntos y coma"
+)
 
 class ventana_principal:
     def __init__(self):
@@ -15,6 +38,18 @@ class ventana_principal:
         self.ventana.configure(bg="")
         self.for_archivo = manejo_de_archivos()
         self.analizador = AnalizadorLexico()
+        # Guarda el análisis léxico por línea para no repetirlo tras cada edición
+        self.sesion_lexica = SesionLexica(self.analizador)
+        # Resultados guardados en disco por contenido; sin caché si la carpeta no se puede crear
+        try:
+            self.cache_resultados = CacheResultados()
+        except OSError:
+            self.cache_resultados = None
+        # El análisis corre en otro hilo; la ventana revisa sus eventos con after()
+        self.trabajador = TrabajadorSegundoPlano(self._analizar_en_segundo_plano)
+        self.tarea_analisis = None
+        # Revisa el archivo abierto y lo vuelve a analizar cuando cambia en disco
+        self.vigilante = None
 
         self.notebook = ttk.Notebook(self.ventana)
 
@@ -53,21 +88,18 @@ class ventana_principal:
 
         self.notebook.pack(expand=1, fill="both")
 
-        contenedor = tk.Frame(self.notbook_archivo, height=500, width=1000)
-        contenedor.pack(pady=65)
+        # Ir a una línea del archivo
+        barra_linea = tk.Frame(self.notbook_archivo, bg="LightBlue3")
+        barra_linea.pack(pady=(20, 0))
+        tk.Label(barra_linea, text="Ir a la línea:", font=("Arial", 12), bg="LightBlue3", fg="pink4").pack(side="left")
+        self.entrada_ir_linea = tk.Entry(barra_linea, width=8)
+        self.entrada_ir_linea.pack(side="left", padx=4)
+        self.entrada_ir_linea.bind("<Return>", lambda evento: self.ir_a_linea_ingresada())
+        tk.Button(barra_linea, text="Ir", command=lambda:self.ir_a_linea_ingresada()).pack(side="left")
 
-        scroll_y = tk.Scrollbar(contenedor, orient="vertical")
-        scroll_y.pack(side="right", fill="y")
-
-        self.canvas = tk.Canvas(contenedor, bg="Azure", yscrollcommand=scroll_y.set, width=1000, height=500, relief="solid")
-        self.canvas.pack(fill="both", expand=True)
-
-        scroll_y.config(command=self.canvas.yview)
-
-        def update_scrollregion(event=None):
-            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-
-        self.canvas.bind("<Configure>", update_scrollregion)
+        # Visor del archivo: solo dibuja las líneas visibles
+        self.visor = VisorFuente(self.notbook_archivo, ancho=1000, alto=500)
+        self.visor.pack(pady=(10, 20))
 
         # Pestaña Analizar txt - Organización vertical
         self.texto2 = tk.Label(self.notbook_analizar, text=f"Archivo seleccionado: Nada aun", font=("Arial", 14), bg="LightBlue3", fg="pink4")
@@ -82,6 +114,28 @@ class ventana_principal:
         self.boton_greporte = tk.Button(contenedor_botones, text="Generar Reporte", font=("Arial", 25, "bold"), fg="pink4", command=lambda:self.generar_reporte())
         self.boton_greporte.grid(row=0, column=1,padx=5, pady=5)
 
+        self.boton_cancelar = tk.Button(contenedor_botones, text="Cancelar", font=("Arial", 25, "bold"), fg="pink4", state="disabled", command=lambda:self.cancelar_analisis())
+        self.boton_cancelar.grid(row=0, column=2, padx=5, pady=5)
+
+        self.boton_exportar = tk.Button(contenedor_botones, text="Exportar Reporte", font=("Arial", 25, "bold"), fg="pink4", command=lambda:self.exportar_reporte())
+        self.boton_exportar.grid(row=0, column=3, padx=5, pady=5)
+
+        self.vigilar = tk.BooleanVar(value=False)
+        self.casilla_vigilar = tk.Checkbutton(contenedor_botones, text="Vigilar archivo (analizar al guardar)", variable=self.vigilar,
+                                              font=("Arial", 12), bg="LightBlue3", fg="pink4", command=lambda:self.alternar_vigilancia())
+        self.casilla_vigilar.grid(row=1, column=0, columnspan=4, pady=(0, 5))
+
+        # Progreso del análisis en curso, una fase a la vez
+        contenedor_progreso = tk.Frame(self.notbook_analizar, bg="LightBlue3")
+        contenedor_progreso.pack(pady=5)
+        self.barra_progreso = ttk.Progressbar(contenedor_progreso, orient="horizontal", length=400, mode="determinate", maximum=len(FASES_ANALISIS))
+        self.barra_progreso.grid(row=0, column=0, padx=5)
+        self.texto_progreso = tk.Label(contenedor_progreso, text="", font=("Arial", 12), bg="LightBlue3", fg="pink4")
+        self.texto_progreso.grid(row=0, column=1, padx=5)
+        # Tiempos por fase y tokens por segundo del último análisis
+        self.texto_perfil = tk.Label(contenedor_progreso, text="", font=("Arial", 10), bg="LightBlue3", fg="gray25")
+        self.texto_perfil.grid(row=1, column=0, columnspan=2, padx=5, sticky="w")
+
         # Contenedor principal con scroll para los 3 análisis
         contenedor_principal = tk.Frame(self.notbook_analizar, bg="LightBlue3")
         contenedor_principal.pack(fill="both", expand=True, padx=10, pady=10)
@@ -107,22 +161,40 @@ class ventana_principal:
         self.frame_analisis.bind("<Configure>", update_scrollregion_principal)
 
         # ========== ANÁLISIS LÉXICO ==========
+        # Los tokens y errores van en listas virtuales: solo se dibujan las filas visibles
         frame_lexico = tk.LabelFrame(self.frame_analisis, text="🔍 ANÁLISIS LÉXICO", font=("Arial", 12, "bold"), 
-                                   bg="lightcyan", fg="darkblue", relief="raised", bd=2, width=1100, height=200)
+                                   bg="lightcyan", fg="darkblue", relief="raised", bd=2, width=1100, height=280)
         frame_lexico.pack(fill="x", padx=10, pady=5)
         frame_lexico.pack_propagate(False)  # Evita que se reduzca el tamaño
 
+        barra_filtro = tk.Frame(frame_lexico, bg="lightcyan")
+        barra_filtro.pack(fill="x", padx=5, pady=2)
+
+        tk.Label(barra_filtro, text="Línea:", bg="lightcyan", font=("Arial", 10)).pack(side="left")
+        self.filtro_linea = tk.Entry(barra_filtro, width=8)
+        self.filtro_linea.pack(side="left", padx=4)
+        self.filtro_linea.bind("<Return>", lambda evento: self.aplicar_filtro())
+
+        tk.Label(barra_filtro, text="Tipo:", bg="lightcyan", font=("Arial", 10)).pack(side="left")
+        self.filtro_tipo = ttk.Combobox(barra_filtro, values=(TODOS_LOS_TIPOS,) + NOMBRES_CLASE[:CLASE_DESCONOCIDO], state="readonly", width=26)
+        self.filtro_tipo.set(TODOS_LOS_TIPOS)
+        self.filtro_tipo.pack(side="left", padx=4)
+        self.filtro_tipo.bind("<<ComboboxSelected>>", lambda evento: self.aplicar_filtro())
+
+        tk.Button(barra_filtro, text="Filtrar", command=lambda:self.aplicar_filtro()).pack(side="left", padx=4)
+        tk.Button(barra_filtro, text="Quitar filtro", command=lambda:self.quitar_filtro()).pack(side="left", padx=4)
+
+        self.resumen_lexico = tk.Label(barra_filtro, text="", bg="lightcyan", fg="darkblue", font=("Arial", 10, "bold"))
+        self.resumen_lexico.pack(side="right", padx=4)
+
         contenedor_lexico = tk.Frame(frame_lexico, bg="lightcyan")
         contenedor_lexico.pack(fill="both", expand=True, padx=5, pady=5)
 
-        scroll_y_lexico = tk.Scrollbar(contenedor_lexico, orient="vertical")
-        scroll_y_lexico.pack(side="right", fill="y")
-
-        self.texto_lexico = tk.Text(contenedor_lexico, bg="lightcyan", yscrollcommand=scroll_y_lexico.set, 
-                                   font=("Courier", 8), wrap="word", width=130, height=8)
-        self.texto_lexico.pack(fill="both", expand=True)
+        self.lista_tokens = ListaVirtual(contenedor_lexico, FilasTokens.columnas, (60, 260, 200), al_elegir=self.ir_a_fila, bg="lightcyan")
+        self.lista_tokens.pack(side="left", fill="both", expand=True)
 
-        scroll_y_lexico.config(command=self.texto_lexico.yview)
+        self.lista_errores_lexicos = ListaVirtual(contenedor_lexico, FilasErrores.columnas, (60, 380), al_elegir=self.ir_a_fila, bg="lightcyan")
+        self.lista_errores_lexicos.pack(side="left", fill="both", expand=True, padx=(5, 0))
 
         # ========== ANÁLISIS SINTÁCTICO ==========
         frame_sintactico = tk.LabelFrame(self.frame_analisis, text="📐 ANÁLISIS SINTÁCTICO", font=("Arial", 12, "bold"), 
@@ -130,17 +202,16 @@ class ventana_principal:
         frame_sintactico.pack(fill="x", padx=10, pady=5)
         frame_sintactico.pack_propagate(False)
 
+        self.resumen_sintactico = tk.Label(frame_sintactico, text="", bg="lightgreen", fg="darkgreen", font=("Arial", 10, "bold"), anchor="w")
+        self.resumen_sintactico.pack(fill="x", padx=5)
+
         contenedor_sintactico = tk.Frame(frame_sintactico, bg="lightgreen")
         contenedor_sintactico.pack(fill="both", expand=True, padx=5, pady=5)
 
-        scroll_y_sintactico = tk.Scrollbar(contenedor_sintactico, orient="vertical")
-        scroll_y_sintactico.pack(side="right", fill="y")
+        self.lista_errores_sintacticos = ListaVirtual(contenedor_sintactico, FilasErrores.columnas, (60, 700), al_elegir=self.ir_a_fila, bg="lightgreen")
+        self.lista_errores_sintacticos.pack(side="left", fill="both", expand=True)
 
-        self.texto_sintactico = tk.Text(contenedor_sintactico, bg="lightgreen", yscrollcommand=scroll_y_sintactico.set, 
-                                      font=("Courier", 8), wrap="word", width=130, height=8)
-        self.texto_sintactico.pack(fill="both", expand=True)
-
-        scroll_y_sintactico.config(command=self.texto_sintactico.yview)
+        tk.Label(contenedor_sintactico, text=VERIFICACIONES_SINTACTICAS, bg="lightgreen", font=("Courier", 8), justify="left").pack(side="left", padx=5, anchor="n")
 
         # ========== ANÁLISIS SEMÁNTICO ==========
         frame_semantico = tk.LabelFrame(self.frame_analisis, text="🎯 ANÁLISIS SEMÁNTICO", font=("Arial", 12, "bold"), 
@@ -148,18 +219,27 @@ class ventana_principal:
         frame_semantico.pack(fill="x", padx=10, pady=5)
         frame_semantico.pack_propagate(False)
 
+        self.resumen_semantico = tk.Label(frame_semantico, text="", bg="lightyellow", fg="darkred", font=("Arial", 10, "bold"), anchor="w")
+        self.resumen_semantico.pack(fill="x", padx=5)
+
         contenedor_semantico = tk.Frame(frame_semantico, bg="lightyellow")
         contenedor_semantico.pack(fill="both", expand=True, padx=5, pady=5)
 
+        self.lista_errores_semanticos = ListaVirtual(contenedor_semantico, FilasErrores.columnas, (60, 520), al_elegir=self.ir_a_fila, bg="lightyellow")
+        self.lista_errores_semanticos.pack(side="left", fill="both", expand=True)
+
+        # La tabla de símbolos es chica: sigue siendo texto
         scroll_y_semantico = tk.Scrollbar(contenedor_semantico, orient="vertical")
         scroll_y_semantico.pack(side="right", fill="y")
 
         self.texto_semantico = tk.Text(contenedor_semantico, bg="lightyellow", yscrollcommand=scroll_y_semantico.set, 
-                                     font=("Courier", 8), wrap="word", width=130, height=10)
-        self.texto_semantico.pack(fill="both", expand=True)
+                                     font=("Courier", 8), wrap="word", width=45, height=10)
+        self.texto_semantico.pack(side="right", fill="both")
 
         scroll_y_semantico.config(command=self.texto_semantico.yview)
 
+        self.listas_errores = (self.lista_errores_lexicos, self.lista_errores_sintacticos, self.lista_errores_semanticos)
+
         # Frame para Visualizar Tokens
         contenedor3 = tk.Frame(self.notbook_tokens, height=600, width=1100)
         contenedor3.pack(pady=20)
@@ -175,26 +255,24 @@ class ventana_principal:
         self.ventana.mainloop()
 
     def iniciar_archivo(self):
+        anterior = self.for_archivo.ruta_archivo
         archivo = self.for_archivo.seleccionar_archivo()
         
         if archivo != None:
             contenido = self.for_archivo.leer_archivo()
+            if archivo != anterior:
+                # Otro documento: sesión (y pool de símbolos) nueva. No se
+                # recarga la actual porque un análisis en curso puede estar
+                # usándola en el hilo de trabajo
+                self.sesion_lexica = SesionLexica(self.analizador)
             
-            # Limpiar canvas antes de agregar nuevo contenido
-            self.canvas.delete("all")
-            
-            # Mostrar contenido en el canvas
-            self.canvas.create_text(
-                10, 10,               
-                anchor="nw",           
-                text=contenido,               
-                font=("Arial", 12),   
-                width=950,            
-                fill="black",
-            )
+            # Mostrar contenido en el visor
+            self.visor.cargar(contenido)
             nombre_archivo = archivo.split('/')[-1]
             self.texto_name_txt.config(text=f"Archivo seleccionado: {nombre_archivo}")
             self.texto2.config(text=f"Archivo seleccionado: {nombre_archivo}")
+            if self.vigilar.get():
+                self.alternar_vigilancia()
 
     def abrir_editor(self):
         """
@@ -221,17 +299,11 @@ class ventana_principal:
 
         def guardar_cambios():
             nuevo_contenido = texto.get("1.0", tk.END).rstrip('\n')
+            # La sesión léxica la usa solo el hilo de análisis: las líneas
+            # cambiadas se vuelven a tokenizar en el próximo análisis
             self.for_archivo.contenido = nuevo_contenido
 
-            self.canvas.delete("all")
-            self.canvas.create_text(
-                10, 10,
-                anchor="nw",
-                text=nuevo_contenido,
-                font=("Arial", 12),
-                width=950,
-                fill="black",
-            )
+            self.visor.cargar(nuevo_contenido)
 
             nombre_archivo = (self.for_archivo.ruta_archivo.split('/')[-1]) if self.for_archivo.ruta_archivo else "Archivo editado (no guardado)"
             self.texto_name_txt.config(text=f"Archivo seleccionado: {nombre_archivo}")
@@ -260,100 +332,225 @@ class ventana_principal:
 
     def analizar_archivo(self):
         if self.for_archivo.contenido:
-            # Limpiar todos los textos antes de mostrar resultados
-            self.texto_lexico.delete(1.0, tk.END)
-            self.texto_sintactico.delete(1.0, tk.END)
+            # Limpiar todos los paneles antes de mostrar resultados
+            self.lista_tokens.mostrar(None)
+            for lista in self.listas_errores:
+                lista.mostrar(None)
             self.texto_semantico.delete(1.0, tk.END)
-            
-            # Ejecutar análisis
-            tokens, errores_lexicos = self.analizador.analizar_archivo(self.for_archivo.contenido)
-            errores_sintacticos = self.analizador_sintactico.analizar(tokens)
-            errores_semanticos, tabla_simbolos = self.analizador_semantico.analizar(tokens)
-            
-            # Mostrar en cada texto correspondiente
-            self._mostrar_analisis_lexico(tokens, errores_lexicos)
-            self._mostrar_analisis_sintactico(errores_sintacticos)
-            self._mostrar_analisis_semantico(errores_semanticos, tabla_simbolos)
-            
-            # Guardar datos para el reporte
-            self.tokens_analizados = tokens
-            self.errores_lexicos = errores_lexicos
-            self.errores_sintacticos = errores_sintacticos
-            self.errores_semanticos = errores_semanticos
-            self.tabla_simbolos = tabla_simbolos
-
-    def _mostrar_analisis_lexico(self, tokens, errores_lexicos):
-        """Muestra el análisis léxico en su texto"""
-        resultado = "TOKENS RECONOCIDOS:\n"
-        resultado += "=" * 20 + "\n\n"
-        
-        if errores_lexicos:
-            resultado += "❌ ERRORES LÉXICOS ENCONTRADOS:\n"
-            resultado += "-" * 28 + "\n"
-            for error in errores_lexicos:
-                resultado += f"• {error}\n"
-            resultado += f"\nTotal de errores: {len(errores_lexicos)}\n\n"
-        else:
-            resultado += "✅ No se encontraron errores léxicos\n\n"
-
-        resultado += "TOKENS POR LÍNEA:\n"
-        resultado += "-" * 15 + "\n"
-        
-        # Agrupar tokens por línea
-        tokens_por_linea = {}
-        for token, tipo, linea in tokens:
-            if linea not in tokens_por_linea:
-                tokens_por_linea[linea] = []
-            tokens_por_linea[linea].append((token, tipo))
-        
-        for linea in sorted(tokens_por_linea.keys()):
-            resultado += f"\nLínea {linea}:\n"
-            for token, tipo in tokens_por_linea[linea]:
-                resultado += f"   '{token}' → {tipo}\n"
-        
-        self.texto_lexico.insert(1.0, resultado)
-
-    def _mostrar_analisis_sintactico(self, errores_sintacticos):
-        """Muestra el análisis sintáctico en su texto"""
-        resultado = "ESTRUCTURA SINTÁCTICA:\n"
-        resultado += "=" * 25 + "\n\n"
-        
-        if errores_sintacticos:
-            resultado += "❌ ERRORES SINTÁCTICOS:\n"
-            resultado += "-" * 22 + "\n"
-            for error in errores_sintacticos:
-                resultado += f"• {error}\n"
-            resultado += f"\nTotal de errores: {len(errores_sintacticos)}\n"
-        else:
-            resultado += "✅ Estructura sintáctica correcta\n\n"
-            resultado += "✓ Balanceo de símbolos correcto\n"
-            resultado += "✓ Estructuras de control válidas\n"
-            resultado += "✓ Declaraciones bien formadas\n"
-        
-        resultado += "\nVERIFICACIONES REALIZADAS:\n"
-        resultado += "-" * 25 + "\n"
-        resultado += "• Llaves {}, paréntesis (), comillas \"\"\n"
-        resultado += "• Estructuras si, mientras, para\n"
-        resultado += "• Declaraciones de variables\n"
-        resultado += "• Puntos y coma\n"
-        
-        self.texto_sintactico.insert(1.0, resultado)
 
-    def _mostrar_analisis_semantico(self, errores_semanticos, tabla_simbolos):
-        """Muestra el análisis semántico en su texto"""
-        resultado = "ANÁLISIS DE TIPOS Y VARIABLES:\n"
-        resultado += "=" * 30 + "\n\n"
-        
-        if errores_semanticos:
-            resultado += "❌ ERRORES SEMÁNTICOS:\n"
-            resultado += "-" * 22 + "\n"
-            for error in errores_semanticos:
-                resultado += f"• {error}\n"
-            resultado += f"\nTotal de errores: {len(errores_semanticos)}\n\n"
+            # Un análisis nuevo cancela el que esté en curso
+            iniciar_revision = self.tarea_analisis is None
+            self.tarea_analisis = self.trabajador.iniciar(self.for_archivo.contenido)
+            self.barra_progreso["value"] = 0
+            self.texto_progreso.config(text="Analizando...")
+            self.boton_cancelar.config(state="normal")
+            if iniciar_revision:
+                self.ventana.after(50, self._revisar_analisis)
+
+    def alternar_vigilancia(self):
+        """Empieza o deja de vigilar el archivo abierto según la casilla"""
+        iniciar_revision = self.vigilante is None
+        if not self.vigilar.get() or not self.for_archivo.ruta_archivo:
+            self.vigilante = None
+            return
+        self.vigilante = Vigilante([self.for_archivo.ruta_archivo])
+        self.vigilante.tomar_estado()
+        self.analizar_archivo()
+        if iniciar_revision:
+            self.ventana.after(int(INTERVALO * 1000), self._revisar_vigilancia)
+
+    def _revisar_vigilancia(self):
+        """Se vuelve a programar mientras haya vigilancia; analiza cuando el archivo cambió"""
+        if self.vigilante is None:
+            return
+        listos, eliminados = self.vigilante.revisar()
+        if eliminados:
+            self.texto_progreso.config(text="El archivo vigilado ya no existe")
+        if listos:
+            try:
+                contenido = leer_texto(self.for_archivo.ruta_archivo)
+            except OSError:
+                contenido = None
+                # Bloqueado o a medio reemplazar: se vuelve a leer tras la espera
+                for ruta in listos:
+                    self.vigilante.reintentar(ruta)
+            # Solo cambió la fecha: no hay nada nuevo que analizar
+            if contenido is not None and contenido != self.for_archivo.contenido:
+                self.for_archivo.contenido = contenido
+                self.visor.cargar(contenido)
+                # La sesión léxica reanaliza solo las líneas que cambiaron
+                self.analizar_archivo()
+        self.ventana.after(int(INTERVALO * 1000), self._revisar_vigilancia)
+
+    def cancelar_analisis(self):
+        if self.tarea_analisis is not None:
+            self.trabajador.cancelar()
+            self.texto_progreso.config(text="Cancelando...")
+
+    def ir_a_fila(self, fila):
+        """Doble clic en un token o un error: muestra su línea en el visor"""
+        if isinstance(fila[0], int):
+            self.notebook.select(0)
+            self.visor.ir_a_linea(fila[0])
+
+    def ir_a_linea_ingresada(self):
+        texto = self.entrada_ir_linea.get().strip()
+        if texto.isdigit():
+            self.visor.ir_a_linea(int(texto))
+
+    def aplicar_filtro(self):
+        """Filtra tokens por línea y tipo, y errores por línea, sin rehacer las listas"""
+        if not hasattr(self, 'vistas'):
+            return
+        self._filtrar_vistas()
+        self.lista_tokens.refrescar()
+        for lista in self.listas_errores:
+            lista.refrescar()
+
+    def quitar_filtro(self):
+        self.filtro_linea.delete(0, tk.END)
+        self.filtro_tipo.set(TODOS_LOS_TIPOS)
+        self.aplicar_filtro()
+
+    def _filtrar_vistas(self):
+        texto_linea = self.filtro_linea.get().strip()
+        linea = int(texto_linea) if texto_linea.isdigit() else None
+        tipo = self.filtro_tipo.get()
+        tipo = None if tipo == TODOS_LOS_TIPOS else tipo
+        vista_tokens, *vistas_errores = self.vistas
+        vista_tokens.filtrar(linea, tipo)
+        for vista in vistas_errores:
+            vista.filtrar(linea)
+
+    @staticmethod
+    def _resumen(errores, nombre, sin_errores):
+        if errores:
+            return f"❌ {len(errores)} {nombre}"
+        return f"✅ {sin_errores}"
+
+    def _revisar_analisis(self):
+        """Atiende los eventos del hilo de análisis; se vuelve a programar mientras haya una tarea"""
+        for numero, tipo, dato in self.trabajador.eventos():
+            if numero != self.tarea_analisis:
+                # Evento de un análisis ya reemplazado por otro
+                continue
+            if tipo == FASE:
+                posicion = FASES_ANALISIS.index(dato)
+                self.barra_progreso["value"] = posicion
+                self.texto_progreso.config(text=f"Analizando: {dato} ({posicion + 1}/{len(FASES_ANALISIS)})")
+                continue
+
+            self.tarea_analisis = None
+            self.boton_cancelar.config(state="disabled")
+            if tipo == TERMINADO:
+                self.barra_progreso["value"] = len(FASES_ANALISIS)
+                self.texto_progreso.config(text="Análisis terminado")
+                self._mostrar_resultado(*dato)
+            elif tipo == CANCELADO:
+                self.barra_progreso["value"] = 0
+                self.texto_progreso.config(text="Análisis cancelado")
+            elif tipo == ERROR:
+                self.barra_progreso["value"] = 0
+                self.texto_progreso.config(text=f"Error en el análisis: {dato}")
+
+        if self.tarea_analisis is not None:
+            self.ventana.after(50, self._revisar_analisis)
+
+    def _analizar_en_segundo_plano(self, contenido, tarea):
+        """
+        Corre en el hilo de análisis: las tres etapas (o la caché) y los
+        textos de cada panel. No toca tkinter.
+        """
+        cache = self.cache_resultados
+        # La misma sesión durante toda la tarea, aunque se abra otro archivo mientras tanto
+        sesion_lexica = self.sesion_lexica
+        perfil = Perfil()
+        tarea.avisar("léxico")
+        resultado = None
+        if cache is not None:
+            with perfil.fase("cache"):
+                resultado = cache.obtener(contenido)
+        if resultado is None:
+            # Solo se vuelven a tokenizar las líneas que cambiaron y el índice
+            # por línea se arma una vez para todas las etapas
+            with perfil.fase("lexico"):
+                marca = perfil.reloj()
+                sesion_lexica.actualizar(contenido)
+                marca = perfil.registrar("lexico.actualizar", marca)
+                indice = sesion_lexica.indice()
+                errores_lexicos = sesion_lexica.errores()
+                perfil.registrar("lexico.indice", marca)
+            perfil.contar("lexico.lineas_reanalizadas", sesion_lexica.lineas_reanalizadas)
+            tarea.verificar()
+            tarea.avisar("sintáctico")
+            self.analizador_sintactico.perfil = self.analizador_semantico.perfil = perfil
+            with perfil.fase("sintactico"):
+                errores_sintacticos = self.analizador_sintactico.analizar(indice)
+            tarea.verificar()
+            tarea.avisar("semántico")
+            with perfil.fase("semantico"):
+                errores_semanticos, tabla_simbolos = self.analizador_semantico.analizar(indice)
+            resultado = ResultadoAnalisis(indice, errores_lexicos, errores_sintacticos,
+                                          errores_semanticos, tabla_simbolos,
+                                          self.analizador_semantico.funciones)
+            if cache is not None:
+                with perfil.fase("cache"):
+                    cache.guardar(contenido, resultado)
         else:
-            resultado += "✅ Semántica correcta\n\n"
-
-        resultado += "TABLA DE SÍMBOLOS:\n"
+            perfil.contar("cache.aciertos")
+        perfil.contar_resultado(contenido, resultado)
+
+        tarea.verificar()
+        tarea.avisar("resultados")
+        # Las vistas no copian tokens ni errores: la ventana pide solo las filas visibles
+        with perfil.fase("interfaz.vistas"):
+            vistas = (
+                VistaFilas(FilasTokens(resultado.indice)),
+                VistaFilas(FilasErrores(resultado.lexicos)),
+                VistaFilas(FilasErrores(resultado.sintacticos)),
+                VistaFilas(FilasErrores(resultado.semanticos)),
+            )
+        with perfil.fase("interfaz.tabla_simbolos"):
+            texto_tabla = self._texto_tabla_simbolos(resultado.tabla_simbolos)
+        tarea.verificar()
+        return resultado, vistas, texto_tabla, perfil
+
+    def _mostrar_resultado(self, resultado, vistas, texto_tabla, perfil):
+        """Muestra en los paneles un análisis terminado y lo guarda para el reporte"""
+        marca = perfil.reloj()
+        self.vistas = vistas
+        self._filtrar_vistas()
+        self.lista_tokens.mostrar(vistas[0])
+        for lista, vista in zip(self.listas_errores, vistas[1:]):
+            lista.mostrar(vista)
+        self.texto_semantico.insert(1.0, texto_tabla)
+
+        self.resumen_lexico.config(text=self._resumen(resultado.lexicos, "errores léxicos", "No se encontraron errores léxicos")
+                                        + f" · {len(resultado.indice.tokens)} tokens")
+        self.resumen_sintactico.config(text=self._resumen(resultado.sintacticos, "errores sintácticos", "Estructura sintáctica correcta"))
+        self.resumen_semantico.config(text=self._resumen(resultado.semanticos, "errores semánticos", "Semántica correcta"))
+
+        cache = self.cache_resultados
+        if cache is not None:
+            origen = "desde caché" if resultado.desde_cache else "analizado"
+            nombre_archivo = (self.for_archivo.ruta_archivo or "").split('/')[-1]
+            self.texto2.config(text=f"Archivo seleccionado: {nombre_archivo} ({origen}, "
+                                    f"caché: {cache.aciertos} aciertos / {cache.fallos} fallos)")
+
+        perfil.registrar("interfaz.paneles", marca)
+        self.texto_perfil.config(text=perfil.resumen_corto())
+
+        # Guardar datos para el reporte
+        self.perfil = perfil
+        self.tokens_analizados = resultado.indice.tokens
+        self.errores_lexicos = resultado.lexicos
+        self.errores_sintacticos = resultado.sintacticos
+        self.errores_semanticos = resultado.semanticos
+        self.tabla_simbolos = resultado.tabla_simbolos
+
+    def _texto_tabla_simbolos(self, tabla_simbolos):
+        """Texto de la tabla de símbolos del panel semántico"""
+        resultado = "TABLA DE SÍMBOLOS:\n"
         resultado += "-" * 18 + "\n"
         if tabla_simbolos:
             for variable, tipo in tabla_simbolos.items():
@@ -372,40 +569,15 @@ class ventana_principal:
             for tipo, count in tipos_count.items():
                 resultado += f"• {tipo}: {count} variable(s)\n"
         
-        self.texto_semantico.insert(1.0, resultado)
+        return resultado
 
     def generar_reporte(self):
         if hasattr(self, 'tokens_analizados'):
-            reporte = self.analizador.generar_reporte(self.tokens_analizados)
-            
-            # Agregar información completa al reporte
-            reporte += "\n" + "="*60 + "\n"
-            reporte += "REPORTE GENERAL - ANÁLISIS COMPLETO\n"
-            reporte += "="*60 + "\n\n"
-            
-            # Resumen de cada análisis
-            reporte += "RESUMEN DE ANÁLISIS:\n"
-            reporte += "-" * 20 + "\n"
-            
-            # Léxico
-            if hasattr(self, 'errores_lexicos'):
-                reporte += f"Léxico: {'❌' if self.errores_lexicos else '✅'} {len(self.errores_lexicos) if self.errores_lexicos else 0} errores\n"
-            
-            # Sintáctico
-            if hasattr(self, 'errores_sintacticos'):
-                reporte += f"Sintáctico: {'❌' if self.errores_sintacticos else '✅'} {len(self.errores_sintacticos) if self.errores_sintacticos else 0} errores\n"
-            
-            # Semántico
-            if hasattr(self, 'errores_semanticos'):
-                reporte += f"Semántico: {'❌' if self.errores_semanticos else '✅'} {len(self.errores_semanticos) if self.errores_semanticos else 0} errores\n"
-            
-            # Tabla de símbolos completa
-            if hasattr(self, 'tabla_simbolos') and self.tabla_simbolos:
-                reporte += "\nTABLA DE SÍMBOLOS COMPLETA:\n"
-                reporte += "-" * 25 + "\n"
-                for variable, tipo in self.tabla_simbolos.items():
-                    reporte += f"  {variable} : {tipo}\n"
-            
+            with self.perfil.fase("interfaz.reporte"):
+                reporte = a_texto(escribir_reporte_texto, self.tokens_analizados, self.errores_lexicos,
+                                  self.errores_sintacticos, self.errores_semanticos, self.tabla_simbolos,
+                                  self.perfil)
+
             # Limpiar y mostrar reporte
             self.texto_tokens.delete(1.0, tk.END)
             self.texto_tokens.insert(1.0, reporte)
@@ -413,5 +585,25 @@ class ventana_principal:
             # Cambiar a la pestaña de tokens
             self.notebook.select(2)
 
+    def exportar_reporte(self):
+        """Guarda el reporte completo en texto, JSON o CSV, escribiéndolo directo al archivo"""
+        if not hasattr(self, 'tokens_analizados'):
+            return
+        ruta = filedialog.asksaveasfilename(
+            title="Exportar reporte",
+            defaultextension=".txt",
+            filetypes=[("Texto", "*.txt"), ("JSON", "*.json"), ("CSV", "*.csv")],
+        )
+        if not ruta:
+            return
+        try:
+            with open(ruta, 'w', encoding='utf-8', newline='') as salida:
+                escribir_reporte(salida, formato_por_extension(ruta), self.tokens_analizados, self.errores_lexicos,
+                                 self.errores_sintacticos, self.errores_semanticos, self.tabla_simbolos,
+                                 self.perfil)
+        except OSError as e:
+            messagebox.showerror("Error al exportar", f"No se pudo guardar el reporte:\n{e}")
+
 # ejecutar ventana
-ventana_principal()
\ No newline at end of file
+if __name__ == "__main__":
+    ventana_principal()
\ No newline at end of file
@@ -0,0 +1,278 @@
+"""
+Modo vigilancia: vuelve a analizar los archivos PSeInt que cambian.
+
+La biblioteca estándar no trae inotify, así que se revisa con os.stat cada
+INTERVALO segundos. Un archivo cambió si cambió su firma (mtime_ns, tamaño,
+inodo); las carpetas se recorren con os.scandir, que trae esos datos sin
+abrir ningún archivo. Una revisión de cientos de archivos cuesta menos de
+un milisegundo.
+
+Antirrebote: un archivo que cambió se analiza cuando su firma queda quieta
+durante ESPERA segundos, así un editor que guarda en varias escrituras (o
+un "guardar todo") produce un solo análisis por archivo. Si el contenido
+leído es igual al último analizado (solo cambió la fecha) no se analiza.
+
+Cada archivo vigilado tiene su SesionLexica: ante un cambio se vuelven a
+tokenizar solo las líneas que cambiaron. Las etapas sintáctica y semántica
+dependen del archivo completo y se corren enteras sobre el índice.
+
+Salida en texto, o en JSON Lines con --jsonl. Los eventos "diagnostico"
+son los de eventos_jsonl con la clave "archivo" agregada, y cada análisis
+termina con:
+
+  analisis   {"evento": "analisis", "archivo": str, "tokens": int,
+              "diagnosticos": int, "lineas_reanalizadas": int,
+              "segundos": float}
+  eliminado  {"evento": "eliminado", "archivo": str}
+
+Uso:
+    python vigilancia.py RUTA... [--intervalo S] [--espera S] [--jsonl]
+"""
+import argparse
+import json
+import os
+import stat
+import sys
+import time
+
+from analizador import AnalizadorLexico
+from cache_resultados import ResultadoAnalisis
+from main import leer_texto
+from semantico import AnalizadorSemantico
+from sesion_lexica import SesionLexica
+from sintactico import AnalizadorSintactico
+
+# Segundos entre revisiones y segundos que la firma debe quedar quieta
+INTERVALO = 0.025
+ESPERA = 0.05
+
+EXTENSIONES = (".txt", ".psc")
+
+
+def firma_archivo(estado):
+    """Lo que cambia cuando se escribe o se reemplaza un archivo"""
+    return (estado.st_mtime_ns, estado.st_size, estado.st_ino)
+
+
+class _Vigilado:
+    __slots__ = ('firma', 'cambio')
+
+    def __init__(self, firma, cambio):
+        self.firma = firma
+        # Momento en que se vio la firma actual; None si ya se informó
+        self.cambio = cambio
+
+
+class Vigilante:
+    """
+    Detecta cambios en archivos y carpetas con antirrebote. No analiza:
+    revisar() devuelve las rutas listas y quien lo usa decide qué hacer.
+    """
+    def __init__(self, rutas, espera=ESPERA, extensiones=EXTENSIONES):
+        self.rutas = [os.path.normpath(ruta) for ruta in rutas]
+        self.espera = espera
+        self.extensiones = tuple(extension.lower() for extension in extensiones)
+        # ruta -> _Vigilado
+        self.archivos = {}
+
+    def _explorar(self):
+        """ruta -> firma de cada archivo vigilado que existe ahora"""
+        firmas = {}
+        for ruta in self.rutas:
+            try:
+                estado = os.stat(ruta)
+            except OSError:
+                continue
+            if stat.S_ISDIR(estado.st_mode):
+                self._explorar_carpeta(ruta, firmas)
+            else:
+                # Un archivo nombrado se vigila aunque no tenga la extensión
+                firmas[ruta] = firma_archivo(estado)
+        return firmas
+
+    def _explorar_carpeta(self, carpeta, firmas):
+        try:
+            entradas = os.scandir(carpeta)
+        except OSError:
+            return
+        with entradas:
+            for entrada in entradas:
+                try:
+                    if entrada.is_dir():
+                        self._explorar_carpeta(entrada.path, firmas)
+                    elif entrada.name.lower().endswith(self.extensiones):
+                        firmas[entrada.path] = firma_archivo(entrada.stat())
+                except OSError:
+                    # Borrado entre el listado y el stat
+                    continue
+
+    def tomar_estado(self):
+        """Toma los archivos como están ahora sin informarlos como cambiados"""
+        self.archivos = {ruta: _Vigilado(firma, None) for ruta, firma in self._explorar().items()}
+
+    def revisar(self, ahora=None):
+        """
+        Compara las firmas con la revisión anterior. Devuelve (listos,
+        eliminados): los archivos nuevos o cambiados cuya firma lleva
+        'espera' segundos quieta, y los que dejaron de existir.
+        """
+        if ahora is None:
+            ahora = time.monotonic()
+        firmas = self._explorar()
+
+        eliminados = [ruta for ruta in self.archivos if ruta not in firmas]
+        for ruta in eliminados:
+            del self.archivos[ruta]
+
+        listos = []
+        for ruta, firma in firmas.items():
+            vigilado = self.archivos.get(ruta)
+            if vigilado is None:
+                vigilado = self.archivos[ruta] = _Vigilado(firma, ahora)
+            elif vigilado.firma != firma:
+                # Sigue cambiando: la espera empieza de nuevo
+                vigilado.firma = firma
+                vigilado.cambio = ahora
+            if vigilado.cambio is not None and ahora - vigilado.cambio >= self.espera:
+                vigilado.cambio = None
+                listos.append(ruta)
+        listos.sort()
+        eliminados.sort()
+        return listos, eliminados
+
+    def reintentar(self, ruta, ahora=None):
+        """
+        Vuelve a marcar como cambiado un archivo que revisar() dio por listo
+        pero no se pudo leer: sale listo otra vez después de la espera,
+        aunque su firma no cambie.
+        """
+        vigilado = self.archivos.get(ruta)
+        if vigilado is not None:
+            vigilado.cambio = time.monotonic() if ahora is None else ahora
+
+
+class AnalisisIncremental:
+    """Las tres etapas por archivo, reutilizando el análisis léxico de las líneas que no cambiaron"""
+    def __init__(self):
+        self.lexico = AnalizadorLexico()
+        self.sintactico = AnalizadorSintactico()
+        self.semantico = AnalizadorSemantico()
+        # ruta -> SesionLexica
+        self.sesiones = {}
+
+    def analizar(self, ruta, contenido):
+        """ResultadoAnalisis del contenido nuevo, o None si es igual al último analizado"""
+        sesion = self.sesiones.get(ruta)
+        if sesion is None:
+            sesion = self.sesiones[ruta] = SesionLexica(self.lexico, contenido)
+        elif contenido == sesion.contenido:
+            return None
+        else:
+            sesion.actualizar(contenido)
+
+        indice = sesion.indice()
+        sintacticos = self.sintactico.analizar(indice)
+        semanticos, tabla_simbolos = self.semantico.analizar(indice)
+        return ResultadoAnalisis(indice, sesion.errores(), sintacticos, semanticos, tabla_simbolos,
+                                 self.semantico.funciones)
+
+    def lineas_reanalizadas(self, ruta):
+        return self.sesiones[ruta].lineas_reanalizadas
+
+    def olvidar(self, ruta):
+        self.sesiones.pop(ruta, None)
+
+
+class SalidaTexto:
+    def __init__(self, salida):
+        self.salida = salida
+
+    def analisis(self, ruta, resultado, lineas_reanalizadas, segundos):
+        errores = resultado.lexicos + resultado.sintacticos + resultado.semanticos
+        self.salida.write(
+            f"[{time.strftime('%H:%M:%S')}] {ruta}: {len(errores)} errores "
+            f"(léxico {len(resultado.lexicos)}, sintáctico {len(resultado.sintacticos)}, "
+            f"semántico {len(resultado.semanticos)}) · {lineas_reanalizadas} líneas reanalizadas "
+            f"· {segundos * 1000:.1f} ms\n")
+        for error in errores:
+            self.salida.write(f"  {error}\n")
+        self.salida.flush()
+
+    def eliminado(self, ruta):
+        self.salida.write(f"[{time.strftime('%H:%M:%S')}] {ruta}: eliminado\n")
+        self.salida.flush()
+
+
+class SalidaJsonl:
+    def __init__(self, salida):
+        self.salida = salida
+        self.codificar = json.JSONEncoder(ensure_ascii=False).encode
+
+    def analisis(self, ruta, resultado, lineas_reanalizadas, segundos):
+        lineas = []
+        total = 0
+        for errores in (resultado.lexicos, resultado.sintacticos, resultado.semanticos):
+            for error in errores:
+                evento = error.como_evento()
+                evento["archivo"] = ruta
+                lineas.append(self.codificar(evento))
+            total += len(errores)
+        lineas.append(self.codificar({
+            "evento": "analisis", "archivo": ruta, "tokens": len(resultado.indice.tokens),
+            "diagnosticos": total, "lineas_reanalizadas": lineas_reanalizadas, "segundos": segundos,
+        }))
+        lineas.append('')
+        self.salida.write('\n'.join(lineas))
+        self.salida.flush()
+
+    def eliminado(self, ruta):
+        self.salida.write(self.codificar({"evento": "eliminado", "archivo": ruta}) + '\n')
+        self.salida.flush()
+
+
+def vigilar(rutas, salida, intervalo=INTERVALO, espera=ESPERA, extensiones=EXTENSIONES, continuar=None):
+    """
+    Revisa las rutas hasta que continuar() devuelva False (o para siempre)
+    y informa cada análisis en 'salida' (SalidaTexto o SalidaJsonl).
+    """
+    vigilante = Vigilante(rutas, espera, extensiones)
+    analisis = AnalisisIncremental()
+    while continuar is None or continuar():
+        listos, eliminados = vigilante.revisar()
+        for ruta in eliminados:
+            analisis.olvidar(ruta)
+            salida.eliminado(ruta)
+        for ruta in listos:
+            inicio = time.perf_counter()
+            try:
+                contenido = leer_texto(ruta)
+            except OSError:
+                # Bloqueado o a medio reemplazar: se reintenta tras la espera
+                # (si se borró, la próxima revisión lo informa como eliminado)
+                vigilante.reintentar(ruta)
+                continue
+            resultado = analisis.analizar(ruta, contenido)
+            if resultado is not None:
+                salida.analisis(ruta, resultado, analisis.lineas_reanalizadas(ruta), time.perf_counter() - inicio)
+        time.sleep(intervalo)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Vuelve a analizar archivos PSeInt cada vez que cambian")
+    parser.add_argument("rutas", nargs="+", help="Archivos o carpetas a vigilar")
+    parser.add_argument("--intervalo", type=float, default=INTERVALO, help="Segundos entre revisiones")
+    parser.add_argument("--espera", type=float, default=ESPERA,
+                        help="Segundos sin cambios antes de analizar (antirrebote)")
+    parser.add_argument("--jsonl", action="store_true", help="Salida en JSON Lines")
+    args = parser.parse_args(argumentos)
+
+    salida = SalidaJsonl(sys.stdout) if args.jsonl else SalidaTexto(sys.stdout)
+    try:
+        vigilar(args.rutas, salida, args.intervalo, args.espera)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Visor del código fuente que dibuja solo las líneas visibles.
+
+En lugar de un único create_text con todo el archivo, el canvas tiene un
+texto por línea visible (más un pequeño margen) y uno por su número; al
+desplazarse se cambia el contenido de esos mismos ítems. Abrir un archivo
+solo parte el texto en líneas, así que ni la apertura ni el desplazamiento
+dependen del tamaño del archivo. Las líneas no se ajustan al ancho: una
+línea del archivo es siempre una fila del visor.
+"""
+import tkinter as tk
+import tkinter.font as tkfont
+
+# Filas extra dibujadas por encima y por debajo de las visibles
+MARGEN_FILAS = 2
+
+
+class VisorFuente(tk.Frame):
+    def __init__(self, padre, ancho=1000, alto=500, fuente=("Courier", 11), **opciones):
+        super().__init__(padre, **opciones)
+        self.lineas = []
+        self.primera = 0
+        self.desplazamiento_x = 0
+        self.linea_marcada = None
+        self._ancho_maximo = 0
+
+        self.fuente = tkfont.Font(family=fuente[0], size=fuente[1])
+        self.alto_fila = self.fuente.metrics("linespace") + 2
+        self.ancho_caracter = self.fuente.measure("0")
+
+        self.barra_y = tk.Scrollbar(self, orient="vertical", command=self._desplazar_y)
+        self.barra_y.pack(side="right", fill="y")
+        self.barra_x = tk.Scrollbar(self, orient="horizontal", command=self._desplazar_x)
+        self.barra_x.pack(side="bottom", fill="x")
+
+        self.canvas = tk.Canvas(self, bg="Azure", width=ancho, height=alto, relief="solid", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+
+        self._marca = self.canvas.create_rectangle(0, 0, 0, 0, fill="khaki1", outline="", state="hidden")
+        # Fondo de la columna de números: tapa el texto desplazado a la izquierda
+        self._fondo_numeros = self.canvas.create_rectangle(0, 0, 0, 0, fill="gray95", outline="", tags="margen")
+        self._separador = self.canvas.create_line(0, 0, 0, 0, fill="gray70", tags="margen")
+        self._numeros = []
+        self._textos = []
+
+        self.canvas.bind("<Configure>", lambda evento: self._dibujar())
+        self.canvas.bind("<MouseWheel>", lambda evento: self._mover(-3 if evento.delta > 0 else 3))
+        self.canvas.bind("<Button-4>", lambda evento: self._mover(-3))
+        self.canvas.bind("<Button-5>", lambda evento: self._mover(3))
+        self.canvas.bind("<Prior>", lambda evento: self._mover(-self._filas_visibles()))
+        self.canvas.bind("<Next>", lambda evento: self._mover(self._filas_visibles()))
+        self.canvas.bind("<Button-1>", lambda evento: self.canvas.focus_set())
+
+    def cargar(self, contenido):
+        """Muestra otro contenido desde la primera línea"""
+        self.lineas = contenido.split('\n')
+        self._ancho_maximo = max(map(len, self.lineas), default=0)
+        self.primera = 0
+        self.desplazamiento_x = 0
+        self.linea_marcada = None
+        self._dibujar()
+
+    def ir_a_linea(self, linea):
+        """Lleva la línea (numerada desde 1) al tercio superior del visor y la resalta"""
+        if not self.lineas:
+            return
+        linea = max(1, min(linea, len(self.lineas)))
+        self.linea_marcada = linea
+        self.primera = linea - 1 - self._filas_visibles() // 3
+        self._dibujar()
+
+    def _filas_visibles(self):
+        return max(1, self.canvas.winfo_height() // self.alto_fila)
+
+    def _ancho_numeros(self):
+        return (len(str(len(self.lineas))) + 1) * self.ancho_caracter + 8
+
+    def _dibujar(self):
+        canvas = self.canvas
+        total = len(self.lineas)
+        visibles = self._filas_visibles()
+        self.primera = max(0, min(self.primera, total - visibles))
+
+        desde = max(0, self.primera - MARGEN_FILAS)
+        hasta = min(total, self.primera + visibles + MARGEN_FILAS)
+        cantidad = hasta - desde
+
+        # Se reutilizan los ítems; solo se crean los que faltan y se ocultan los que sobran
+        while len(self._textos) < cantidad:
+            self._numeros.append(canvas.create_text(0, 0, anchor="ne", font=self.fuente, fill="gray45", tags="numero"))
+            self._textos.append(canvas.create_text(0, 0, anchor="nw", font=self.fuente, fill="black"))
+
+        ancho_numeros = self._ancho_numeros()
+        x_texto = ancho_numeros + 6 - self.desplazamiento_x
+        for fila, (numero, texto) in enumerate(zip(self._numeros, self._textos)):
+            if fila < cantidad:
+                linea = desde + fila
+                y = (linea - self.primera) * self.alto_fila + 2
+                canvas.itemconfigure(numero, text=linea + 1, state="normal")
+                canvas.coords(numero, ancho_numeros - 4, y)
+                canvas.itemconfigure(texto, text=self.lineas[linea], state="normal")
+                canvas.coords(texto, x_texto, y)
+            else:
+                canvas.itemconfigure(numero, state="hidden")
+                canvas.itemconfigure(texto, state="hidden")
+
+        canvas.coords(self._fondo_numeros, 0, 0, ancho_numeros, canvas.winfo_height())
+        canvas.coords(self._separador, ancho_numeros, 0, ancho_numeros, canvas.winfo_height())
+        if self.linea_marcada is not None and desde < self.linea_marcada <= hasta:
+            y = (self.linea_marcada - 1 - self.primera) * self.alto_fila + 1
+            canvas.coords(self._marca, ancho_numeros + 1, y, canvas.winfo_width(), y + self.alto_fila)
+            canvas.itemconfigure(self._marca, state="normal")
+        else:
+            canvas.itemconfigure(self._marca, state="hidden")
+        canvas.tag_raise("margen")
+        canvas.tag_raise("numero")
+
+        if total:
+            self.barra_y.set(self.primera / total, min(1.0, (self.primera + visibles) / total))
+        else:
+            self.barra_y.set(0, 1)
+        ancho_total = self._ancho_maximo * self.ancho_caracter
+        ancho_vista = max(1, canvas.winfo_width() - ancho_numeros)
+        if ancho_total > ancho_vista:
+            self.barra_x.set(self.desplazamiento_x / ancho_total,
+                             min(1.0, (self.desplazamiento_x + ancho_vista) / ancho_total))
+        else:
+            self.barra_x.set(0, 1)
+
+    def _mover(self, filas):
+        self.primera += filas
+        self._dibujar()
+        return "break"
+
+    def _desplazar_y(self, accion, cantidad, unidad=None):
+        """Comando de la barra vertical: 'moveto fracción' o 'scroll n units|pages'"""
+        if accion == "moveto":
+            self.primera = int(float(cantidad) * len(self.lineas))
+            self._dibujar()
+        else:
+            paso = self._filas_visibles() if unidad == "pages" else 1
+            self._mover(int(cantidad) * paso)
+
+    def _desplazar_x(self, accion, cantidad, unidad=None):
+        ancho_total = self._ancho_maximo * self.ancho_caracter
+        ancho_vista = max(1, self.canvas.winfo_width() - self._ancho_numeros())
+        if accion == "moveto":
+            self.desplazamiento_x = int(float(cantidad) * ancho_total)
+        else:
+            paso = ancho_vista if unidad == "pages" else self.ancho_caracter * 4
+            self.desplazamiento_x += int(cantidad) * paso
+        self.desplazamiento_x = max(0, min(self.desplazamiento_x, ancho_total - ancho_vista))
+        self._dibujar()
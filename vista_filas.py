@@ -0,0 +1,130 @@
+"""
+Filas de los paneles de resultados, sin tkinter.
+
+Las fuentes (tokens o errores) dan cada fila cuando se pide, sin armar
+antes una tupla o un texto por token. VistaFilas guarda solo una lista de
+posiciones: filtrar u ordenar cambia esa lista y la ventana vuelve a pedir
+las filas que se ven.
+"""
+from array import array
+from bisect import bisect_left
+
+from reportes import linea_del_mensaje
+
+
+class FilasTokens:
+    columnas = ("Línea", "Token", "Tipo")
+
+    def __init__(self, indice):
+        # Tokens en orden de línea; el índice permite filtrar una línea sin recorrerlos
+        self._indice = indice
+        self._tokens = indice.agrupados
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def fila(self, posicion):
+        tok = self._tokens[posicion]
+        return tok.linea, tok.texto, tok.tipo
+
+    def clave(self, columna):
+        tokens = self._tokens
+        if columna == 0:
+            return lambda posicion: tokens[posicion].linea
+        if columna == 1:
+            return lambda posicion: tokens[posicion].texto
+        return lambda posicion: tokens[posicion].tipo
+
+    def posiciones_linea(self, linea):
+        numeros = self._indice.numeros
+        i = bisect_left(numeros, linea)
+        if i == len(numeros) or numeros[i] != linea:
+            return range(0)
+        return range(self._indice.inicios[i], self._indice.inicios[i + 1])
+
+    def tiene_tipo(self, posicion, tipo):
+        return self._tokens[posicion].tipo == tipo
+
+
+class FilasErrores:
+    columnas = ("Línea", "Mensaje")
+
+    def __init__(self, errores):
+        self._errores = errores
+        # Número de línea de cada mensaje (0 si no lo trae), para ordenar y filtrar
+        self._lineas = array('I', map(linea_del_mensaje, errores))
+
+    def __len__(self):
+        return len(self._errores)
+
+    def fila(self, posicion):
+        linea = self._lineas[posicion]
+        return linea or "", self._errores[posicion]
+
+    def clave(self, columna):
+        if columna == 0:
+            return self._lineas.__getitem__
+        return self._errores.__getitem__
+
+    def posiciones_linea(self, linea):
+        lineas = self._lineas
+        return [posicion for posicion in range(len(lineas)) if lineas[posicion] == linea]
+
+    def tiene_tipo(self, posicion, tipo):
+        return True
+
+
+class VistaFilas:
+    """Filtro y orden sobre una fuente; la fila i de la vista es fuente.fila(posiciones[i])"""
+
+    def __init__(self, fuente):
+        self.fuente = fuente
+        self.columnas = fuente.columnas
+        self.linea = None
+        self.tipo = None
+        self.orden = None
+        self.descendente = False
+        self._filtradas = None
+        self._posiciones = None
+
+    def __len__(self):
+        if self._posiciones is None:
+            return len(self.fuente)
+        return len(self._posiciones)
+
+    def fila(self, i):
+        if self._posiciones is None:
+            return self.fuente.fila(i)
+        return self.fuente.fila(self._posiciones[i])
+
+    def filas(self, desde, hasta):
+        return [self.fila(i) for i in range(desde, min(hasta, len(self)))]
+
+    def filtrar(self, linea=None, tipo=None):
+        """Deja solo las filas de esa línea y/o ese tipo; None quita el filtro"""
+        self.linea = linea
+        self.tipo = tipo
+        if linea is None and tipo is None:
+            self._filtradas = None
+        else:
+            fuente = self.fuente
+            posiciones = fuente.posiciones_linea(linea) if linea is not None else range(len(fuente))
+            if tipo is not None:
+                posiciones = [posicion for posicion in posiciones if fuente.tiene_tipo(posicion, tipo)]
+            self._filtradas = posiciones
+        self._aplicar_orden()
+
+    def ordenar(self, columna, descendente=False):
+        """Ordena por una columna; el orden se mantiene al cambiar el filtro"""
+        self.orden = columna
+        self.descendente = descendente
+        self._aplicar_orden()
+
+    def _aplicar_orden(self):
+        base = self._filtradas
+        if self.orden is None:
+            self._posiciones = base
+            return
+        if base is None:
+            base = range(len(self.fuente))
+        self._posiciones = array('I', sorted(base, key=self.fuente.clave(self.orden), reverse=self.descendente))